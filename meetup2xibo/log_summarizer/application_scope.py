@@ -18,6 +18,16 @@ class ApplicationScope:
     def app_name(self):
         return APP_NAME
 
+    @property
+    def checkpoint(self):
+        """Return the checkpoint file path."""
+        return self._args.checkpoint
+
+    @property
+    def database(self):
+        """Return the log database file path."""
+        return self._args.database
+
     @property
     def email_subject(self):
         """Return the email subject."""
@@ -33,15 +43,56 @@ class ApplicationScope:
         """Return the open input file."""
         return self._args.infile
 
+    @property
+    def inputs(self):
+        """Return a list of input file paths and glob patterns."""
+        return self._args.inputs
+
+    @property
+    def json(self):
+        """Return true if logs are JSON lines."""
+        return self._args.json
+
     @property
     def mappings(self):
         return self._args.mappings
 
+    @property
+    def meetup_id(self):
+        """Return the Meetup ID of the only event to summarize, or None."""
+        return self._args.meetup_id
+
+    @property
+    def no_logs(self):
+        """Return true if no logs should be read."""
+        return self._args.no_logs
+
     @property
     def outfile(self):
         """Return the open output file."""
         return self._args.outfile
 
+    @property
+    def peg(self):
+        """Return true if whole logs should be parsed with the log
+        grammar."""
+        return self._args.peg
+
+    @property
+    def processes(self):
+        """Return the number of processes parsing shards of the logs."""
+        return self._args.processes
+
+    @property
+    def since(self):
+        """Return the first date to summarize, or None."""
+        return self._args.since
+
+    @property
+    def until(self):
+        """Return the last date to summarize, or None."""
+        return self._args.until
+
     @property
     def version(self):
         return meetup2xibo.__version__
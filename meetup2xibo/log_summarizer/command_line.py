@@ -1,8 +1,21 @@
 """Command line options."""
 
 import argparse
+import datetime
 import sys
 
+
+def date_string(text):
+    """Return a date string formatted as YYYY-MM-DD, or raise an argument
+    type error."""
+    try:
+        datetime.datetime.strptime(text, "%Y-%m-%d")
+    except ValueError:
+        raise argparse.ArgumentTypeError(
+            "not a YYYY-MM-DD date: {!r}".format(text))
+    return text
+
+
 parser = argparse.ArgumentParser(
         description='Summarize meetup2xibo logs.')
 
@@ -20,18 +33,91 @@ parser.add_argument(
         default=sys.stdout,
         help="Output file path (default: standard output)")
 
+parser.add_argument(
+        '--checkpoint',
+        metavar='PATH',
+        default='',
+        help='Checkpoint file path. Summarize only the lines appended to '
+             'infile since the checkpoint, adding them to the summary '
+             'saved in the checkpoint. Finishes reading the rotated file '
+             'first when infile has been rotated. '
+             '(default: summarize all of infile)')
+
+parser.add_argument(
+        '--database',
+        metavar='PATH',
+        default='',
+        help='SQLite database file path. Add the summarized log lines, '
+             'program start counts, conflicts, and suppressed Meetup IDs '
+             'to the database, then summarize the database. '
+             '(default: summarize only the logs read)')
+
+parser.add_argument(
+        '-i', '--input',
+        dest='inputs',
+        action='append',
+        default=[],
+        metavar='PATH',
+        help='Input file path or glob pattern, which may name gzip (.gz) '
+             'or xz (.xz) compressed files. Repeat to read several files '
+             'in order by their first timestamps. Replaces infile, '
+             'which may be given as - to precede outfile. '
+             '(default: read infile)')
+
+parser.add_argument(
+        '--json',
+        action='store_true',
+        help='Read logs written as JSON lines by meetup2xibo --json-logs. '
+             'Cannot be combined with --peg. (default: read text logs)')
+
 parser.add_argument(
         '-m', '--mappings',
         action='store_true',
         help='Summarize location mappings in CSV format. '
              '(default: summarize logs in HTML format)')
 
+parser.add_argument(
+        '--meetup-id',
+        metavar='ID',
+        help='Summarize only the log lines of the Meetup event with this '
+             'ID. Requires --database. (default: all events)')
+
+parser.add_argument(
+        '--no-logs',
+        action='store_true',
+        help='Summarize the database without reading any logs. Requires '
+             '--database. Cannot be combined with --checkpoint or --input. '
+             '(default: read logs)')
+
+parser.add_argument(
+        '--peg',
+        action='store_true',
+        help='Parse whole logs with the log grammar. Slower, but useful '
+             'for checking the line by line parser. '
+             '(default: parse logs line by line)')
+
+parser.add_argument(
+        '-p', '--processes',
+        type=int,
+        default=1,
+        help='Number of processes parsing shards of the logs, each '
+             'starting at a program start line. Cannot be combined with '
+             '--peg. (default: %(default)s)')
+
 parser.add_argument(
         '-s', '--subject',
         dest='email_subject',
         default="Meetup to Xibo log summary",
         help='Email subject. (default: %(default)s)')
 
+parser.add_argument(
+        '--since',
+        type=date_string,
+        metavar='DATE',
+        help='Summarize only the log lines and conflicts on or after this '
+             'date, formatted as YYYY-MM-DD. Requires --database. '
+             '(default: no first date)')
+
 parser.add_argument(
         '-t', '--to',
         dest='email_to',
@@ -40,9 +126,41 @@ parser.add_argument(
              'separated addressses. Overrides --mappings option. '
              '(default: no email message)')
 
+parser.add_argument(
+        '--until',
+        type=date_string,
+        metavar='DATE',
+        help='Summarize only the log lines and conflicts on or before this '
+             'date, formatted as YYYY-MM-DD. Requires --database. '
+             '(default: no last date)')
+
 
 def parse_args(args=None):
-    return parser.parse_args(args)
+    parsed_args = parser.parse_args(args)
+    if parsed_args.inputs and parsed_args.infile is not sys.stdin:
+        parser.error("infile must be - when using --input")
+    if parsed_args.checkpoint and (
+            parsed_args.inputs or parsed_args.infile is sys.stdin):
+        parser.error("--checkpoint requires an infile path")
+    if parsed_args.processes < 1:
+        parser.error("--processes must be at least 1")
+    if parsed_args.processes > 1 and parsed_args.peg:
+        parser.error("--processes cannot be combined with --peg")
+    if parsed_args.json and parsed_args.peg:
+        parser.error("--json cannot be combined with --peg")
+    if not parsed_args.database:
+        for option, value in [
+                ("--meetup-id", parsed_args.meetup_id),
+                ("--no-logs", parsed_args.no_logs),
+                ("--since", parsed_args.since),
+                ("--until", parsed_args.until)]:
+            if value:
+                parser.error("{} requires --database".format(option))
+    if parsed_args.no_logs and (
+            parsed_args.checkpoint or parsed_args.inputs):
+        parser.error("--no-logs cannot be combined with --checkpoint "
+                     "or --input")
+    return parsed_args
 
 
 if __name__ == '__main__':
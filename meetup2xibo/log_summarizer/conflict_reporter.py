@@ -14,12 +14,27 @@ class ConflictReporter:
         self._critical_date = critical_date
         self._checked_places = []
         self._conflict_places = defaultdict(list)
+        self._cleared = False
 
     def clear(self):
         """Clear previously collected conflicts and places to start a new
         analysis."""
         self._checked_places.clear()
         self._conflict_places.clear()
+        self._cleared = True
+
+    @property
+    def critical_date(self):
+        """Return the critical date."""
+        return self._critical_date
+
+    def check_critical_date(self, critical_date):
+        """Change the critical date, a string formatted as YYYY-MM-DD, and
+        check all the conflicts again."""
+        self._critical_date = critical_date
+        for conflict_list in self._conflict_places.values():
+            for conflict in conflict_list:
+                conflict.check_critical_date(critical_date)
 
     def add_checked_place(self, name):
         """Add the named checked place."""
@@ -31,6 +46,21 @@ class ConflictReporter:
         conflict_list = self._conflict_places[place_name]
         conflict_list.append(conflict)
 
+    def merge(self, other):
+        """Add the conflicts and places collected by another conflict
+        reporter, first clearing those collected here if the other reporter
+        started a new analysis."""
+        if other._cleared:
+            self.clear()
+        self._checked_places.extend(other._checked_places)
+        for place_name, conflict_list in other._conflict_places.items():
+            self._conflict_places[place_name].extend(conflict_list)
+
+    def has_analysis(self):
+        """Return true if a conflict analysis was collected; false
+        otherwise."""
+        return self._cleared or bool(self._checked_places)
+
     def has_conflicts(self):
         """Return true if there are scheduling conflicts; false otherwise."""
         return self._conflict_places
@@ -17,6 +17,13 @@ class CrudLister:
         event_log = self.event_logs[log_line.meetup_id]
         log_line.add_to_event_log(event_log)
 
+    def merge(self, other):
+        """Add the log lines collected by another CRUD lister, as if they
+        followed the log lines already added."""
+        for event_log in other.event_logs.values():
+            for log_line in event_log.log_lines:
+                self.add_log_line(log_line)
+
     def sorted_current_event_logs(self):
         """Return a list of current event logs sorted for reporting."""
         event_log_list = [
@@ -1,40 +1,81 @@
 """Injectors."""
 
 from .log_summarizer import LogSummarizer
-from .log_parser import make_log_parser_class, Summary
+from .log_parser import make_log_parser_class, make_whole_log_parser, \
+        NullLogParser, Summary
+from .line_log_parser import LineLogParser, make_line_log_parser
+from .json_log_parser import JsonLogParser
+from .sharded_log_parser import make_sharded_log_parser
 from .location_mapper import LocationMapper
+from .log_files import LogFiles
+from .log_checkpoint import CheckpointedLogFile, NullCheckpoint
+from .log_database import LogDatabase, NullLogDatabase
 from .start_counter import StartCounter
 from .crud_lister import CrudLister
 from .conflict_reporter import ConflictReporter
 from .renderer import Renderer, EmailRenderer, SummaryRenderer, \
         LocationMappingCsvRenderer, make_jinja2_env
 from .suppressed_event_tracker import SuppressedEventTracker
+from .timing_tracker import TimingTracker
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
 import datetime
 
 
 def inject_log_summarizer(application_scope):
     """Return a log summarizer configured by an application scope."""
+    checkpoint = inject_checkpoint(application_scope)
+    critical_date = inject_date_today()
     return LogSummarizer(
-        inject_input_stream(application_scope),
+        inject_input_stream(application_scope, checkpoint),
         inject_output_stream(application_scope),
-        inject_summary(),
-        inject_log_parser(),
-        inject_renderer(application_scope)
+        inject_summary(critical_date),
+        inject_log_parser(application_scope, critical_date),
+        inject_renderer(application_scope),
+        checkpoint,
+        inject_database(application_scope, critical_date)
         )
 
 
-def inject_summary():
-    """Return a summary."""
+def inject_checkpoint(application_scope):
+    """Return a checkpointed log file if requested, or a null checkpoint."""
+    if application_scope.checkpoint:
+        return CheckpointedLogFile(
+            application_scope.infile.name,
+            application_scope.checkpoint,
+            inject_line_parser_class(application_scope))
+    return NullCheckpoint()
+
+
+def inject_database(application_scope, critical_date):
+    """Return a log database if requested, or a null log database."""
+    if application_scope.database:
+        return LogDatabase(
+            application_scope.database,
+            partial(inject_summary, critical_date),
+            application_scope.since,
+            application_scope.until,
+            application_scope.meetup_id)
+    return NullLogDatabase()
+
+
+def inject_summary(critical_date):
+    """Return a summary with a critical date for conflicts."""
     return Summary(
         inject_start_counter(),
         inject_crud_lister(),
-        inject_conflict_reporter(),
+        inject_conflict_reporter(critical_date),
         inject_location_mapper(),
-        inject_suppressed_event_tracker())
+        inject_suppressed_event_tracker(),
+        inject_timing_tracker())
 
 
-def inject_input_stream(application_scope):
+def inject_input_stream(application_scope, checkpoint):
     """Return the input stream."""
+    if application_scope.checkpoint:
+        return checkpoint
+    if application_scope.inputs:
+        return LogFiles(application_scope.inputs)
     return application_scope.infile
 
 
@@ -53,9 +94,9 @@ def inject_crud_lister():
     return CrudLister()
 
 
-def inject_conflict_reporter():
+def inject_conflict_reporter(critical_date):
     """Return an empty conflict reporter."""
-    return ConflictReporter(inject_date_today())
+    return ConflictReporter(critical_date)
 
 
 def inject_date_today():
@@ -73,10 +114,50 @@ def inject_suppressed_event_tracker():
     return SuppressedEventTracker()
 
 
-def inject_log_parser():
+def inject_timing_tracker():
+    """Return a run timing tracker."""
+    return TimingTracker()
+
+
+def inject_log_parser(application_scope, critical_date):
     """Return a function that provides a
-    log parser for some text."""
-    return make_log_parser_class()
+    log parser for an input stream."""
+    if application_scope.no_logs:
+        return NullLogParser
+    if application_scope.processes > 1:
+        return inject_sharded_log_parser(application_scope, critical_date)
+    log_parser_class = make_log_parser_class()
+    if application_scope.peg:
+        return make_whole_log_parser(log_parser_class)
+    return make_line_log_parser(
+        log_parser_class,
+        inject_line_parser_class(application_scope))
+
+
+def inject_line_parser_class(application_scope):
+    """Return the class of line log parser for the log format."""
+    if application_scope.json:
+        return JsonLogParser
+    return LineLogParser
+
+
+def inject_sharded_log_parser(application_scope, critical_date):
+    """Return a function that provides a log parser for an input stream,
+    parsing shards of the log in separate processes."""
+    processes = application_scope.processes
+    return make_sharded_log_parser(
+        partial(inject_summary, critical_date),
+        inject_make_process_executor(processes),
+        2 * processes,
+        line_parser_class=inject_line_parser_class(application_scope))
+
+
+def inject_make_process_executor(max_workers):
+    """Return a function that returns an executor running up to a maximum
+    number of tasks concurrently in separate processes."""
+    def make_executor():
+        return ProcessPoolExecutor(max_workers=max_workers)
+    return make_executor
 
 
 def inject_renderer(application_scope):
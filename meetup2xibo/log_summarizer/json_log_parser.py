@@ -0,0 +1,127 @@
+"""Parses JSON lines logs, taking values from log record arguments."""
+
+from .conflict import Conflict
+from .event import Event
+from .line_log_parser import LineLogParser
+from .log_parser import SpecialLocation
+from functools import lru_cache
+import json
+import re
+
+
+TIMESTAMP_LENGTH = len("2019-03-04 06:00")
+
+TIME_FIELD_NAMES = {"start_time", "end_time"}
+
+EVENT_TIME_PATTERN = re.compile(r"\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}")
+
+RULE_VALUE_TYPES = {
+    "event": (Event,),
+    "quoted_value": (str,),
+    "special_location": (SpecialLocation,),
+    "schedule_conflict_fragment": (str, Conflict),
+    "event_location_fragment": (str, Event),
+    }
+
+
+class JsonLogParser(LineLogParser):
+
+    """Parses log records written as JSON lines, collecting the interesting
+    information in a summary. Dispatches on each record's logger name and
+    message like a line log parser, but takes events, conflicts, and other
+    values from the record's trailing arguments instead of parsing them from
+    the message."""
+
+    def parse_line(self, line, next_line, summary):
+        """Parse a log line, given the next log line (or None), collecting
+        information in a summary. Return true if the next line was also
+        parsed."""
+        return self.dispatch_line(line, next_line, summary)
+
+    def parse_rest(self, line, message, prefix, rule, summary):
+        """Return the value that a log grammar rule would parse from the
+        rest of a message, or None if the line's record lacks one."""
+        return self.record_value(line, rule)
+
+    def parse_next_rest(
+            self, line, next_line, next_message, prefix, rule, summary):
+        """Return the value that a log grammar rule would parse from the
+        rest of the next line's message, or None if the next line's record
+        lacks one."""
+        return self.record_value(next_line, rule)
+
+    def parse_with_grammar(self, text, summary):
+        """Ignore log records that cannot be understood."""
+
+    @staticmethod
+    def split_line(line):
+        """Return a (timestamp, logger name, message) tuple from a JSON log
+        line, or None if the line does not hold a log record."""
+        record = load_record(line)
+        try:
+            return (
+                record["time"][:TIMESTAMP_LENGTH],
+                record["logger"],
+                record["message"])
+        except (KeyError, TypeError):
+            return None
+
+    @staticmethod
+    def record_value(line, rule):
+        """Return the value that a log grammar rule would parse, converted
+        from the trailing arguments of a JSON log line's record, or None if
+        the arguments do not hold such a value."""
+        value_types = RULE_VALUE_TYPES[rule]
+        try:
+            args = load_record(line)["args"]
+            if len(args) < len(value_types):
+                return None
+            values = [summary_value(arg) for arg in args[-len(value_types):]]
+        except (KeyError, TypeError, ValueError, AttributeError):
+            return None
+        for value, value_type in zip(values, value_types):
+            if not isinstance(value, value_type):
+                return None
+        return tuple(values) if len(values) > 1 else values[0]
+
+
+@lru_cache(maxsize=4)
+def load_record(line):
+    """Return the log record decoded from a JSON line, or None if the line
+    does not hold a JSON object."""
+    if line is None:
+        return None
+    try:
+        record = json.loads(line)
+    except ValueError:
+        return None
+    return record if isinstance(record, dict) else None
+
+
+def summary_value(arg):
+    """Return a log record argument converted to a summary value, such as
+    an event or a conflict."""
+    if not isinstance(arg, dict):
+        return arg
+    fields = [
+        (name, field_value(name, value))
+        for name, value in arg["fields"].items()]
+    if arg["type"] == "Conflict":
+        return Conflict.from_fields(fields)
+    if arg["type"] == "SpecialLocation":
+        return SpecialLocation(**dict(fields))
+    return Event.from_fields(fields)
+
+
+def field_value(name, value):
+    """Return a field value converted like the log grammar converts it,
+    keeping only the hours and minutes of event times."""
+    if isinstance(value, list):
+        return [summary_value(item) for item in value]
+    if name in TIME_FIELD_NAMES and isinstance(value, str) \
+            and EVENT_TIME_PATTERN.fullmatch(value):
+        return value[:TIMESTAMP_LENGTH]
+    return summary_value(value)
+
+
+# vim: tabstop=8 expandtab shiftwidth=4 softtabstop=4 autoindent
@@ -0,0 +1,306 @@
+"""Parses logs line by line, using the log grammar only for the parts of
+interesting lines that need it."""
+
+from .log_lines import InsertEventLogLine, DeleteEventLogLine, \
+    UpdateEventLogLine, UnknownLocationLogLine, EventLocationLogLine, \
+    SpecialLocationLogLine, RetireEventLogLine, SuppressEventLogLine
+from parsley import ParseError
+from functools import partial
+import re
+
+
+LINE_START_PATTERN = re.compile(
+    r"(\d{4}-\d{2}-\d{2}) (\d{2}:\d{2}):\d{2},\d{3}"
+    r" - (?:INFO|DEBUG|WARNING|ERROR|CRITICAL) - ")
+
+LOGGER_SEPARATOR = " - "
+
+
+class LineLogParser:
+
+    """Parses log lines, collecting the interesting information in a summary.
+    Dispatches on each line's logger name, skipping lines from uninteresting
+    loggers without parsing them further. Parses events, conflicts, and
+    quoted values with the log grammar, and falls back to the log grammar
+    for whole lines it cannot parse."""
+
+    def __init__(self, lines, log_parser_class):
+        """Initialize with an iterable of log lines and a log parser class
+        made from the log grammar."""
+        self.lines = lines
+        self.log_parser_class = log_parser_class
+        self.line_parsers = {
+            "meetup2xibo": self.parse_start_line,
+            "Meetup2Xibo": self.parse_no_changes_line,
+            "XiboEventCrudProcessor": self.parse_no_changes_line,
+            "XiboEventCrud": self.parse_event_crud_line,
+            "LocationChooser": self.parse_unknown_location_line,
+            "SpecialEventsMonitor": self.parse_special_location_line,
+            "ConflictAnalyzer": self.parse_conflict_analyzer_line,
+            "CheckedPlace": self.parse_checked_place_line,
+            "EventConverter": self.parse_event_location_line,
+            "EventSuppressor": self.parse_event_suppressor_line,
+            "PhaseTimer": self.parse_timings_line,
+            }
+
+    def log_lines(self, summary):
+        """Parse all log lines, collecting information in a summary."""
+        lines = iter(self.lines)
+        line = next(lines, None)
+        while line is not None:
+            next_line = next(lines, None)
+            if self.parse_line(line, next_line, summary):
+                next_line = next(lines, None)
+            line = next_line
+
+    def parse_line(self, line, next_line, summary):
+        """Parse a log line, given the next log line (or None), collecting
+        information in a summary. Return true if the next line was also
+        parsed."""
+        if not line.endswith("\n"):
+            self.parse_with_grammar(line, summary)
+            return False
+        return self.dispatch_line(line, next_line, summary)
+
+    def dispatch_line(self, line, next_line, summary):
+        """Parse a log line according to its logger name, given the next log
+        line (or None), collecting information in a summary. Return true if
+        the next line was also parsed."""
+        line_parts = self.split_line(line)
+        if line_parts is None:
+            return False
+        timestamp, logger, message = line_parts
+        line_parser = self.line_parsers.get(logger)
+        if line_parser is None:
+            return False
+        return line_parser(line, timestamp, message, next_line, summary)
+
+    def parse_start_line(self, line, timestamp, message, next_line, summary):
+        """Count program starts."""
+        if message.startswith("Start "):
+            summary.counter.count(message[len("Start "):], timestamp)
+        return False
+
+    def parse_no_changes_line(
+            self, line, timestamp, message, next_line, summary):
+        """Count runs that found no changes."""
+        if message.startswith("No changes: "):
+            summary.counter.count_no_changes(timestamp)
+        return False
+
+    def parse_event_crud_line(
+            self, line, timestamp, message, next_line, summary):
+        """Parse an event insert, delete, retire, suppress, or update."""
+        if message.startswith("Updated from Xibo"):
+            return self.parse_update_lines(
+                line, message, next_line, summary)
+        for prefix, make_log_line in (
+                ("Inserted ", InsertEventLogLine),
+                ("Deleted Xibo", DeleteEventLogLine),
+                ("Retired Xibo", RetireEventLogLine),
+                ("Suppressed Xibo", partial(
+                    self.make_suppress_log_line,
+                    summary.suppressed_event_tracker))):
+            if message.startswith(prefix):
+                event = self.parse_rest(
+                    line, message, prefix, "event", summary)
+                if event is not None:
+                    summary.crud_lister.add_log_line(
+                        make_log_line(timestamp, event))
+                break
+        return False
+
+    def parse_timings_line(
+            self, line, timestamp, message, next_line, summary):
+        """Parse the phase times and request latencies of a run."""
+        prefix = "Timings: "
+        if message.startswith(prefix):
+            summary.timing_tracker.add_timings(
+                timestamp, message[len(prefix):].rstrip("\n"))
+        return False
+
+    @staticmethod
+    def make_suppress_log_line(tracker, timestamp, event):
+        """Track a suppressed event and return a suppress event log line."""
+        return SuppressEventLogLine(timestamp, tracker.suppressed_event(event))
+
+    def parse_update_lines(self, line, message, next_line, summary):
+        """Parse an "Updated from" line and the following "Updated to" line.
+        Return true if the next line was parsed."""
+        from_event = self.parse_rest(
+            line, message, "Updated from Xibo", "event", summary)
+        if from_event is None:
+            return False
+        next_line_parts = self.split_line(next_line)
+        if next_line_parts is None:
+            return False
+        timestamp, logger, next_message = next_line_parts
+        if logger != "XiboEventCrud" \
+                or not next_message.startswith("Updated to "):
+            return False
+        to_event = self.parse_next_rest(
+            line, next_line, next_message, "Updated to ", "event", summary)
+        if to_event is not None:
+            summary.crud_lister.add_log_line(
+                UpdateEventLogLine(timestamp, from_event, to_event))
+        return True
+
+    def parse_unknown_location_line(
+            self, line, timestamp, message, next_line, summary):
+        """Parse an unknown location."""
+        prefix = "Unknown location for Partial"
+        if message.startswith(prefix):
+            event = self.parse_rest(line, message, prefix, "event", summary)
+            if event is not None:
+                summary.crud_lister.add_log_line(
+                    UnknownLocationLogLine(timestamp, event))
+        return False
+
+    def parse_special_location_line(
+            self, line, timestamp, message, next_line, summary):
+        """Parse a special location no longer needed."""
+        prefix = "No longer needed "
+        if message.startswith(prefix):
+            special_location = self.parse_rest(
+                line, message, prefix, "special_location", summary)
+            if special_location is not None:
+                summary.crud_lister.add_log_line(
+                    SpecialLocationLogLine(timestamp, special_location))
+        return False
+
+    def parse_conflict_analyzer_line(
+            self, line, timestamp, message, next_line, summary):
+        """Parse the start of conflict analysis."""
+        prefix = "Start conflict analysis"
+        if message == prefix:
+            summary.conflict_reporter.clear()
+        elif message.startswith(prefix):
+            self.parse_with_grammar(line, summary)
+        return False
+
+    def parse_checked_place_line(
+            self, line, timestamp, message, next_line, summary):
+        """Parse a checked place name or a schedule conflict."""
+        conflict_reporter = summary.conflict_reporter
+        if message.startswith("Name="):
+            place_name = self.parse_rest(
+                line, message, "Name=", "quoted_value", summary)
+            if place_name is not None:
+                conflict_reporter.add_checked_place(place_name)
+        elif message.startswith("Schedule conflict: place="):
+            place_conflict = self.parse_rest(
+                line, message, "Schedule conflict: place=",
+                "schedule_conflict_fragment", summary)
+            if place_conflict is not None:
+                conflict_reporter.add_conflict(*place_conflict)
+        return False
+
+    def parse_event_location_line(
+            self, line, timestamp, message, next_line, summary):
+        """Parse an event's computed location."""
+        prefix = "Location="
+        if message.startswith(prefix):
+            location_event = self.parse_rest(
+                line, message, prefix, "event_location_fragment", summary)
+            if location_event is not None:
+                summary.location_mapper.add_event_location_log_line(
+                    EventLocationLogLine(timestamp, *location_event))
+        return False
+
+    def parse_event_suppressor_line(
+            self, line, timestamp, message, next_line, summary):
+        """Parse a suppressed or unchecked Meetup ID."""
+        tracker = summary.suppressed_event_tracker
+        for prefix, track in (
+                ("Suppressed meetup_id=", tracker.suppressed_id),
+                ("Suppressed Meetup ID was not checked. meetup_id=",
+                    tracker.unchecked_id)):
+            if message.startswith(prefix):
+                meetup_id = self.parse_rest(
+                    line, message, prefix, "quoted_value", summary)
+                if meetup_id is not None:
+                    track(meetup_id)
+                break
+        return False
+
+    def parse_rest(self, line, message, prefix, rule, summary):
+        """Parse the rest of a message after a prefix with a log grammar
+        rule. Return the result, or None after parsing the whole line with
+        the log grammar instead."""
+        result = self.parse_fragment(message[len(prefix):], rule)
+        if result is None:
+            self.parse_with_grammar(line, summary)
+        return result
+
+    def parse_next_rest(
+            self, line, next_line, next_message, prefix, rule, summary):
+        """Parse the rest of the next line's message after a prefix with a
+        log grammar rule. Return the result, or None after parsing both lines
+        with the log grammar instead."""
+        result = self.parse_fragment(next_message[len(prefix):], rule)
+        if result is None or not next_line.endswith("\n"):
+            self.parse_with_grammar(line + next_line, summary)
+            return None
+        return result
+
+    def parse_fragment(self, text, rule):
+        """Parse all of a text with a log grammar rule. Return the result, or
+        None if the text does not match the rule."""
+        try:
+            return getattr(self.log_parser_class(text), rule)()
+        except ParseError:
+            return None
+
+    def parse_with_grammar(self, text, summary):
+        """Parse log lines with the log grammar, collecting information in a
+        summary."""
+        self.log_parser_class(text).log_lines(summary)
+
+    @classmethod
+    def is_start_line(cls, line):
+        """Return true if a log line records a program start."""
+        line_parts = cls.split_line(line)
+        if line_parts is None:
+            return False
+        timestamp, logger, message = line_parts
+        return logger == "meetup2xibo" and message.startswith("Start ")
+
+    @classmethod
+    def starts_line_pair(cls, line):
+        """Return true if a log line may be the first of a pair of lines
+        parsed together."""
+        line_parts = cls.split_line(line)
+        if line_parts is None:
+            return False
+        timestamp, logger, message = line_parts
+        return logger == "XiboEventCrud" \
+            and message.startswith("Updated from Xibo")
+
+    @staticmethod
+    def split_line(line):
+        """Return a (timestamp, logger name, message) tuple from a log line,
+        or None if the line does not start like a log line."""
+        if line is None:
+            return None
+        match = LINE_START_PATTERN.match(line)
+        if not match:
+            return None
+        logger, separator, message = \
+            line[match.end():].partition(LOGGER_SEPARATOR)
+        if not separator:
+            return None
+        if message.endswith("\n"):
+            message = message[:-1]
+        timestamp = "{} {}".format(match.group(1), match.group(2))
+        return timestamp, logger, message
+
+
+def make_line_log_parser(log_parser_class, line_parser_class=LineLogParser):
+    """Return a function that returns a line log parser reading lines from
+    an input stream as needed."""
+    def make_parser(input_stream):
+        return line_parser_class(input_stream, log_parser_class)
+    return make_parser
+
+
+# vim: tabstop=8 expandtab shiftwidth=4 softtabstop=4 autoindent
@@ -14,6 +14,11 @@ class LocationMapper:
         key_fields = log_line.key_fields()
         self._mappings[key_fields] = log_line
 
+    def merge(self, other):
+        """Add the mappings from another location mapper, replacing any
+        older mappings."""
+        self._mappings.update(other._mappings)
+
     def has_mappings(self):
         """Return true if there are location mappings; false otherwise."""
         return bool(self._mappings)
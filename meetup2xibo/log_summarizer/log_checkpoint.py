@@ -0,0 +1,180 @@
+"""Summarizes a growing log file incrementally, resuming from a
+checkpoint."""
+
+from .line_log_parser import LineLogParser
+import glob
+import locale
+import logging
+import os
+import pickle
+import re
+
+
+LOG_CHECKPOINT_FORMAT = 4
+
+HEAD_LENGTH = 1024
+
+ROTATED_SUFFIX = re.compile(r"\.\d{4}-\d{2}-\d{2}$")
+
+
+class CheckpointedLogFile:
+
+    """Reads the lines appended to a log file since the last checkpoint,
+    which holds the file's inode, the offset of the next line to read, the
+    first bytes of the file, and the summary of the lines already read. After
+    a daily rotation, finishes reading the rotated files before reading the
+    new log file. Reads the whole log file with an empty summary if it has
+    been truncated or replaced since the checkpoint, or if the rotated file
+    cannot be found."""
+
+    logger = logging.getLogger("CheckpointedLogFile")
+
+    def __init__(
+            self, log_path, checkpoint_path, line_parser_class=LineLogParser):
+        """Initialize with a log file path, a checkpoint file path, and the
+        class of line log parser that will parse the lines."""
+        self.log_path = log_path
+        self.checkpoint_path = checkpoint_path
+        self.line_parser_class = line_parser_class
+        self.encoding = locale.getpreferredencoding(False)
+        self.inode = None
+        self.head = b""
+        self.offset = 0
+        self.resume_offset = 0
+        self.rotated_paths = []
+
+    def load(self, summary):
+        """Load the checkpoint, if it matches the log file or a file rotated
+        from it, and return its summary. Otherwise return the given empty
+        summary."""
+        with open(self.log_path, "rb") as log_file:
+            self.inode = os.fstat(log_file.fileno()).st_ino
+            self.head = log_file.read(HEAD_LENGTH)
+        checkpoint = self.read_checkpoint()
+        if not self.matches(checkpoint):
+            self.rotated_paths = self.rotated_paths_since(checkpoint)
+            if not self.rotated_paths:
+                return summary
+            self.logger.info(
+                "Resuming in rotated log file %s", self.rotated_paths[0])
+        self.offset = self.resume_offset = checkpoint["offset"]
+        saved_summary = checkpoint["summary"]
+        saved_summary.conflict_reporter.check_critical_date(
+            summary.conflict_reporter.critical_date)
+        return saved_summary
+
+    def read_checkpoint(self):
+        """Return the checkpoint dictionary, or an empty dictionary if none
+        can be read."""
+        try:
+            with open(self.checkpoint_path, "rb") as checkpoint_file:
+                return pickle.load(checkpoint_file)
+        except FileNotFoundError:
+            return {}
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError,
+                ImportError, ValueError) as err:
+            self.logger.warning(
+                "Ignoring unreadable checkpoint %s: %s",
+                self.checkpoint_path, err)
+            return {}
+
+    def matches(self, checkpoint):
+        """Return true if a checkpoint matches the log file."""
+        saved_head = checkpoint.get("head", b"")
+        return checkpoint.get("format") == LOG_CHECKPOINT_FORMAT \
+            and checkpoint.get("inode") == self.inode \
+            and self.head[:len(saved_head)] == saved_head \
+            and checkpoint.get("offset", 0) <= self.file_size()
+
+    def file_size(self):
+        """Return the size of the log file."""
+        return os.stat(self.log_path).st_size
+
+    def rotated_paths_since(self, checkpoint):
+        """Return the paths of the rotated log files in the order rotated,
+        starting with the checkpointed file, or an empty list if the
+        checkpointed file is not among them."""
+        if checkpoint.get("format") != LOG_CHECKPOINT_FORMAT:
+            return []
+        paths = sorted(
+            path for path in glob.glob(glob.escape(self.log_path) + ".*")
+            if ROTATED_SUFFIX.search(path))
+        for index, path in enumerate(paths):
+            if self.is_checkpointed_file(path, checkpoint):
+                return paths[index:]
+        return []
+
+    @staticmethod
+    def is_checkpointed_file(path, checkpoint):
+        """Return true if the file at a path is the checkpointed file."""
+        with open(path, "rb") as rotated_file:
+            status = os.fstat(rotated_file.fileno())
+            head = rotated_file.read(HEAD_LENGTH)
+        saved_head = checkpoint.get("head", b"")
+        return checkpoint.get("inode") == status.st_ino \
+            and head[:len(saved_head)] == saved_head \
+            and checkpoint.get("offset", 0) <= status.st_size
+
+    def rotated_lines(self):
+        """Return an iterator over all the lines in the rotated log files
+        after the checkpoint. The log file is then read from its start."""
+        for path in self.rotated_paths:
+            with open(path, "rb") as rotated_file:
+                rotated_file.seek(self.offset)
+                for line_bytes in rotated_file:
+                    yield line_bytes.decode(self.encoding)
+            self.offset = self.resume_offset = 0
+        self.rotated_paths = []
+
+    def __iter__(self):
+        """Return an iterator over the complete lines after the checkpoint.
+        Remembers where to resume, holding back a final line that may be
+        the first of a pair."""
+        yield from self.rotated_lines()
+        with open(self.log_path, "rb") as log_file:
+            log_file.seek(self.offset)
+            for line_bytes in log_file:
+                if not line_bytes.endswith(b"\n"):
+                    break
+                line = line_bytes.decode(self.encoding)
+                line_offset = self.offset
+                self.offset += len(line_bytes)
+                if self.line_parser_class.starts_line_pair(line):
+                    self.resume_offset = line_offset
+                else:
+                    self.resume_offset = self.offset
+                yield line
+
+    def read(self):
+        """Return the text of all the complete lines after the
+        checkpoint."""
+        return "".join(self)
+
+    def save(self, summary):
+        """Save a checkpoint with the summary of the lines read."""
+        checkpoint = {
+            "format": LOG_CHECKPOINT_FORMAT,
+            "inode": self.inode,
+            "head": self.head,
+            "offset": self.resume_offset,
+            "summary": summary,
+            }
+        temp_path = self.checkpoint_path + ".tmp"
+        with open(temp_path, "wb") as checkpoint_file:
+            pickle.dump(checkpoint, checkpoint_file, pickle.HIGHEST_PROTOCOL)
+        os.replace(temp_path, self.checkpoint_path)
+
+
+class NullCheckpoint:
+
+    """A checkpoint that never holds a summary."""
+
+    def load(self, summary):
+        """Return the given summary."""
+        return summary
+
+    def save(self, summary):
+        """Do nothing."""
+
+
+# vim: tabstop=8 expandtab shiftwidth=4 softtabstop=4 autoindent
@@ -0,0 +1,400 @@
+"""Stores summarized log lines in an SQLite database and summarizes them
+again by query."""
+
+from .conflict import Conflict
+from .event import Event
+from .log_lines import InsertEventLogLine, DeleteEventLogLine, \
+    UpdateEventLogLine, UnknownLocationLogLine, EventLocationLogLine, \
+    SpecialLocationLogLine, RetireEventLogLine, SuppressEventLogLine
+from .log_parser import SpecialLocation
+from collections import Counter
+from contextlib import closing
+import datetime
+import json
+import logging
+import sqlite3
+
+
+LOG_DATABASE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS log_lines (
+    meetup_id TEXT NOT NULL,
+    timestamp TEXT NOT NULL,
+    action TEXT NOT NULL,
+    log_line TEXT NOT NULL,
+    occurrence INTEGER NOT NULL,
+    UNIQUE (meetup_id, timestamp, log_line, occurrence));
+CREATE INDEX IF NOT EXISTS log_lines_timestamp ON log_lines (timestamp);
+CREATE TABLE IF NOT EXISTS start_counts (
+    timestamp TEXT NOT NULL,
+    name TEXT NOT NULL,
+    count INTEGER NOT NULL,
+    PRIMARY KEY (timestamp, name));
+CREATE TABLE IF NOT EXISTS checked_places (
+    name TEXT NOT NULL);
+CREATE TABLE IF NOT EXISTS conflicts (
+    place TEXT NOT NULL,
+    start_time TEXT NOT NULL,
+    conflict TEXT NOT NULL);
+CREATE INDEX IF NOT EXISTS conflicts_start_time ON conflicts (start_time);
+CREATE TABLE IF NOT EXISTS timings (
+    timestamp TEXT NOT NULL,
+    timings TEXT NOT NULL,
+    PRIMARY KEY (timestamp, timings));
+CREATE TABLE IF NOT EXISTS suppressed_ids (
+    meetup_id TEXT NOT NULL,
+    unchecked INTEGER NOT NULL,
+    PRIMARY KEY (meetup_id, unchecked));
+"""
+
+EVENT_LOG_LINE_CLASSES = {
+    log_line_class.__name__: log_line_class
+    for log_line_class in (
+        InsertEventLogLine, DeleteEventLogLine, RetireEventLogLine,
+        SuppressEventLogLine, UnknownLocationLogLine)
+    }
+
+
+class LogDatabase:
+
+    """Stores the log lines of summaries in an SQLite database, indexed by
+    Meetup ID and timestamp, with the program start counts, the run timings,
+    the latest conflict analysis, and the latest suppressed Meetup IDs.
+    Summarizes the log lines within a date range, or those of one Meetup
+    event, by query. Log lines and conflicts are stored as JSON objects of
+    their fields."""
+
+    logger = logging.getLogger("LogDatabase")
+
+    def __init__(
+            self, database_path, make_summary,
+            since=None, until=None, meetup_id=None):
+        """Initialize with a database file path, a function that returns an
+        empty summary, optional first and last dates (strings formatted as
+        YYYY-MM-DD) of the log lines to summarize, and an optional Meetup ID
+        of the only event to summarize."""
+        self.database_path = database_path
+        self.make_summary = make_summary
+        self.since = since
+        self.until = until
+        self.meetup_id = meetup_id
+
+    def connect(self):
+        """Return a connection to the database, creating its tables if
+        needed."""
+        connection = sqlite3.connect(self.database_path)
+        connection.executescript(LOG_DATABASE_SCHEMA)
+        return connection
+
+    def save(self, summary):
+        """Add a summary to the database, ignoring log lines already
+        added."""
+        with closing(self.connect()) as connection, connection:
+            self.save_log_lines(connection, summary)
+            self.save_start_counts(connection, summary.counter)
+            self.save_timings(connection, summary.timing_tracker)
+            self.save_conflicts(connection, summary.conflict_reporter)
+            self.save_suppressed_ids(
+                connection, summary.suppressed_event_tracker)
+
+    def save_log_lines(self, connection, summary):
+        """Add the log lines collected in a summary. Identical log lines
+        logged in the same minute are told apart by their occurrence in the
+        summary, so saving the summary again adds nothing, but a repeated
+        action is kept."""
+        occurrences = Counter()
+
+        def rows():
+            for log_line in summary_log_lines(summary):
+                row = log_line_row(log_line)
+                occurrences[row] += 1
+                yield row + (occurrences[row],)
+        connection.executemany(
+            "INSERT OR IGNORE INTO log_lines VALUES (?, ?, ?, ?, ?)", rows())
+
+    @staticmethod
+    def save_start_counts(connection, counter):
+        """Add the program start counts, keeping the larger count where one
+        was already added at the same time. Summaries overlap, since each
+        checkpointed summary holds the counts of the summaries before it."""
+        timed_counts = counter.timed_counts()
+        connection.executemany(
+            "INSERT OR IGNORE INTO start_counts VALUES (?, ?, ?)",
+            timed_counts)
+        connection.executemany(
+            "UPDATE start_counts SET count = max(count, ?) "
+            "WHERE timestamp = ? AND name = ?",
+            ((count, timestamp, name)
+                for timestamp, name, count in timed_counts))
+
+    @staticmethod
+    def save_timings(connection, timing_tracker):
+        """Add the run timings, ignoring those already added."""
+        connection.executemany(
+            "INSERT OR IGNORE INTO timings VALUES (?, ?)",
+            timing_tracker.timings())
+
+    @staticmethod
+    def save_conflicts(connection, conflict_reporter):
+        """Replace the stored conflict analysis if the conflict reporter
+        collected one."""
+        if not conflict_reporter.has_analysis():
+            return
+        connection.execute("DELETE FROM checked_places")
+        connection.executemany(
+            "INSERT INTO checked_places VALUES (?)",
+            ((name,) for name in conflict_reporter.sorted_checked_places()))
+        connection.execute("DELETE FROM conflicts")
+        connection.executemany(
+            "INSERT INTO conflicts VALUES (?, ?, ?)",
+            (conflict_row(place, conflict)
+                for place, conflicts
+                in conflict_reporter.sorted_conflict_places()
+                for conflict in conflicts))
+
+    @staticmethod
+    def save_suppressed_ids(connection, tracker):
+        """Replace the stored suppressed Meetup IDs if the tracker collected
+        any."""
+        suppressed_ids = tracker.sorted_suppressed_ids()
+        unchecked_ids = tracker.sorted_unchecked_ids()
+        if not (suppressed_ids or unchecked_ids):
+            return
+        connection.execute("DELETE FROM suppressed_ids")
+        connection.executemany(
+            "INSERT INTO suppressed_ids VALUES (?, 0)",
+            ((meetup_id,) for meetup_id in suppressed_ids))
+        connection.executemany(
+            "INSERT INTO suppressed_ids VALUES (?, 1)",
+            ((meetup_id,) for meetup_id in unchecked_ids))
+
+    def load(self, summary):
+        """Return a new summary of the log lines in the database within the
+        date range or of the Meetup event, ignoring the given summary."""
+        summary = self.make_summary()
+        with closing(self.connect()) as connection:
+            self.load_log_lines(connection, summary)
+            if self.meetup_id is None:
+                self.load_start_counts(connection, summary.counter)
+                self.load_timings(connection, summary.timing_tracker)
+                self.load_conflicts(connection, summary.conflict_reporter)
+            self.load_suppressed_ids(
+                connection, summary.suppressed_event_tracker)
+        return summary
+
+    def load_log_lines(self, connection, summary):
+        """Add log lines to a summary in log order."""
+        conditions, parameters = self.time_conditions("timestamp")
+        if self.meetup_id is not None:
+            conditions.append("meetup_id = ?")
+            parameters.append(self.meetup_id)
+        rows = connection.execute(
+            "SELECT log_line FROM log_lines" + where_clause(conditions)
+            + " ORDER BY timestamp, rowid",
+            parameters)
+        for (log_line_text,) in rows:
+            try:
+                log_line = log_line_from_json(log_line_text)
+            except (ValueError, KeyError, TypeError, AssertionError) as err:
+                self.logger.warning(
+                    "Ignoring unreadable log line %r: %s", log_line_text, err)
+                continue
+            add_log_line(summary, log_line)
+
+    def load_start_counts(self, connection, counter):
+        """Add the program start counts to a start counter."""
+        conditions, parameters = self.time_conditions("timestamp")
+        rows = connection.execute(
+            "SELECT timestamp, name, count FROM start_counts"
+            + where_clause(conditions),
+            parameters)
+        for timestamp, name, count in rows:
+            counter.add_timed_count(timestamp, name, count)
+
+    def load_timings(self, connection, timing_tracker):
+        """Add the run timings to a timing tracker in log order."""
+        conditions, parameters = self.time_conditions("timestamp")
+        rows = connection.execute(
+            "SELECT timestamp, timings FROM timings"
+            + where_clause(conditions) + " ORDER BY timestamp, rowid",
+            parameters)
+        for timestamp, text in rows:
+            timing_tracker.add_timings(timestamp, text)
+
+    def load_conflicts(self, connection, conflict_reporter):
+        """Add the latest conflict analysis to a conflict reporter, keeping
+        only the conflicts starting within the date range."""
+        names = [
+            name for (name,)
+            in connection.execute("SELECT name FROM checked_places")]
+        if names:
+            conflict_reporter.clear()
+        for name in names:
+            conflict_reporter.add_checked_place(name)
+        conditions, parameters = self.time_conditions("start_time")
+        rows = connection.execute(
+            "SELECT place, conflict FROM conflicts"
+            + where_clause(conditions) + " ORDER BY rowid",
+            parameters)
+        for place, conflict_text in rows:
+            try:
+                conflict = conflict_from_json(conflict_text)
+            except (ValueError, KeyError, TypeError) as err:
+                self.logger.warning(
+                    "Ignoring unreadable conflict %r: %s", conflict_text, err)
+                continue
+            conflict_reporter.add_conflict(place, conflict)
+
+    def load_suppressed_ids(self, connection, tracker):
+        """Add the latest suppressed Meetup IDs to a tracker."""
+        conditions, parameters = [], []
+        if self.meetup_id is not None:
+            conditions.append("meetup_id = ?")
+            parameters.append(self.meetup_id)
+        rows = connection.execute(
+            "SELECT meetup_id, unchecked FROM suppressed_ids"
+            + where_clause(conditions),
+            parameters)
+        for meetup_id, unchecked in rows:
+            if unchecked:
+                tracker.unchecked_id(meetup_id)
+            else:
+                tracker.suppressed_id(meetup_id)
+
+    def time_conditions(self, column):
+        """Return a list of SQL conditions limiting a timestamp column to
+        the date range, and a list of their parameters."""
+        conditions, parameters = [], []
+        if self.since is not None:
+            conditions.append(column + " >= ?")
+            parameters.append(self.since)
+        if self.until is not None:
+            conditions.append(column + " < ?")
+            parameters.append(next_date(self.until))
+        return conditions, parameters
+
+
+class NullLogDatabase:
+
+    """A log database that stores nothing."""
+
+    def save(self, summary):
+        """Do nothing."""
+
+    def load(self, summary):
+        """Return the given summary."""
+        return summary
+
+
+def summary_log_lines(summary):
+    """Generate the log lines collected in a summary."""
+    for event_log in summary.crud_lister.event_logs.values():
+        yield from event_log.log_lines
+    yield from summary.location_mapper.mapping_list()
+
+
+def log_line_row(log_line):
+    """Return a database row holding a log line."""
+    return (
+        log_line.meetup_id, log_line.timestamp, log_line.action,
+        log_line_json(log_line))
+
+
+def log_line_json(log_line):
+    """Return JSON text holding the type and fields of a log line."""
+    fields = {
+        "type": type(log_line).__name__,
+        "timestamp": log_line.timestamp,
+        }
+    if isinstance(log_line, UpdateEventLogLine):
+        fields["before_event"] = event_fields(log_line.before_event)
+        fields["after_event"] = event_fields(log_line.after_event)
+    elif isinstance(log_line, SpecialLocationLogLine):
+        fields["special_location"] = log_line.special_location._asdict()
+    else:
+        fields["event"] = event_fields(log_line.event)
+        if isinstance(log_line, EventLocationLogLine):
+            fields["location"] = log_line.location
+    return json.dumps(fields, sort_keys=True)
+
+
+def log_line_from_json(text):
+    """Return a log line made from JSON text holding its type and
+    fields."""
+    fields = json.loads(text)
+    log_line_type = fields["type"]
+    timestamp = fields["timestamp"]
+    if log_line_type == UpdateEventLogLine.__name__:
+        return UpdateEventLogLine(
+            timestamp,
+            Event(**fields["before_event"]),
+            Event(**fields["after_event"]))
+    if log_line_type == SpecialLocationLogLine.__name__:
+        return SpecialLocationLogLine(
+            timestamp, SpecialLocation(**fields["special_location"]))
+    if log_line_type == EventLocationLogLine.__name__:
+        return EventLocationLogLine(
+            timestamp, fields["location"], Event(**fields["event"]))
+    log_line_class = EVENT_LOG_LINE_CLASSES[log_line_type]
+    return log_line_class(timestamp, Event(**fields["event"]))
+
+
+def event_fields(event):
+    """Return a dictionary of the fields of an event."""
+    return {
+        "name": event.name,
+        "start_time": event.start_time,
+        "end_time": event.end_time,
+        "meetup_id": event.meetup_id,
+        "location": event.location,
+        "venue_name": event.venue,
+        "find_us": event.find_us,
+        }
+
+
+def conflict_row(place, conflict):
+    """Return a database row holding a conflict at a place."""
+    return (place, conflict.start_time, conflict_json(conflict))
+
+
+def conflict_json(conflict):
+    """Return JSON text holding the fields of a conflict."""
+    return json.dumps({
+        "start_time": conflict.start_time,
+        "end_time": conflict.end_time,
+        "events": [event_fields(event) for event in conflict.events],
+        }, sort_keys=True)
+
+
+def conflict_from_json(text):
+    """Return a conflict made from JSON text holding its fields."""
+    fields = json.loads(text)
+    return Conflict(
+        fields["start_time"],
+        fields["end_time"],
+        [Event(**event) for event in fields["events"]])
+
+
+def add_log_line(summary, log_line):
+    """Add a log line to a summary."""
+    if isinstance(log_line, EventLocationLogLine):
+        summary.location_mapper.add_event_location_log_line(log_line)
+    else:
+        summary.crud_lister.add_log_line(log_line)
+
+
+def where_clause(conditions):
+    """Return an SQL WHERE clause requiring all of a list of conditions, or
+    an empty string if the list is empty."""
+    if not conditions:
+        return ""
+    return " WHERE " + " AND ".join(conditions)
+
+
+def next_date(date):
+    """Return the date after a date, both strings formatted as
+    YYYY-MM-DD."""
+    day = datetime.datetime.strptime(date, "%Y-%m-%d").date()
+    return (day + datetime.timedelta(days=1)).isoformat()
+
+
+# vim: tabstop=8 expandtab shiftwidth=4 softtabstop=4 autoindent
@@ -0,0 +1,75 @@
+"""Reads lines from several log files, some perhaps compressed."""
+
+from .line_log_parser import LINE_START_PATTERN
+import glob
+import gzip
+import lzma
+
+
+OPENERS = {
+    ".gz": gzip.open,
+    ".xz": lzma.open,
+    }
+
+TIMESTAMP_LENGTH = len("2019-03-04 06:00:12,345")
+
+
+class LogFiles:
+
+    """Reads lines from log files named by paths and glob patterns, in order
+    by each file's first timestamp. Decompresses gzip and xz files while
+    reading them."""
+
+    def __init__(self, patterns):
+        """Initialize with a list of paths and glob patterns."""
+        self.patterns = patterns
+
+    def __iter__(self):
+        """Return an iterator over the lines of all the log files."""
+        for path in self.sorted_paths():
+            with self.open(path) as log_file:
+                for line in log_file:
+                    if not line.endswith("\n"):
+                        line += "\n"
+                    yield line
+
+    def read(self):
+        """Return all the text of all the log files."""
+        return "".join(self)
+
+    def paths(self):
+        """Return a list of file paths matching the patterns, without
+        duplicates. Keeps paths without glob characters even if no such file
+        exists, so that opening them reports the problem."""
+        paths = []
+        for pattern in self.patterns:
+            if glob.has_magic(pattern):
+                matches = sorted(glob.glob(pattern))
+            else:
+                matches = [pattern]
+            paths.extend(path for path in matches if path not in paths)
+        return paths
+
+    def sorted_paths(self):
+        """Return the list of file paths ordered by first timestamp."""
+        return sorted(self.paths(), key=self.first_timestamp)
+
+    def first_timestamp(self, path):
+        """Return the first timestamp in a log file, or an empty string if
+        none."""
+        with self.open(path) as log_file:
+            for line in log_file:
+                if LINE_START_PATTERN.match(line):
+                    return line[:TIMESTAMP_LENGTH]
+        return ""
+
+    @staticmethod
+    def open(path):
+        """Open a log file for reading text, decompressing it if needed."""
+        for suffix, opener in OPENERS.items():
+            if path.endswith(suffix):
+                return opener(path, "rt")
+        return open(path)
+
+
+# vim: tabstop=8 expandtab shiftwidth=4 softtabstop=4 autoindent
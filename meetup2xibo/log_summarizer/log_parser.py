@@ -15,7 +15,7 @@ UpdateToLogLine = namedtuple("UpdateToLogLine", "timestamp event")
 Summary = namedtuple(
         "Summary",
         "counter crud_lister conflict_reporter location_mapper "
-        "suppressed_event_tracker")
+        "suppressed_event_tracker timing_tracker")
 SpecialLocation = namedtuple(
         "SpecialLocation",
         "meetup_id location override comment places")
@@ -25,16 +25,24 @@ GRAMMER = r"""
 log_lines :summary = log_line(summary)*
 
 log_line :summary = (start_log_line(summary.counter)
+        | no_changes_log_line(summary.counter)
         | event_log_line(summary)
         | conflict_analysis_log_line(summary.conflict_reporter)
         | event_location_log_line:l
                 -> summary.location_mapper.add_event_location_log_line(l)
         | suppressed_id_log_line(summary.suppressed_event_tracker)
+        | timings_log_line(summary.timing_tracker)
         | other_log_line) '\n'
 
 start_log_line :counter = log_line_start('meetup2xibo'):s
         'Start ' rest_of_line:p
-        -> counter.count(p)
+        -> counter.count(p, s.timestamp)
+
+no_changes_log_line :counter =
+        (log_line_start('Meetup2Xibo')
+            | log_line_start('XiboEventCrudProcessor')):s
+        'No changes: ' rest_of_line
+        -> counter.count_no_changes(s.timestamp)
 
 event_log_line :summary = (insert_log_line
         | delete_log_line
@@ -82,8 +90,11 @@ special_location = 'SpecialLocation(' fields:f ')'
         -> SpecialLocation(**dict(f))
 
 event_location_log_line = log_line_start('EventConverter'):s
-        'Location=' quoted_value:l ' MeetupEvent=Partial' event:e
-        -> EventLocationLogLine(s.timestamp, l, e)
+        'Location=' event_location_fragment:le
+        -> EventLocationLogLine(s.timestamp, *le)
+
+event_location_fragment = quoted_value:l ' MeetupEvent=Partial' event:e
+        -> (l, e)
 
 conflict_analysis_log_line :conflict_reporter =
         start_conflict_analysis_log_line -> conflict_reporter.clear()
@@ -96,7 +107,9 @@ start_conflict_analysis_log_line = log_line_start('ConflictAnalyzer')
 checked_place_log_line = log_line_start('CheckedPlace') 'Name=' quoted_value
 
 schedule_conflict_log_line = log_line_start('CheckedPlace')
-        'Schedule conflict: place=' quoted_value:p ' ' conflict:c -> (p, c)
+        'Schedule conflict: place=' schedule_conflict_fragment
+
+schedule_conflict_fragment = quoted_value:p ' ' conflict:c -> (p, c)
 
 conflict = 'Conflict(' conflict_fields:f ')' -> Conflict.from_fields(f)
 
@@ -115,6 +128,10 @@ suppressed_id_not_checked_log_line :tracker =
         quoted_value:v
         -> tracker.unchecked_id(v)
 
+timings_log_line :tracker = log_line_start('PhaseTimer'):s
+        'Timings: ' rest_of_line:t
+        -> tracker.add_timings(s.timestamp, t)
+
 other_log_line = rest_of_line
 
 log_line_start :logger = timestamp:t dash level:l dash exactly(logger) dash
@@ -205,6 +222,25 @@ def make_log_parser_class():
     return makeGrammar(GRAMMER, context)
 
 
+def make_whole_log_parser(log_parser_class):
+    """Return a function that returns a log parser for all the text read
+    from an input stream."""
+    def make_parser(input_stream):
+        return log_parser_class(input_stream.read())
+    return make_parser
+
+
+class NullLogParser:
+
+    """A log parser that reads no log lines."""
+
+    def __init__(self, input_stream):
+        """Initialize with an input stream that will not be read."""
+
+    def log_lines(self, summary):
+        """Do nothing."""
+
+
 def parse_error_hash(self):
     """Define missing ParseError.__hash__()."""
     return hash((self.position, self.formatReason()))
@@ -7,21 +7,26 @@ class LogSummarizer:
 
     def __init__(
             self, input_stream, output_stream, summary, log_parser,
-            renderer):
+            renderer, checkpoint, database):
         """Initialize with input and output streams, an empty summary, a
-        log parser, and a renderer."""
+        log parser, a renderer, a checkpoint, and a log database."""
         self.input_stream = input_stream
         self.output_stream = output_stream
         self.summary = summary
         self.log_parser = log_parser
         self.renderer = renderer
+        self.checkpoint = checkpoint
+        self.database = database
 
     def run(self):
         """Summarize the logs."""
-        log_text = self.input_stream.read()
-        parser = self.log_parser(log_text)
-        parser.log_lines(self.summary)
-        rendered_summary = self.renderer.render(self.summary)
+        summary = self.checkpoint.load(self.summary)
+        parser = self.log_parser(self.input_stream)
+        parser.log_lines(summary)
+        self.checkpoint.save(summary)
+        self.database.save(summary)
+        summary = self.database.load(summary)
+        rendered_summary = self.renderer.render(summary)
         self.output_stream.write(rendered_summary)
 
 
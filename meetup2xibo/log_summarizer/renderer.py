@@ -130,15 +130,19 @@ class SummaryRenderer:
         conflict_reporter = summary.conflict_reporter
         suppressed_event_tracker = summary.suppressed_event_tracker
         unneeded_meetup_ids = sorted(suppressed_event_tracker.unneeded_ids())
+        timing_tracker = summary.timing_tracker
         template = self.jinja2_env.get_template(self.template_name)
         return template.render(
                 counters=summary.counter.counts(),
+                no_changes_count=summary.counter.no_changes_count,
                 current_event_logs=crud_lister.sorted_current_event_logs(),
                 past_event_logs=crud_lister.sorted_past_event_logs(),
                 has_conflicts=conflict_reporter.has_conflicts(),
                 checked_places=conflict_reporter.sorted_checked_places(),
                 conflict_places=conflict_reporter.sorted_conflict_places(),
-                unneeded_meetup_ids=unneeded_meetup_ids
+                unneeded_meetup_ids=unneeded_meetup_ids,
+                phase_percentiles=timing_tracker.phase_percentiles(),
+                request_percentiles=timing_tracker.request_percentiles()
                 )
 
 
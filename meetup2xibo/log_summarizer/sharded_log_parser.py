@@ -0,0 +1,90 @@
+"""Parses shards of logs concurrently and merges their summaries."""
+
+from .line_log_parser import LineLogParser
+from .log_parser import make_log_parser_class
+from collections import deque
+from functools import lru_cache
+
+
+MIN_SHARD_LINES = 20000
+
+
+class ShardedLogParser:
+
+    """Splits log lines into shards starting at program start lines, parses
+    the shards concurrently, and merges their summaries in log order."""
+
+    def __init__(
+            self, lines, make_summary, make_executor, max_pending,
+            min_shard_lines=MIN_SHARD_LINES, line_parser_class=LineLogParser):
+        """Initialize with an iterable of log lines, a function that returns
+        an empty summary, a function that returns an executor, the maximum
+        number of shards parsing or waiting to merge, the minimum number of
+        lines in a shard, and the class of line log parser for each
+        shard."""
+        self.lines = lines
+        self.make_summary = make_summary
+        self.make_executor = make_executor
+        self.max_pending = max_pending
+        self.min_shard_lines = min_shard_lines
+        self.line_parser_class = line_parser_class
+
+    def log_lines(self, summary):
+        """Parse all log lines, collecting information in a summary."""
+        pending = deque()
+        with self.make_executor() as executor:
+            for shard in self.shards():
+                pending.append(executor.submit(
+                    parse_shard, shard, self.make_summary(),
+                    self.line_parser_class))
+                if len(pending) >= self.max_pending:
+                    merge_summary(summary, pending.popleft().result())
+            while pending:
+                merge_summary(summary, pending.popleft().result())
+
+    def shards(self):
+        """Generate lists of log lines, each but the first starting with a
+        program start line."""
+        shard = []
+        for line in self.lines:
+            if len(shard) >= self.min_shard_lines \
+                    and self.line_parser_class.is_start_line(line):
+                yield shard
+                shard = []
+            shard.append(line)
+        if shard:
+            yield shard
+
+
+def parse_shard(lines, summary, line_parser_class):
+    """Parse a shard of log lines with a class of line log parser,
+    collecting information in an empty summary. Return the summary."""
+    line_parser_class(lines, shared_log_parser_class()).log_lines(summary)
+    return summary
+
+
+@lru_cache(maxsize=None)
+def shared_log_parser_class():
+    """Return a log parser class made once per process."""
+    return make_log_parser_class()
+
+
+def merge_summary(summary, shard_summary):
+    """Merge a shard's summary into a summary of the preceding log lines."""
+    for component, shard_component in zip(summary, shard_summary):
+        component.merge(shard_component)
+
+
+def make_sharded_log_parser(
+        make_summary, make_executor, max_pending,
+        min_shard_lines=MIN_SHARD_LINES, line_parser_class=LineLogParser):
+    """Return a function that returns a sharded log parser reading lines
+    from an input stream."""
+    def make_parser(input_stream):
+        return ShardedLogParser(
+            input_stream, make_summary, make_executor, max_pending,
+            min_shard_lines, line_parser_class)
+    return make_parser
+
+
+# vim: tabstop=8 expandtab shiftwidth=4 softtabstop=4 autoindent
@@ -1,18 +1,51 @@
 """Counts program starts."""
 
+from collections import OrderedDict
+
+
+NO_CHANGES = "No changes"
+
+MAX_TIMED_COUNTS = 10000
+
 
 class StartCounter:
 
-    """Counts program starts."""
+    """Counts program starts in total and by time. Keeps at most a maximum
+    number of counts by time, so a summary saved in a checkpoint stays
+    bounded."""
 
-    def __init__(self):
-        """Initialize with no counters."""
+    def __init__(self, max_timed_counts=MAX_TIMED_COUNTS):
+        """Initialize with no counters and the maximum number of counts by
+        time to keep."""
         self.counters = {}
+        self.no_changes_count = 0
+        self.timed_counters = OrderedDict()
+        self.max_timed_counts = max_timed_counts
 
-    def count(self, name):
-        """Count the start of a named program."""
-        prev_count = self.counters.get(name, 0)
-        self.counters[name] = prev_count + 1
+    def count(self, name, timestamp=""):
+        """Count the start of a named program at a timestamp."""
+        self.add_timed_count(timestamp, name, 1)
+
+    def count_no_changes(self, timestamp=""):
+        """Count a run that found no changes to make at a timestamp."""
+        self.add_timed_count(timestamp, NO_CHANGES, 1)
+
+    def add_timed_count(self, timestamp, name, count):
+        """Add to the count of starts of a named program, or of runs that
+        found no changes if the name is NO_CHANGES, at a timestamp."""
+        if name == NO_CHANGES:
+            self.no_changes_count += count
+        else:
+            self.counters[name] = self.counters.get(name, 0) + count
+        key = (timestamp, name)
+        self.timed_counters[key] = self.timed_counters.get(key, 0) + count
+        while len(self.timed_counters) > self.max_timed_counts:
+            self.timed_counters.popitem(last=False)
+
+    def merge(self, other):
+        """Add the counts from another start counter."""
+        for (timestamp, name), count in other.timed_counters.items():
+            self.add_timed_count(timestamp, name, count)
 
     def counts(self):
         """Return a sorted list of (name, count) tuples."""
@@ -20,5 +53,12 @@ class StartCounter:
         tuples.sort()
         return tuples
 
+    def timed_counts(self):
+        """Return a sorted list of the latest (timestamp, name, count)
+        tuples, naming runs that found no changes NO_CHANGES."""
+        return sorted(
+            (timestamp, name, count)
+            for (timestamp, name), count in self.timed_counters.items())
+
 
 # vim: tabstop=8 expandtab shiftwidth=4 softtabstop=4 autoindent
@@ -22,6 +22,20 @@ class SuppressedEventTracker:
         """Track an unchecked Meetup ID that should be suppressed."""
         self._unchecked_ids.add(meetup_id)
 
+    def merge(self, other):
+        """Add the Meetup IDs tracked by another suppressed event
+        tracker."""
+        self._suppressed_ids.update(other._suppressed_ids)
+        self._unchecked_ids.update(other._unchecked_ids)
+
+    def sorted_suppressed_ids(self):
+        """Return a sorted list of suppressed Meetup IDs."""
+        return sorted(self._suppressed_ids)
+
+    def sorted_unchecked_ids(self):
+        """Return a sorted list of unchecked Meetup IDs."""
+        return sorted(self._unchecked_ids)
+
     def unneeded_ids(self):
         """Return a list of suppressed Meetup IDs no longer needed."""
         unneeded_ids = self._unchecked_ids - self._suppressed_ids
@@ -0,0 +1,112 @@
+"""Tracks run phase times and HTTP request latencies, reporting their
+percentiles."""
+
+from collections import OrderedDict, deque
+import math
+
+
+PERCENTS = (50, 90, 99)
+
+MAX_RUNS = 10000
+
+
+class TimingTracker:
+
+    """Tracks the phase times and HTTP request latencies logged once per run,
+    reporting percentiles across the latest runs. Keeps at most a maximum
+    number of runs, so a summary saved in a checkpoint stays bounded."""
+
+    def __init__(self, max_runs=MAX_RUNS):
+        """Initialize with no timings and the maximum number of runs to
+        keep."""
+        self._timings = deque(maxlen=max_runs)
+
+    def add_timings(self, timestamp, text):
+        """Add the timings logged by a run at a timestamp, listed in text as
+        phase name=seconds and request name=count/p50/p90/p99/maximum
+        seconds, forgetting the oldest run if there are too many."""
+        self._timings.append((timestamp, text))
+
+    def merge(self, other):
+        """Add the timings tracked by another timing tracker."""
+        for timestamp, text in other._timings:
+            self.add_timings(timestamp, text)
+
+    def has_timings(self):
+        """Return true if there are timings; false otherwise."""
+        return bool(self._timings)
+
+    def timings(self):
+        """Return a list of (timestamp, text) tuples of the timings logged
+        by each run."""
+        return list(self._timings)
+
+    def parsed_timings(self):
+        """Return dictionaries listing the seconds of each phase and the
+        (count, p50, p90, p99, maximum) tuples of each kind of request, one
+        per run. Ignore any malformed timings."""
+        phase_seconds = OrderedDict()
+        request_timings = OrderedDict()
+        for timestamp, text in self._timings:
+            for timing in text.split():
+                name, sep, value = timing.partition("=")
+                try:
+                    if "/" in value:
+                        timings = request_timings
+                        timing = request_timing(*value.split("/"))
+                    else:
+                        timings = phase_seconds
+                        timing = float(value)
+                except (TypeError, ValueError):
+                    continue
+                timings.setdefault(name, []).append(timing)
+        return phase_seconds, request_timings
+
+    def phase_percentiles(self):
+        """Return a list of (phase name, runs, percentile seconds...,
+        maximum seconds) tuples, with percentiles for PERCENTS."""
+        phase_seconds, request_timings = self.parsed_timings()
+        return [
+            (name, len(seconds)) + percentiles(seconds)
+            for name, seconds in phase_seconds.items()]
+
+    def request_percentiles(self):
+        """Return a list of (request name, requests, percentile seconds...,
+        maximum seconds) tuples. Each percentile for PERCENTS is taken across
+        runs of each run's latency at that same percentile, such as the p99
+        of the runs' p99 latencies, which is not the p99 of all requests."""
+        phase_seconds, request_timings = self.parsed_timings()
+        request_percentiles = []
+        for name, runs in request_timings.items():
+            counts, *run_percentiles, maximums = zip(*runs)
+            request_percentiles.append(
+                (name, sum(counts))
+                + tuple(
+                    percentile(sorted(values), percent)
+                    for percent, values in zip(PERCENTS, run_percentiles))
+                + (max(maximums),))
+        return request_percentiles
+
+
+def request_timing(count, p50, p90, p99, maximum):
+    """Return a (count, p50, p90, p99, maximum) tuple of a run's HTTP
+    requests of one kind."""
+    return (int(count), float(p50), float(p90), float(p99), float(maximum))
+
+
+def percentiles(values):
+    """Return a tuple of the nearest rank percentiles for PERCENTS of a list
+    of values, followed by the maximum value."""
+    sorted_values = sorted(values)
+    return tuple(
+        percentile(sorted_values, percent)
+        for percent in PERCENTS) + (sorted_values[-1],)
+
+
+def percentile(sorted_values, percent):
+    """Return the nearest rank percentile of a sorted list of values."""
+    rank = math.ceil(percent * len(sorted_values) / 100)
+    return sorted_values[max(0, rank - 1)]
+
+
+# vim: tabstop=8 expandtab shiftwidth=4 softtabstop=4 autoindent
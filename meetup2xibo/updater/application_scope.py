@@ -2,16 +2,35 @@
 environment variables needed by the application."""
 
 
+from .careful_environment import CarefulEnvironment
+from .env_file import read_env_file
+from .job_runner import load_jobs, check_job_logfiles
 from .special_location import SpecialLocation
 from .scope_cache import ScopeCache
+from .scope_executors import ScopeExecutors
+from .shared_cache import SharedCache
 import meetup2xibo
 import logging
-from collections import namedtuple
+from collections import ChainMap, namedtuple
 
 APP_NAME = "meetup2xibo"
 XIBO_PAGE_LENGTH = 50
-
-SECONDS_PER_HOUR = 60 * 60
+XIBO_PAGE_CONCURRENCY = 1
+XIBO_CRUD_CONCURRENCY = 1
+HTTP_POOL_SIZE = 10
+HTTP_RETRIES = 3
+HTTP_TIMEOUT_SECONDS = 60
+XIBO_TOKEN_EXPIRY_MARGIN_SECONDS = 300
+XIBO_METADATA_CACHE_HOURS = 24
+MEETUP_CACHE_MAX_AGE_MINUTES = 60
+XIBO_SYNC_STATE_MAX_AGE_MINUTES = 60
+STARTUP_CONCURRENCY = 1
+JOB_CONCURRENCY = 4
+PLACE_CACHE_SIZE = 1000
+CONFLICT_PROCESSES = 1
+
+SECONDS_PER_MINUTE = 60
+SECONDS_PER_HOUR = 60 * SECONDS_PER_MINUTE
 SECONDS_PER_DAY = 24 * SECONDS_PER_HOUR
 
 PhraseLocation = namedtuple("PhraseLocation", "phrase place")
@@ -21,12 +40,17 @@ class ApplicationScope:
 
     """Application scope provides configuration values."""
 
-    def __init__(self, args, env_vars):
-        """Initialize with parsed command line arguments and a careful
-        environment variable dictionary."""
+    def __init__(self, args, env_vars, shared_cache=None):
+        """Initialize with parsed command line arguments, a careful
+        environment variable dictionary, and an optional cache of resources
+        shared with other application scopes."""
         self._args = args
         self._env_vars = env_vars
+        self._shared_cache = shared_cache if shared_cache else SharedCache()
         self._event_suppressor_cache = ScopeCache()
+        self._jobs_cache = ScopeCache()
+        self._phase_timer_cache = ScopeCache()
+        self._executors = ScopeExecutors()
 
     @property
     def app_name(self):
@@ -36,6 +60,11 @@ class ApplicationScope:
     def conflict_places(self):
         return self._env_vars.json("CONFLICT_PLACES")
 
+    @property
+    def conflict_processes(self):
+        return int(self._env_vars.get(
+            "CONFLICT_PROCESSES", CONFLICT_PROCESSES))
+
     @property
     def conflicts(self):
         return self._args.conflicts
@@ -59,6 +88,15 @@ class ApplicationScope:
         return int(self._env_vars["DELETE_UNTIL_FUTURE_DAYS"]) \
                 * SECONDS_PER_DAY
 
+    def cycle_scope(self):
+        """Return an application scope for one daemon cycle, which shares
+        resources with this scope but caches nothing else."""
+        return ApplicationScope(self._args, self._env_vars, self._shared_cache)
+
+    @property
+    def daemon(self):
+        return self._args.daemon
+
     @property
     def debug(self):
         return self._args.debug
@@ -71,6 +109,10 @@ class ApplicationScope:
     def default_places(self):
         return self._env_vars.json("DEFAULT_PLACES")
 
+    @property
+    def envfile(self):
+        return self._args.envfile
+
     @property
     def end_time_column_name(self):
         return self._env_vars["END_TIME_COLUMN_NAME"]
@@ -79,18 +121,95 @@ class ApplicationScope:
     def event_dataset_code(self):
         return self._env_vars["EVENT_DATASET_CODE"]
 
+    def executor(self, name, executor_provider):
+        return self._executors.get(name, executor_provider)
+
     def event_suppressor(self, event_suppressor_provider):
         return self._event_suppressor_cache.get(event_suppressor_provider)
 
+    def http_session_factory(self, http_session_factory_provider):
+        key = (
+            "HttpSessionFactory", self.http_pool_size, self.http_retries,
+            self.http_timeout_seconds)
+        return self._shared_cache.get(key, http_session_factory_provider)
+
+    @property
+    def http_pool_size(self):
+        return int(self._env_vars.get("HTTP_POOL_SIZE", HTTP_POOL_SIZE))
+
+    @property
+    def http_retries(self):
+        return int(self._env_vars.get("HTTP_RETRIES", HTTP_RETRIES))
+
+    @property
+    def http_timeout_seconds(self):
+        return float(self._env_vars.get(
+            "HTTP_TIMEOUT_SECONDS", HTTP_TIMEOUT_SECONDS))
+
     @property
     def ignore_cancelled_after_seconds(self):
         return int(self._env_vars["IGNORE_CANCELLED_AFTER_DAYS"]) \
                 * SECONDS_PER_DAY
 
+    @property
+    def interval_seconds(self):
+        return self._args.interval * SECONDS_PER_MINUTE
+
+    @property
+    def jitter_seconds(self):
+        return self._args.jitter
+
+    @property
+    def job_concurrency(self):
+        return int(self._env_vars.get("JOB_CONCURRENCY", JOB_CONCURRENCY))
+
+    def job_scope(self, job):
+        """Return an application scope for a job, which overrides environment
+        variables and shares resources with this scope."""
+        env_vars = CarefulEnvironment(ChainMap(job.env, dict(self._env_vars)))
+        return ApplicationScope(self._args, env_vars, self._shared_cache)
+
+    @property
+    def jobs(self):
+        return self._jobs_cache.get(self._load_jobs)
+
+    def _load_jobs(self):
+        if not self._args.jobs:
+            return []
+        return check_job_logfiles(
+            load_jobs(self._args.jobs), self.job_concurrency)
+
+    @property
+    def json_logs(self):
+        return self._args.json_logs
+
     @property
     def location_column_name(self):
         return self._env_vars["LOCATION_COLUMN_NAME"]
 
+    def phase_timer(self, phase_timer_provider):
+        return self._phase_timer_cache.get(phase_timer_provider)
+
+    @property
+    def phrase_automaton_cache_path(self):
+        return self._env_vars.get("PHRASE_AUTOMATON_CACHE", "")
+
+    def phrase_mapper(self, phrase_tuples, phrase_mapper_provider):
+        key = ("PhraseMapper", phrase_tuples)
+        return self._shared_cache.get(key, phrase_mapper_provider)
+
+    @property
+    def place_cache_path(self):
+        return self._env_vars.get("PLACE_CACHE", "")
+
+    @property
+    def place_cache_size(self):
+        return int(self._env_vars.get("PLACE_CACHE_SIZE", PLACE_CACHE_SIZE))
+
+    def place_finder(self, key, place_finder_provider):
+        key = ("PlaceFinder", key)
+        return self._shared_cache.get(key, place_finder_provider)
+
     @property
     def place_phrases(self):
         return self._env_vars.json("PLACE_PHRASES")
@@ -113,6 +232,16 @@ class ApplicationScope:
     def mappings(self):
         return self._args.mappings
 
+    @property
+    def meetup_cache_path(self):
+        return self._env_vars.get("MEETUP_CACHE", "")
+
+    @property
+    def meetup_cache_max_age_seconds(self):
+        return float(self._env_vars.get(
+            "MEETUP_CACHE_MAX_AGE_MINUTES", MEETUP_CACHE_MAX_AGE_MINUTES)) \
+                * SECONDS_PER_MINUTE
+
     @property
     def meetup_events_wanted(self):
         return self._env_vars["MEETUP_EVENTS_WANTED"]
@@ -139,6 +268,10 @@ class ApplicationScope:
     def name_column_name(self):
         return self._env_vars["NAME_COLUMN_NAME"]
 
+    def shutdown_executors(self):
+        """Shut down the executors of this scope."""
+        self._executors.shutdown()
+
     @property
     def site_ca_path(self):
         return self._env_vars["SITE_CA_PATH"]
@@ -161,6 +294,11 @@ class ApplicationScope:
     def start_time_column_name(self):
         return self._env_vars["START_TIME_COLUMN_NAME"]
 
+    @property
+    def startup_concurrency(self):
+        return int(self._env_vars.get(
+            "STARTUP_CONCURRENCY", STARTUP_CONCURRENCY))
+
     @property
     def suppressed_event_ids(self):
         return self._env_vars.json("SUPPRESSED_EVENT_IDS")
@@ -169,6 +307,10 @@ class ApplicationScope:
     def timezone(self):
         return self._env_vars["TIMEZONE"]
 
+    @property
+    def timings_path(self):
+        return self._env_vars.get("TIMINGS_FILE", "")
+
     @property
     def verbose(self):
         return self._args.verbose
@@ -181,6 +323,16 @@ class ApplicationScope:
     def warnings(self):
         return self._args.warnings
 
+    def with_env_file(self):
+        """Return a new application scope with environment variables read
+        from the environment file, if any, overriding those of this scope."""
+        if self.envfile:
+            env_vars = CarefulEnvironment(
+                ChainMap(read_env_file(self.envfile), dict(self._env_vars)))
+        else:
+            env_vars = self._env_vars
+        return ApplicationScope(self._args, env_vars)
+
     @property
     def xibo_client_id(self):
         return self._env_vars["XIBO_CLIENT_ID"]
@@ -189,21 +341,64 @@ class ApplicationScope:
     def xibo_client_secret(self):
         return self._env_vars["XIBO_CLIENT_SECRET"]
 
+    @property
+    def xibo_crud_concurrency(self):
+        return int(self._env_vars.get(
+            "XIBO_CRUD_CONCURRENCY", XIBO_CRUD_CONCURRENCY))
+
     @property
     def xibo_host(self):
         return self._env_vars["XIBO_HOST"]
 
+    def xibo_session(self, xibo_session_provider, is_usable=None):
+        key = ("XiboSession", self.xibo_host, self.xibo_port,
+               self.xibo_client_id)
+        return self._shared_cache.get(key, xibo_session_provider, is_usable)
+
     @property
     def xibo_id_column_name(self):
         return self._env_vars["XIBO_ID_COLUMN_NAME"]
 
+    @property
+    def xibo_metadata_cache_path(self):
+        return self._env_vars.get("XIBO_METADATA_CACHE", "")
+
+    @property
+    def xibo_metadata_cache_seconds(self):
+        return float(self._env_vars.get(
+            "XIBO_METADATA_CACHE_HOURS", XIBO_METADATA_CACHE_HOURS)) \
+                * SECONDS_PER_HOUR
+
+    @property
+    def xibo_page_concurrency(self):
+        return int(self._env_vars.get(
+            "XIBO_PAGE_CONCURRENCY", XIBO_PAGE_CONCURRENCY))
+
     @property
     def xibo_page_length(self):
-        return XIBO_PAGE_LENGTH
+        return int(self._env_vars.get("XIBO_PAGE_LENGTH", XIBO_PAGE_LENGTH))
 
     @property
     def xibo_port(self):
         return self._env_vars["XIBO_PORT"]
 
+    @property
+    def xibo_sync_state_path(self):
+        return self._env_vars.get("XIBO_SYNC_STATE", "")
+
+    @property
+    def xibo_sync_state_max_age_seconds(self):
+        return float(self._env_vars.get(
+            "XIBO_SYNC_STATE_MAX_AGE_MINUTES",
+            XIBO_SYNC_STATE_MAX_AGE_MINUTES)) * SECONDS_PER_MINUTE
+
+    @property
+    def xibo_token_cache_path(self):
+        return self._env_vars.get("XIBO_TOKEN_CACHE", "")
+
+    @property
+    def xibo_token_expiry_margin_seconds(self):
+        return XIBO_TOKEN_EXPIRY_MARGIN_SECONDS
+
 
 # vim: tabstop=8 expandtab shiftwidth=4 softtabstop=4 autoindent
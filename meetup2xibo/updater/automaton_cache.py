@@ -0,0 +1,79 @@
+"""Caches built Aho-Corasick automata between runs."""
+
+import hashlib
+import logging
+import os
+import pickle
+
+
+AUTOMATON_CACHE_FORMAT = 1
+
+
+class AutomatonCache:
+
+    """Caches pickled Aho-Corasick automata in a directory, one file per hash
+    of the phrases used to build an automaton."""
+
+    logger = logging.getLogger("AutomatonCache")
+
+    def __init__(self, directory):
+        """Initialize with a directory path."""
+        self.directory = directory
+
+    def load(self, phrase_tuples):
+        """Return the cached automaton built from a sequence of phrase tuples,
+        or None if none is cached or the cached automaton cannot be read."""
+        path = self.path(phrase_tuples)
+        try:
+            with open(path, "rb") as automaton_file:
+                return pickle.load(automaton_file)
+        except FileNotFoundError:
+            return None
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError,
+                ImportError, ValueError) as err:
+            self.logger.warning(
+                "Ignoring unreadable automaton cache %s: %s", path, err)
+            return None
+
+    def save(self, phrase_tuples, automaton):
+        """Save an automaton built from a sequence of phrase tuples, or log a
+        warning if it cannot be saved."""
+        path = self.path(phrase_tuples)
+        temp_path = path + ".tmp"
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            with open(temp_path, "wb") as automaton_file:
+                pickle.dump(
+                    automaton, automaton_file, pickle.HIGHEST_PROTOCOL)
+            os.replace(temp_path, path)
+        except (OSError, pickle.PicklingError, TypeError,
+                AttributeError) as err:
+            self.logger.warning(
+                "Cannot save automaton cache %s: %s", path, err)
+
+    def path(self, phrase_tuples):
+        """Return the cache file path for a sequence of phrase tuples."""
+        file_name = "automaton-{}.pickle".format(self.key(phrase_tuples))
+        return os.path.join(self.directory, file_name)
+
+    @staticmethod
+    def key(phrase_tuples):
+        """Return a hex digest identifying a sequence of phrase tuples and the
+        cache format."""
+        content = repr((AUTOMATON_CACHE_FORMAT, tuple(phrase_tuples)))
+        return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+
+class NullAutomatonCache:
+
+    """A cache that never holds an automaton."""
+
+    def load(self, phrase_tuples):
+        """Return None."""
+        return None
+
+    def save(self, phrase_tuples, automaton):
+        """Do nothing."""
+
+
+# vim: tabstop=8 expandtab shiftwidth=4 softtabstop=4 autoindent
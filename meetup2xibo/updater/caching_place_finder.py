@@ -0,0 +1,106 @@
+"""Remembers the places found for recurring venue and find us texts."""
+
+from .phrase_mapper import normalize_text
+from collections import OrderedDict
+from threading import Lock
+import hashlib
+import logging
+
+
+PLACE_CACHE_FORMAT = 1
+
+
+class CachingPlaceFinder:
+
+    """Wraps a place finder with a bounded, least recently used cache of the
+    places found for each normalized venue name and find us text. The cache
+    may be saved between runs in a JSON file store, which it ignores if the
+    place phrase configuration has changed."""
+
+    logger = logging.getLogger("CachingPlaceFinder")
+
+    def __init__(self, place_finder, max_entries, json_file_store, config_key):
+        """Initialize with a place finder, a maximum number of cache entries,
+        a JSON file store, and a key identifying the place phrase
+        configuration."""
+        self.place_finder = place_finder
+        self.max_entries = max_entries
+        self.json_file_store = json_file_store
+        self.config_key = config_key
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.changed = False
+        self.lock = Lock()
+
+    def find_places(self, partial_event):
+        """Find a list of places from a partial Meetup event, remembering
+        them for other events with the same venue and find us texts."""
+        key = self.cache_key(partial_event)
+        with self.lock:
+            places = self.entries.get(key)
+            if places is not None:
+                self.entries.move_to_end(key)
+                self.hits += 1
+                return list(places)
+            self.misses += 1
+        places = self.place_finder.find_places(partial_event)
+        with self.lock:
+            self.remember(key, places)
+        return list(places)
+
+    def remember(self, key, places):
+        """Remember the places for a key, forgetting the least recently used
+        entries beyond the maximum."""
+        self.entries[key] = tuple(places)
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+        self.changed = True
+
+    def load(self):
+        """Load cached places saved with the same place phrase configuration
+        and return this place finder."""
+        data = self.json_file_store.load()
+        if data.get("config_key") != self.config_key:
+            return self
+        with self.lock:
+            for venue_name, find_us, places in data.get("entries", []):
+                self.remember((venue_name, find_us), places)
+            self.changed = False
+        return self
+
+    def save(self):
+        """Save the cached places if they changed and log the cache hits and
+        misses."""
+        with self.lock:
+            self.logger.info(
+                "Place cache: hits=%d misses=%d entries=%d",
+                self.hits, self.misses, len(self.entries))
+            if not self.changed:
+                return
+            entries = [
+                [venue_name, find_us, list(places)]
+                for (venue_name, find_us), places in self.entries.items()
+                ]
+            self.changed = False
+        self.json_file_store.save(
+            {"config_key": self.config_key, "entries": entries})
+
+    @staticmethod
+    def cache_key(partial_event):
+        """Return a cache key from the normalized venue name and find us
+        text of a partial event."""
+        return (
+            normalize_text(partial_event.venue_name),
+            normalize_text(partial_event.find_us))
+
+    @staticmethod
+    def config_key_from(phrase_tuple_tiers):
+        """Return a hex digest identifying tiers of place phrase tuples and
+        the cache format."""
+        content = repr((PLACE_CACHE_FORMAT, tuple(phrase_tuple_tiers)))
+        return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+
+# vim: tabstop=8 expandtab shiftwidth=4 softtabstop=4 autoindent
@@ -23,6 +23,11 @@ class CarefulEnvironment(collections.abc.Mapping):
             message = "Missing environment variable {}".format(key)
             raise MissingEnvVarError(message) from err
 
+    def get(self, key, default=None):
+        """Return the environment variable value with the named key if
+        present. Return the default otherwise."""
+        return self._env_vars.get(key, default)
+
     def __iter__(self):
         """Return an iterator over the environment variable keys."""
         return iter(self._env_vars)
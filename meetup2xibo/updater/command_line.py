@@ -15,6 +15,39 @@ parser.add_argument(
         action='store_true',
         help='Log debug messages (default: info and higher)')
 
+parser.add_argument(
+        '--daemon',
+        action='store_true',
+        help='Run repeatedly as a long-running process (default: run once)')
+
+parser.add_argument(
+        '-e', '--envfile',
+        help='Path to a shell-style file of environment variables, reread on '
+        'SIGHUP in daemon mode (default: use only the process environment)')
+
+parser.add_argument(
+        '--interval',
+        type=float,
+        default=15,
+        help='Minutes between runs in daemon mode (default: %(default)s)')
+
+parser.add_argument(
+        '--jitter',
+        type=float,
+        default=60,
+        help='Maximum random seconds added to the interval in daemon mode '
+        '(default: %(default)s)')
+
+parser.add_argument(
+        '-j', '--jobs',
+        help='Path to a JSON file listing jobs to run concurrently '
+        '(default: run one job configured by the environment)')
+
+parser.add_argument(
+        '--json-logs',
+        action='store_true',
+        help='Write log files as JSON lines (default: text lines)')
+
 parser.add_argument(
         '-l', '--logfile',
         default='meetup2xibo.log',
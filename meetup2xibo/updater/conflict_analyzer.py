@@ -1,9 +1,17 @@
 """Analyzes events scheduled at places, checking for conflicts."""
 
-from operator import attrgetter
+from .meetup_id_comparable import MeetupIdComparable
+from .places import CheckedPlace, Conflict
+from .serial_executor import SerialExecutor
+from collections import Counter, defaultdict
+from operator import attrgetter, itemgetter
 import logging
 
 
+START = 0
+END = 1
+
+
 class ConflictAnalyzer:
 
     """Analyzes events scheduled at places, checking for conflicts."""
@@ -97,6 +105,157 @@ class ConflictAnalyzer:
         return min(start_events[-1].start_time, end_events[-1].end_time)
 
 
+class IntervalConflictAnalyzer(ConflictAnalyzer):
+
+    """Analyzes events scheduled at places, checking for conflicts. Sweeps
+    each checked place's own sorted event starts and ends instead of visiting
+    every place at every clock tick, logging the same conflicts in the same
+    order. Places connected by containment are analyzed together, and
+    separate groups may be analyzed concurrently by an executor."""
+
+    def __init__(self, conflict_places, make_executor=SerialExecutor):
+        """Initialize with conflict places and a function returning an
+        executor for analyzing groups of connected places."""
+        super().__init__(conflict_places)
+        self.make_executor = make_executor
+
+    def sort_and_analyze_events(self, events):
+        """Sort event starts and ends by time before analyzing them at each
+        checked place and logging conflicts in clock order."""
+        endpoints = self.sorted_endpoints(events)
+        endpoints_by_place = self.endpoints_by_place(endpoints)
+        conflicts_by_place = self.conflicts_by_place(endpoints_by_place)
+        self.log_reportable_conflicts(conflicts_by_place)
+
+    def conflicts_by_place(self, endpoints_by_place):
+        """Return a dictionary of conflicts by end time for each checked
+        place, given its list of endpoints."""
+        places = list(endpoints_by_place)
+        endpoint_lists = [endpoints_by_place[place] for place in places]
+        return dict(zip(
+            places, self.analyze_endpoint_lists(places, endpoint_lists)))
+
+    def analyze_endpoint_lists(self, places, endpoint_lists):
+        """Return a list of dictionaries of conflicts by end time, one for
+        each list of endpoints at the corresponding place. Analyze the lists
+        for each connected component of places in a separate task."""
+        indexes_by_component = defaultdict(list)
+        for index, place in enumerate(places):
+            indexes_by_component[place.component].append(index)
+        conflict_dicts = [None] * len(places)
+        with self.make_executor() as executor:
+            futures = [
+                (indexes, executor.submit(
+                    analyze_endpoint_lists,
+                    [endpoint_lists[index] for index in indexes]))
+                for indexes in indexes_by_component.values()
+                ]
+            for indexes, future in futures:
+                for index, conflicts in zip(indexes, future.result()):
+                    conflict_dicts[index] = conflicts
+        return conflict_dicts
+
+    def sorted_endpoints(self, events):
+        """Return a list of (time, START or END, event) tuples in the order
+        a clock sweep would analyze them."""
+        start_events = reversed(self.events_by_start_time(events))
+        end_events = reversed(self.events_by_end_time(events))
+        endpoints = [
+            (event.start_time, START, event) for event in start_events]
+        endpoints.extend(
+            (event.end_time, END, event) for event in end_events)
+        return sorted(endpoints, key=itemgetter(0, 1))
+
+    def endpoints_by_place(self, endpoints):
+        """Return a dictionary of (time, comparable event, count change)
+        tuples listed by checked place."""
+        endpoints_by_place = defaultdict(list)
+        for time, kind, event in endpoints:
+            comparable_event = MeetupIdComparable(event)
+            increment = 1 if kind == START else -1
+            for place, count in self.checked_place_counts(event).items():
+                endpoints_by_place[place].append(
+                    (time, comparable_event, increment * count))
+        return endpoints_by_place
+
+    def checked_place_counts(self, event):
+        """Return a counter of the checked places where an event takes place,
+        directly or within containing places."""
+        return Counter(
+            place for place in self.conflict_places.event_places(event)
+            if isinstance(place, CheckedPlace))
+
+    @staticmethod
+    def place_conflicts(place_endpoints):
+        """Return a dictionary of conflicts by end time found at a place from
+        its list of (time, comparable event, count change) tuples."""
+        conflicts = {}
+        event_counts = {}
+        changed_events = []
+        clock = ""
+        for time, comparable_event, increment in place_endpoints:
+            if time != clock:
+                for changed_event in changed_events:
+                    if event_counts.get(changed_event, 1) <= 0:
+                        del event_counts[changed_event]
+                changed_events = []
+                if len(event_counts) > 1:
+                    sorted_events = sorted(
+                        event_counts, key=attrgetter('meetup_id'))
+                    conflicts[time] = Conflict(
+                        clock, time, tuple(sorted_events))
+                clock = time
+            event_counts[comparable_event] = \
+                event_counts.get(comparable_event, 0) + increment
+            changed_events.append(comparable_event)
+        return conflicts
+
+    def log_reportable_conflicts(self, conflicts_by_place):
+        """Log conflicts not also found at a containing checked place, ordered
+        by end time and then by place."""
+        reportable_conflicts = []
+        for order, place in enumerate(self.conflict_places.places()):
+            place_conflicts = conflicts_by_place.get(place, {})
+            containers = self.checked_containers(place)
+            for end_time, conflict in place_conflicts.items():
+                if not any(
+                        conflicts_by_place.get(container, {}).get(end_time)
+                        == conflict
+                        for container in containers):
+                    reportable_conflicts.append(
+                        (end_time, order, place, conflict))
+        reportable_conflicts.sort(key=itemgetter(0, 1))
+        for end_time, order, place, conflict in reportable_conflicts:
+            place.log_conflict(conflict)
+
+    @staticmethod
+    def checked_containers(place):
+        """Return the set of checked places containing a place directly or
+        through unchecked places."""
+        containers = set()
+        visited = set()
+        pending = list(place.containing_places)
+        while pending:
+            container = pending.pop()
+            if container in visited:
+                continue
+            visited.add(container)
+            if isinstance(container, CheckedPlace):
+                containers.add(container)
+            else:
+                pending.extend(container.containing_places)
+        return containers
+
+
+def analyze_endpoint_lists(endpoint_lists):
+    """Return a list of dictionaries of conflicts by end time, one for each
+    list of a place's endpoints. Runs in an executor's worker process."""
+    return [
+        IntervalConflictAnalyzer.place_conflicts(endpoints)
+        for endpoints in endpoint_lists
+        ]
+
+
 class NullConflictAnalyzer:
 
     """Skips time consuming analysis."""
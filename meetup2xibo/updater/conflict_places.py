@@ -1,6 +1,12 @@
 """Holds places to check for scheduling conflicts."""
 
+from .exceptions import ContainmentLoopError
 from .places import CheckedPlace, UncheckedPlace
+from operator import attrgetter
+
+
+VISITING = 1
+VISITED = 2
 
 
 class ConflictPlaces:
@@ -10,11 +16,16 @@ class ConflictPlaces:
     def __init__(self):
         """Initialize."""
         self._places = {}
+        self._closure_is_current = True
 
     def named_place(self, place_name):
         """Return the named place if it exists. Return None otherwise."""
         return self._places.get(place_name, None)
 
+    def places(self):
+        """Return a list of all places in the order they were added."""
+        return list(self._places.values())
+
     def named_or_unchecked_place(self, place_name):
         """Return the named place if it exists. Return a new unchecked place
         otherwise and add it to conflict places."""
@@ -27,6 +38,7 @@ class ConflictPlaces:
         """Add a named place to check for conflicts, replacing any previous
         place with the same name."""
         self._places[place_name] = CheckedPlace(place_name)
+        self._closure_is_current = False
 
     def add_containing_place(self, place_name, contained_places):
         """Add a place contiaining other places, given the place name and a
@@ -35,18 +47,134 @@ class ConflictPlaces:
         for place in contained_places:
             other_place = self.named_or_unchecked_place(place)
             containing_place.contain(other_place)
+        self._closure_is_current = False
+
+    def compute_containment_closure(self):
+        """Record every place's descendants (all places it contains directly
+        or indirectly), ancestors (all places containing it), and connected
+        component. Raise a containment loop error if any place contains
+        itself."""
+        sorted_places = self.topologically_sorted_places()
+        for place in reversed(sorted_places):
+            descendants = set(place.contained_places)
+            for contained_place in place.contained_places:
+                descendants |= contained_place.descendants
+            place.descendants = frozenset(descendants)
+        for place in sorted_places:
+            ancestors = set(place.containing_places)
+            for containing_place in place.containing_places:
+                ancestors |= containing_place.ancestors
+            place.ancestors = frozenset(ancestors)
+        self.number_components()
+        self._closure_is_current = True
+
+    def number_components(self):
+        """Number the connected components of the containment graph, giving
+        each place the number of its component."""
+        for place in self._places.values():
+            place.component = None
+        component = 0
+        for place in self._places.values():
+            if place.component is None:
+                self.number_component(place, component)
+                component += 1
+
+    @staticmethod
+    def number_component(place, component):
+        """Give a place and all places connected to it by containment a
+        component number."""
+        place.component = component
+        pending = [place]
+        while pending:
+            connected_place = pending.pop()
+            for other_place in connected_place.contained_places \
+                    | connected_place.containing_places:
+                if other_place.component is None:
+                    other_place.component = component
+                    pending.append(other_place)
+
+    def assure_containment_closure(self):
+        """Compute the containment closure if places changed since it was
+        last computed."""
+        if not self._closure_is_current:
+            self.compute_containment_closure()
+
+    def topologically_sorted_places(self):
+        """Return a list of all places with each containing place before the
+        places it contains."""
+        states = {}
+        sorted_places = []
+        for place in self._places.values():
+            self.visit_contained_places(place, states, [], sorted_places)
+        sorted_places.reverse()
+        return sorted_places
+
+    def visit_contained_places(self, place, states, path, sorted_places):
+        """Visit a place and then the places it contains, appending each
+        place to the sorted places after its contained places. Raise a
+        containment loop error if a place is already on the path. Keeps the
+        path and the places left to visit on explicit stacks, so deep
+        containment cannot exhaust the call stack."""
+        if not self.enter_place(place, states, path):
+            return
+        pending = [self.sorted_contained_places(place)]
+        while pending:
+            contained_place = next(pending[-1], None)
+            if contained_place is None:
+                pending.pop()
+                visited_place = path.pop()
+                states[visited_place] = VISITED
+                sorted_places.append(visited_place)
+            elif self.enter_place(contained_place, states, path):
+                pending.append(self.sorted_contained_places(contained_place))
+
+    def enter_place(self, place, states, path):
+        """Return true if a place needs visiting, adding it to the path.
+        Return false if it has been visited. Raise a containment loop error
+        if the place is already on the path."""
+        state = states.get(place)
+        if state == VISITED:
+            return False
+        if state == VISITING:
+            loop = path[path.index(place):] + [place]
+            raise ContainmentLoopError(self.containment_loop_message(loop))
+        states[place] = VISITING
+        path.append(place)
+        return True
+
+    @staticmethod
+    def sorted_contained_places(place):
+        """Return an iterator over the places a place contains, sorted by
+        name."""
+        return iter(sorted(place.contained_places, key=attrgetter("name")))
+
+    @staticmethod
+    def containment_loop_message(loop):
+        """Return an error message describing a list of places that contain
+        each other in a loop."""
+        return "Loop found among containing places: {}.".format(
+            " contains ".join(repr(place.name) for place in loop))
+
+    def event_places(self, event):
+        """Return a list of the places named by an event, each followed by
+        its descendants."""
+        self.assure_containment_closure()
+        places = []
+        for place_name in event.places:
+            place = self.named_or_unchecked_place(place_name)
+            places.append(place)
+            places.extend(place.descendants)
+        return places
 
     def start_event(self, event):
         """Analyze the start of an event at its places."""
-        for place_name in event.places:
-            place = self.named_or_unchecked_place(place_name)
-            place.start_event_carefully(event)
+        for place in self.event_places(event):
+            place.start_own_event(event)
 
     def end_event(self, event):
         """Analyze the end of an event at its places."""
-        for place_name in event.places:
-            place = self.named_or_unchecked_place(place_name)
-            place.end_event_carefully(event)
+        for place in self.event_places(event):
+            place.end_own_event(event)
 
     def log_conflicts(self, end_time):
         """Log conflicts in all places at an end time."""
@@ -72,10 +200,11 @@ class ConflictPlacesLoader:
         self.containing_places = containing_places
 
     def load(self):
-        """Load checked and containing places into conflict places. Return the
-        conflict places."""
+        """Load checked and containing places into conflict places and compute
+        their containment closure. Return the conflict places."""
         self.add_checked_places()
         self.add_containing_places()
+        self.conflict_places.compute_containment_closure()
         return self.conflict_places
 
     def add_checked_places(self):
@@ -0,0 +1,103 @@
+"""Runs Meetup to Xibo cycles on a schedule in a long-running process."""
+
+import logging
+import random
+import signal
+import threading
+import time
+
+
+class Daemon:
+
+    """Runs Meetup to Xibo cycles one after another on a schedule until
+    stopped. SIGTERM stops the daemon after the current cycle. SIGHUP reloads
+    the configuration and starts the next cycle right away."""
+
+    logger = logging.getLogger("Daemon")
+
+    def __init__(
+            self, reload_application_scope, enter_cycle_scope,
+            interval_seconds, jitter_seconds, no_trace_exceptions):
+        """Initialize with a function that returns a freshly configured
+        application scope, a function that enters a cycle scope within an
+        application scope and returns its processor, the seconds between
+        cycle starts, the maximum random seconds to add to the interval, and a
+        tuple of exception classes that need no traceback."""
+        self.reload_application_scope = reload_application_scope
+        self.enter_cycle_scope = enter_cycle_scope
+        self.interval_seconds = interval_seconds
+        self.jitter_seconds = jitter_seconds
+        self.no_trace_exceptions = no_trace_exceptions
+        self.stopping = False
+        self.reloading = False
+        self._wakeup = threading.Event()
+
+    def run(self):
+        """Run cycles until stopped."""
+        application_scope = self.reload_application_scope()
+        self.handle_signals()
+        cycle = 0
+        while not self.stopping:
+            if self.reloading:
+                application_scope = self.reload(application_scope)
+            cycle += 1
+            cycle_start = time.monotonic()
+            self.run_cycle(cycle, application_scope)
+            self.sleep(self.delay_after(cycle_start))
+        self.logger.info("Stopped after %d cycles", cycle)
+
+    def run_cycle(self, cycle, application_scope):
+        """Run a numbered cycle, logging any exception."""
+        self.logger.info("Start cycle %d", cycle)
+        try:
+            self.enter_cycle_scope(application_scope).run()
+        except self.no_trace_exceptions as err:
+            self.logger.error(
+                "Cycle %d: %s - %s", cycle, type(err).__name__, err)
+        except Exception:
+            self.logger.exception("Unexpected exception in cycle %d", cycle)
+        self.logger.info("End cycle %d", cycle)
+
+    def reload(self, application_scope):
+        """Return a freshly configured application scope, or the current
+        application scope if the configuration cannot be reloaded."""
+        self.reloading = False
+        try:
+            new_application_scope = self.reload_application_scope()
+        except self.no_trace_exceptions as err:
+            self.logger.error("Cannot reload configuration: %s", err)
+            return application_scope
+        self.logger.info("Reloaded configuration")
+        return new_application_scope
+
+    def delay_after(self, cycle_start):
+        """Return the seconds to wait before starting the next cycle given the
+        monotonic start time of the last cycle."""
+        next_start = cycle_start + self.interval_seconds \
+            + random.uniform(0, self.jitter_seconds)
+        return max(0, next_start - time.monotonic())
+
+    def sleep(self, seconds):
+        """Sleep for some seconds or until a signal arrives."""
+        if not (self.stopping or self.reloading):
+            self._wakeup.wait(seconds)
+        self._wakeup.clear()
+
+    def handle_signals(self):
+        """Handle the stop and reload signals."""
+        signal.signal(signal.SIGTERM, self.stop)
+        signal.signal(signal.SIGHUP, self.request_reload)
+
+    def stop(self, signum=None, frame=None):
+        """Stop after the current cycle. Handles SIGTERM."""
+        self.stopping = True
+        self._wakeup.set()
+
+    def request_reload(self, signum=None, frame=None):
+        """Reload the configuration before the next cycle, starting it right
+        away. Handles SIGHUP."""
+        self.reloading = True
+        self._wakeup.set()
+
+
+# vim: tabstop=8 expandtab shiftwidth=4 softtabstop=4 autoindent
@@ -0,0 +1,31 @@
+"""Reads environment variables from a shell-style environment file."""
+
+from .exceptions import EnvFileError
+import shlex
+
+
+def read_env_file(path):
+    """Return a dictionary of environment variables assigned in a file
+    written for a POSIX shell, such as "export NAME='value'" lines. Quoted
+    values may span several lines. Comments are ignored, but other shell
+    syntax, such as variable expansion, is not supported."""
+    try:
+        with open(path) as env_file:
+            words = shlex.split(env_file.read(), comments=True)
+    except (OSError, ValueError) as err:
+        message = "Cannot read environment file {}: {}".format(path, err)
+        raise EnvFileError(message) from err
+    env = {}
+    for word in words:
+        if word == "export":
+            continue
+        name, equals, value = word.partition("=")
+        if not equals or not name:
+            message = "Cannot read environment file {}: unexpected {!r}" \
+                .format(path, word)
+            raise EnvFileError(message)
+        env[name] = value
+    return env
+
+
+# vim: tabstop=8 expandtab shiftwidth=4 softtabstop=4 autoindent
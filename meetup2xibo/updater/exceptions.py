@@ -11,6 +11,16 @@ class ContainmentLoopError(Exception):
     """Raised when conflict analysis finds a loop in place containment."""
 
 
+class EnvFileError(Exception):
+
+    """Raised when an environment file cannot be read."""
+
+
+class JobsFileError(Exception):
+
+    """Raised when a jobs file cannot be loaded."""
+
+
 class JsonConversionError(Exception):
 
     """Raised when JSON conversion fails."""
@@ -0,0 +1,75 @@
+"""Caches JSON web responses with their validators for conditional
+requests."""
+
+import time
+
+
+HTTP_NOT_MODIFIED = 304
+
+
+class HttpResponseCache:
+
+    """Caches JSON web responses in a JSON file store, keyed by URL, along
+    with the ETag and Last-Modified validators needed to request them
+    conditionally."""
+
+    def __init__(self, json_file_store, max_age_seconds):
+        """Initialize with a JSON file store and the maximum number of seconds
+        to revalidate a cached response before requesting it in full."""
+        self.json_file_store = json_file_store
+        self.max_age_seconds = max_age_seconds
+
+    def conditional_headers(self, url, params):
+        """Return a dictionary of conditional request headers for a URL and
+        its request parameters. An ETag identifies content no matter the
+        parameters, but a modification date applies only to a request with
+        the same parameters."""
+        entry = self.fresh_entry(url)
+        headers = {}
+        if entry:
+            if entry.get("etag"):
+                headers["If-None-Match"] = entry["etag"]
+            if entry.get("last_modified") and entry["params"] == params:
+                headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def cached_json(self, url):
+        """Return the cached JSON response for a URL."""
+        return self.json_file_store.load()[url]["json"]
+
+    def save_response(self, url, params, response):
+        """Save a JSON response for a URL and its request parameters if the
+        response has validators."""
+        etag = response.headers.get("ETag")
+        last_modified = response.headers.get("Last-Modified")
+        if not (etag or last_modified):
+            return
+        entry = {
+            "etag": etag,
+            "last_modified": last_modified,
+            "params": params,
+            "json": response.json(),
+            "saved_at": time.time(),
+            }
+
+        def modify(entries):
+            entries[url] = entry
+        self.json_file_store.update(modify)
+
+    def fresh_entry(self, url):
+        """Return the cache entry for a URL if it is not too old to
+        revalidate. Return None otherwise."""
+        entry = self.json_file_store.load().get(url)
+        if entry and time.time() < entry["saved_at"] + self.max_age_seconds:
+            return entry
+        else:
+            return None
+
+    @staticmethod
+    def is_not_modified(response):
+        """Return true if a response reports that content was not modified;
+        false otherwise."""
+        return response.status_code == HTTP_NOT_MODIFIED
+
+
+# vim: tabstop=8 expandtab shiftwidth=4 softtabstop=4 autoindent
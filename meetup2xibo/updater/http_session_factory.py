@@ -0,0 +1,112 @@
+"""Provides web sessions that share pooled connections to each host."""
+
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from urllib.parse import urlsplit
+import requests
+import threading
+
+
+RETRY_STATUS_CODES = (502, 503, 504)
+RETRY_BACKOFF_FACTOR = 0.5
+
+
+class TimeoutHTTPAdapter(HTTPAdapter):
+
+    """An HTTP adapter that applies a default timeout to every request."""
+
+    def __init__(self, timeout, **kwargs):
+        """Initialize with a default timeout in seconds and any other HTTP
+        adapter keyword arguments."""
+        self.timeout = timeout
+        super().__init__(**kwargs)
+
+    def send(self, request, timeout=None, **kwargs):
+        """Send a prepared request, applying the default timeout unless the
+        request specifies another."""
+        if timeout is None:
+            timeout = self.timeout
+        return super().send(request, timeout=timeout, **kwargs)
+
+
+class HttpSessionFactory:
+
+    """Provides web sessions that share pooled keep-alive connections to each
+    host. Every session for a host mounts the same HTTP adapter, so its
+    connection pool, retry policy, and timeout are shared as well."""
+
+    def __init__(self, user_agent, pool_size, retries, timeout):
+        """Initialize with a user agent, a connection pool size per host, a
+        number of retries for failed connections or gateway errors, and a
+        request timeout in seconds."""
+        self.user_agent = user_agent
+        self.pool_size = pool_size
+        self.retries = retries
+        self.timeout = timeout
+        self._adapters = {}
+        self._sessions = {}
+        self._lock = threading.Lock()
+
+    def session_for(self, url):
+        """Return the shared web session for the URL's host."""
+        origin = self.origin(url)
+        with self._lock:
+            if origin not in self._sessions:
+                self._sessions[origin] = self.make_session(origin)
+            return self._sessions[origin]
+
+    def make_session(self, origin):
+        """Make a new web session for an origin."""
+        session = requests.Session()
+        self.configure_session(session, origin)
+        return session
+
+    def mount_adapter(self, session, url):
+        """Configure another web session, such as an OAuth2 session, to share
+        the pooled connections to the URL's host."""
+        origin = self.origin(url)
+        with self._lock:
+            self.configure_session(session, origin)
+
+    def configure_session(self, session, origin):
+        """Mount the shared HTTP adapter for an origin into a session and set
+        the user agent. Call only while holding the lock."""
+        session.mount(origin + "/", self.adapter_for(origin))
+        if self.user_agent:
+            session.headers.update({'User-Agent': self.user_agent})
+
+    def adapter_for(self, origin):
+        """Return the shared HTTP adapter for an origin. Call only while
+        holding the lock."""
+        if origin not in self._adapters:
+            self._adapters[origin] = self.make_adapter()
+        return self._adapters[origin]
+
+    def make_adapter(self):
+        """Make a new HTTP adapter with a connection pool, a retry policy, and
+        a default timeout."""
+        return TimeoutHTTPAdapter(
+            timeout=self.timeout,
+            pool_connections=1,
+            pool_maxsize=self.pool_size,
+            max_retries=self.make_retry())
+
+    def make_retry(self):
+        """Make a retry policy for failed connections and gateway errors.
+        Give up quietly on repeated error statuses, leaving their reporting to
+        the caller."""
+        return Retry(
+            total=self.retries,
+            backoff_factor=RETRY_BACKOFF_FACTOR,
+            status_forcelist=RETRY_STATUS_CODES,
+            raise_on_status=False)
+
+    @staticmethod
+    def origin(url):
+        """Return the scheme and network location of a URL, such as
+        "https://example.com:443"."""
+        parts = urlsplit(url)
+        return "{}://{}".format(parts.scheme, parts.netloc).lower()
+
+
+# vim: tabstop=8 expandtab shiftwidth=4 softtabstop=4 autoindent
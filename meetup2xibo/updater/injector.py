@@ -5,19 +5,21 @@ from .logging_context import LoggingContext
 from .logging_setup_manager import LoggingSetupManager
 from .http_response_error import HttpResponseError
 from .exceptions import DatasetDiscoveryError, ContainmentLoopError, \
-        JsonConversionError, MissingEnvVarError
+        EnvFileError, JobsFileError, JsonConversionError, MissingEnvVarError
 from .meetup2xibo import Meetup2Xibo, XiboSessionProcessor, \
         XiboEventCrudProcessor
-from .meetup_api import MeetupEventsRetriever
-from .place_finder import PlaceFinder
+from .meetup_api import MeetupEventsRetriever, MEETUP_API_URL
+from .place_finder import TieredPlaceFinder
+from .caching_place_finder import CachingPlaceFinder
 from .location_chooser import LocationChooser
-from .conflict_analyzer import ConflictAnalyzer, NullConflictAnalyzer
+from .conflict_analyzer import IntervalConflictAnalyzer, \
+        NullConflictAnalyzer
 from .conflict_places import ConflictPlaces, ConflictPlacesLoader
 from .event_converter import EventConverter, EventListConverter
 from .event_location import EventLocation
 from .event_suppressor import EventSuppressor
 from .event_updater import EventUpdater
-from .phrase_mapper import PhraseMapper
+from .phrase_mapper import TieredPhraseMapper
 from .xibo_api_url_builder import XiboApiUrlBuilder
 from .site_cert_assurer import SiteCertAssurer
 from .oauth2_session_starter import Oauth2SessionStarter, \
@@ -30,10 +32,26 @@ from .xibo_event import XiboEvent, XiboEventColumnNameManager, \
         XiboEventColumnIdManager
 from .xibo_event_crud import XiboEventCrud
 from .anti_flapper import AntiFlapper
+from .serial_executor import SerialExecutor
+from .job_context import JobContextExecutor
+from .job_runner import JobRunner
+from .daemon import Daemon
+from .http_session_factory import HttpSessionFactory
+from .json_file_store import JsonFileStore, NullJsonFileStore
+from .http_response_cache import HttpResponseCache
+from .oauth2_token_cache import Oauth2TokenCache
+from .xibo_metadata_cache import XiboMetadataCache
+from .xibo_sync_state_cache import XiboSyncStateCache, hash_events
+from .automaton_cache import AutomatonCache, NullAutomatonCache
+from .phase_timer import PhaseTimer
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from ahocorasick import Automaton
 from requests_toolbelt import user_agent
 from pytz import timezone
 import certifi
+import multiprocessing
+import sys
+import threading
 
 
 def inject_logging_application(application_scope):
@@ -60,7 +78,18 @@ def inject_logging_setup_manager(application_scope):
         filename=application_scope.logfile,
         verbose=application_scope.verbose,
         warnings=application_scope.warnings,
-        mappings=application_scope.mappings)
+        mappings=application_scope.mappings,
+        job_logfiles=inject_job_logfiles(application_scope),
+        json_lines=application_scope.json_logs)
+
+
+def inject_job_logfiles(application_scope):
+    """Return a dictionary of job names and their own log files configured by
+    an application scope."""
+    return {
+        job.name: job.logfile
+        for job in application_scope.jobs
+        if job.logfile}
 
 
 def inject_enter_logging_application_scope(application_scope):
@@ -68,7 +97,54 @@ def inject_enter_logging_application_scope(application_scope):
     processor configured by an application scope and a notional logging
     application scope."""
     def enter():
+        if application_scope.daemon:
+            return inject_daemon(application_scope)
+        else:
+            return inject_processor(application_scope.with_env_file())
+    return enter
+
+
+def inject_processor(application_scope):
+    """Return a job runner if an application scope lists jobs, or a Meetup to
+    Xibo converter configured by the application scope otherwise."""
+    if application_scope.jobs:
+        return inject_job_runner(application_scope)
+    else:
         return inject_meetup2xibo(application_scope)
+
+
+def inject_daemon(application_scope):
+    """Return a daemon configured by an application scope."""
+    return Daemon(
+        application_scope.with_env_file,
+        inject_enter_cycle_scope(),
+        application_scope.interval_seconds,
+        application_scope.jitter_seconds,
+        inject_no_trace_exceptions())
+
+
+def inject_enter_cycle_scope():
+    """Return a function that provides a processor configured by a daemon
+    cycle scope within an application scope."""
+    def enter(application_scope):
+        return inject_processor(application_scope.cycle_scope())
+    return enter
+
+
+def inject_job_runner(application_scope):
+    """Return a job runner configured by an application scope."""
+    return JobRunner(
+        application_scope.jobs,
+        inject_enter_job_scope(application_scope),
+        inject_executor(application_scope.job_concurrency),
+        inject_no_trace_exceptions())
+
+
+def inject_enter_job_scope(application_scope):
+    """Return a function configured by an application scope that provides a
+    Meetup to Xibo converter configured by a job's application scope."""
+    def enter(job):
+        return inject_meetup2xibo(application_scope.job_scope(job))
     return enter
 
 
@@ -78,6 +154,8 @@ def inject_no_trace_exceptions():
             HttpResponseError,
             ContainmentLoopError,
             DatasetDiscoveryError,
+            EnvFileError,
+            JobsFileError,
             JsonConversionError,
             MissingEnvVarError,
             Oauth2SessionStarterError)
@@ -86,9 +164,60 @@ def inject_no_trace_exceptions():
 def inject_meetup_events_retriever(application_scope):
     """Return a Meetup events retriever configured by an application scope."""
     return MeetupEventsRetriever(
+        inject_meetup_session(application_scope),
         group_url_name=application_scope.meetup_group_url_name,
         events_wanted=application_scope.meetup_events_wanted,
-        cancelled_last_time=inject_cancelled_last_time(application_scope))
+        cancelled_last_time=inject_cancelled_last_time(application_scope),
+        response_cache=inject_meetup_response_cache(application_scope),
+        phase_timer=inject_phase_timer(application_scope))
+
+
+def inject_phase_timer(application_scope):
+    """Return the phase timer for one run configured by an application
+    scope."""
+    return application_scope.phase_timer(
+        inject_phase_timer_provider(application_scope))
+
+
+def inject_phase_timer_provider(application_scope):
+    """Return a function that provides a phase timer configured by an
+    application scope."""
+    def get():
+        return PhaseTimer(
+            inject_json_file_store(application_scope.timings_path))
+    return get
+
+
+def inject_meetup_response_cache(application_scope):
+    """Return a Meetup response cache configured by an application scope."""
+    return HttpResponseCache(
+        inject_json_file_store(application_scope.meetup_cache_path),
+        application_scope.meetup_cache_max_age_seconds)
+
+
+def inject_meetup_session(application_scope):
+    """Return a web session for the Meetup API configured by an application
+    scope."""
+    return inject_http_session_factory(application_scope) \
+        .session_for(MEETUP_API_URL)
+
+
+def inject_http_session_factory(application_scope):
+    """Return the HTTP session factory configured by an application scope."""
+    return application_scope.http_session_factory(
+        inject_http_session_factory_provider(application_scope))
+
+
+def inject_http_session_factory_provider(application_scope):
+    """Return a function that provides an HTTP session factory configured by
+    an application scope."""
+    def get():
+        return HttpSessionFactory(
+            user_agent=inject_user_agent(application_scope),
+            pool_size=application_scope.http_pool_size,
+            retries=application_scope.http_retries,
+            timeout=application_scope.http_timeout_seconds)
+    return get
 
 
 def inject_location_chooser(application_scope):
@@ -100,38 +229,49 @@ def inject_location_chooser(application_scope):
 
 
 def inject_place_finder(application_scope):
-    """Return a place finder configured by an application scope."""
-    return PlaceFinder(inject_phrase_mappers(application_scope))
+    """Return a caching place finder configured by an application scope and
+    shared with other scopes using the same place phrases and cache."""
+    config_key = CachingPlaceFinder.config_key_from(
+        inject_phrase_tuple_tiers(application_scope))
+    path = application_scope.place_cache_path
+    max_entries = application_scope.place_cache_size
 
+    def get():
+        return CachingPlaceFinder(
+            TieredPlaceFinder(inject_tiered_phrase_mapper(application_scope)),
+            max_entries, inject_json_file_store(path), config_key).load()
+    return application_scope.place_finder(
+        (config_key, path, max_entries), get)
 
-def inject_phrase_mappers(application_scope):
-    """Return a list of phrase mappers configured by an application scope."""
-    return [
-        inject_places_phrase_mapper(application_scope),
-        inject_more_places_phrase_mapper(application_scope),
-        ]
 
+def inject_phrase_tuple_tiers(application_scope):
+    """Return tiers of place phrases and then more place phrases configured
+    by an application scope."""
+    return (
+        tuple(application_scope.place_phrase_tuples),
+        tuple(application_scope.more_place_phrase_tuples),
+        )
 
-def inject_places_phrase_mapper(application_scope):
-    """Return a phrase mapper for place phrases configured by an application
-    scope."""
-    return inject_phrase_mapper(
-        application_scope,
-        application_scope.place_phrase_tuples)
 
+def inject_tiered_phrase_mapper(application_scope):
+    """Return a phrase mapper for place phrases and then more place phrases
+    configured by an application scope."""
+    phrase_tuple_tiers = inject_phrase_tuple_tiers(application_scope)
 
-def inject_more_places_phrase_mapper(application_scope):
-    """Return a phrase mapper for more place phrases configured by an
-    application scope."""
-    return inject_phrase_mapper(
-        application_scope,
-        application_scope.more_place_phrase_tuples)
+    def get():
+        return TieredPhraseMapper(inject_automaton(), phrase_tuple_tiers) \
+            .setup_from_cache(inject_automaton_cache(application_scope))
+    return application_scope.phrase_mapper(phrase_tuple_tiers, get)
 
 
-def inject_phrase_mapper(application_scope, phrase_tuples):
-    """Return a phrase mapper configured by an application scope and a list of
-    tuples containing a phrase and its preferred phrase."""
-    return PhraseMapper(inject_automaton(), phrase_tuples).setup()
+def inject_automaton_cache(application_scope):
+    """Return an automaton cache configured by an application scope, or a
+    null cache if no cache directory is configured."""
+    directory = application_scope.phrase_automaton_cache_path
+    if directory:
+        return AutomatonCache(directory)
+    else:
+        return NullAutomatonCache()
 
 
 def inject_automaton():
@@ -171,12 +311,20 @@ def inject_xibo_api_url_builder(application_scope):
 def inject_site_cert_assurer(application_scope):
     """Return a site certificate assurer configured by an application scope."""
     return SiteCertAssurer(
+        session=inject_xibo_cert_session(application_scope),
         sys_ca_path=certifi.where(),
         site_ca_path=application_scope.site_ca_path,
         site_url=inject_cert_validation_url(application_scope),
         user_agent=inject_user_agent(application_scope))
 
 
+def inject_xibo_cert_session(application_scope):
+    """Return a web session for validating the Xibo certificate configured by
+    an application scope."""
+    return inject_http_session_factory(application_scope) \
+        .session_for(inject_cert_validation_url(application_scope))
+
+
 def inject_cert_validation_url(application_scope):
     """Return the URL for certificate validation configured by an application
     scope."""
@@ -205,7 +353,27 @@ def inject_oauth2_session_starter(application_scope):
         application_scope.xibo_client_id,
         application_scope.xibo_client_secret,
         inject_xibo_token_url(application_scope),
-        inject_user_agent(application_scope))
+        inject_user_agent(application_scope),
+        inject_http_session_factory(application_scope),
+        inject_oauth2_token_cache(application_scope))
+
+
+def inject_oauth2_token_cache(application_scope):
+    """Return an OAuth2 token cache configured by an application scope."""
+    return Oauth2TokenCache(
+        inject_json_file_store(application_scope.xibo_token_cache_path),
+        application_scope.xibo_client_id,
+        inject_xibo_token_url(application_scope),
+        application_scope.xibo_token_expiry_margin_seconds)
+
+
+def inject_json_file_store(path):
+    """Return a JSON file store for a path, or a null store if the path is
+    empty."""
+    if path:
+        return JsonFileStore(path)
+    else:
+        return NullJsonFileStore()
 
 
 def inject_event_suppressor(application_scope):
@@ -240,18 +408,35 @@ def inject_xibo_session_processor(application_scope, xibo_session_scope):
         inject_xibo_dataset_id_finder(application_scope, xibo_session_scope),
         inject_column_name_manager(application_scope),
         inject_xibo_api(application_scope, xibo_session_scope),
+        inject_xibo_metadata_cache(application_scope),
         inject_enter_xibo_event_crud_scope(
-                application_scope, xibo_session_scope)
+                application_scope, xibo_session_scope),
+        inject_phase_timer(application_scope)
         )
 
 
+def inject_xibo_metadata_cache(application_scope):
+    """Return a Xibo dataset metadata cache configured by an application
+    scope."""
+    return XiboMetadataCache(
+        inject_json_file_store(application_scope.xibo_metadata_cache_path),
+        inject_xibo_api_url_builder(application_scope).base_url,
+        application_scope.event_dataset_code,
+        application_scope.xibo_metadata_cache_seconds)
+
+
 def inject_xibo_api(application_scope, xibo_session_scope):
     """Return a Xibo API manager configured by an application scope and a Xibo
     session scope."""
     return XiboApi(
         xibo_session_scope.xibo_session,
         inject_xibo_api_url_builder(application_scope),
-        application_scope.xibo_page_length)
+        application_scope.xibo_page_length,
+        application_scope.xibo_page_concurrency,
+        inject_scope_executor(
+            application_scope, "XiboPages",
+            application_scope.xibo_page_concurrency),
+        inject_phase_timer(application_scope))
 
 
 def inject_xibo_dataset_id_finder(application_scope, xibo_session_scope):
@@ -296,10 +481,24 @@ def inject_xibo_event_crud_processor(
     return XiboEventCrudProcessor(
         inject_xibo_event_crud(
                 application_scope, xibo_session_scope, xibo_event_crud_scope),
-        inject_event_updater_provider(application_scope, xibo_session_scope)
+        inject_event_updater_provider(application_scope, xibo_session_scope),
+        inject_xibo_sync_state_cache(application_scope),
+        hash_events(
+            xibo_session_scope.meetup_events,
+            xibo_session_scope.cancelled_meetup_events),
+        inject_phase_timer(application_scope)
         )
 
 
+def inject_xibo_sync_state_cache(application_scope):
+    """Return a Xibo sync state cache configured by an application scope."""
+    return XiboSyncStateCache(
+        inject_json_file_store(application_scope.xibo_sync_state_path),
+        inject_xibo_api_url_builder(application_scope).base_url,
+        application_scope.event_dataset_code,
+        application_scope.xibo_sync_state_max_age_seconds)
+
+
 def inject_xibo_event_crud(
         application_scope, xibo_session_scope, xibo_event_crud_scope):
     """Return a Xibo event CRUD manager configured by an application scope, a
@@ -308,10 +507,56 @@ def inject_xibo_event_crud(
         inject_xibo_api(application_scope, xibo_session_scope),
         xibo_event_crud_scope.event_dataset_id,
         inject_column_name_manager(application_scope),
-        inject_xibo_event_column_id_manager(xibo_event_crud_scope)
+        inject_xibo_event_column_id_manager(xibo_event_crud_scope),
+        inject_xibo_crud_executor(application_scope)
         )
 
 
+def inject_xibo_crud_executor(application_scope):
+    """Return an executor for Xibo CRUD requests configured by an application
+    scope."""
+    return inject_executor(application_scope.xibo_crud_concurrency)
+
+
+def inject_scope_executor(application_scope, name, max_workers):
+    """Return a named executor that runs up to a maximum number of tasks
+    concurrently, shared within an application scope and shut down when the
+    scope's Meetup to Xibo converter finishes."""
+    def get():
+        return inject_executor(max_workers)
+    return application_scope.executor(name, get)
+
+
+def inject_executor(max_workers):
+    """Return an executor that runs up to a maximum number of tasks
+    concurrently.  A serial executor runs one task at a time."""
+    if max_workers > 1:
+        return JobContextExecutor(ThreadPoolExecutor(max_workers=max_workers))
+    else:
+        return SerialExecutor()
+
+
+def inject_make_process_executor(max_workers):
+    """Return a function that returns an executor running up to a maximum
+    number of tasks concurrently in separate processes. The processes are
+    spawned rather than forked, since forking while other threads hold locks
+    can deadlock the child. Python before 3.7 can only fork, so it runs tasks
+    serially whenever other threads are running. A serial executor runs one
+    task at a time."""
+    def make_executor():
+        if max_workers <= 1:
+            return SerialExecutor()
+        elif sys.version_info >= (3, 7):
+            return ProcessPoolExecutor(
+                max_workers=max_workers,
+                mp_context=multiprocessing.get_context("spawn"))
+        elif threading.active_count() > 1:
+            return SerialExecutor()
+        else:
+            return ProcessPoolExecutor(max_workers=max_workers)
+    return make_executor
+
+
 def inject_xibo_event_column_id_manager(xibo_event_crud_scope):
     """Return a Xibo column ID manager configured by a Xibo event CRUD
     scope."""
@@ -369,7 +614,9 @@ def inject_selected_conflict_analyzer(application_scope):
 
 def inject_conflict_analyzer(application_scope):
     """Return a conflict analyzer configured by an application scope."""
-    return ConflictAnalyzer(inject_conflict_places(application_scope))
+    return IntervalConflictAnalyzer(
+        inject_conflict_places(application_scope),
+        inject_make_process_executor(application_scope.conflict_processes))
 
 
 def inject_conflict_places(application_scope):
@@ -421,6 +668,13 @@ def inject_meetup2xibo(application_scope):
         inject_oauth2_session_starter(application_scope),
         inject_event_suppressor(application_scope),
         inject_enter_xibo_session_scope(application_scope),
+        inject_scope_executor(
+            application_scope, "Startup",
+            application_scope.startup_concurrency),
+        application_scope.xibo_session,
+        inject_place_finder(application_scope),
+        inject_phase_timer(application_scope),
+        application_scope.shutdown_executors
         )
 
 
@@ -0,0 +1,85 @@
+"""Tracks which job each thread is working on, so that logs from concurrent
+jobs can be told apart."""
+
+from concurrent.futures import Executor
+import logging
+import threading
+
+
+_local = threading.local()
+
+
+def current_job_name():
+    """Return the name of the job the current thread is working on, or None
+    outside any job."""
+    return getattr(_local, "job_name", None)
+
+
+class JobContext:
+
+    """A context in which the current thread works on a named job."""
+
+    def __init__(self, job_name):
+        """Initialize with a job name."""
+        self.job_name = job_name
+
+    def __enter__(self):
+        """Enter a 'with' context, working on the job."""
+        self._outer_job_name = current_job_name()
+        _local.job_name = self.job_name
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        """Exit a 'with' context, resuming any outer job."""
+        _local.job_name = self._outer_job_name
+
+
+class JobFilter(logging.Filter):
+
+    """Passes only log records from threads working on one of some jobs."""
+
+    def __init__(self, job_names):
+        """Initialize with a collection of job names."""
+        super().__init__()
+        self.job_names = frozenset(job_names)
+
+    def filter(self, record):
+        """Return true if the record comes from one of the jobs."""
+        return current_job_name() in self.job_names
+
+
+class OtherJobsFilter(JobFilter):
+
+    """Passes only log records from threads not working on any of some
+    jobs."""
+
+    def filter(self, record):
+        """Return true unless the record comes from one of the jobs."""
+        return not super().filter(record)
+
+
+class JobContextExecutor(Executor):
+
+    """Wraps an executor so that each task runs in the job context of the
+    thread that submitted it."""
+
+    def __init__(self, executor):
+        """Initialize with the executor to wrap."""
+        self.executor = executor
+
+    def submit(self, fn, *args, **kwargs):
+        """Submit a function with arguments to run in the current job context.
+        Return a future."""
+        job_name = current_job_name()
+
+        def run_in_job_context():
+            with JobContext(job_name):
+                return fn(*args, **kwargs)
+        return self.executor.submit(run_in_job_context)
+
+    def shutdown(self, wait=True):
+        """Shut down the wrapped executor."""
+        self.executor.shutdown(wait=wait)
+
+
+# vim: tabstop=8 expandtab shiftwidth=4 softtabstop=4 autoindent
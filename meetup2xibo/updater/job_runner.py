@@ -0,0 +1,110 @@
+"""Runs several Meetup to Xibo jobs concurrently in one process."""
+
+from .exceptions import JobsFileError
+from .job_context import JobContext
+from collections import OrderedDict, namedtuple
+from concurrent.futures import wait
+import json
+import logging
+
+
+Job = namedtuple("Job", "name logfile env")
+
+
+def load_jobs(path):
+    """Load a list of jobs from a JSON file. Each job has a name, an optional
+    log file, and a dictionary of environment variable overrides. Values other
+    than strings are converted to JSON strings."""
+    try:
+        with open(path) as jobs_file:
+            jobs_json = json.load(jobs_file)
+        return [
+            Job(
+                job["name"],
+                job.get("logfile"),
+                env_strings(job.get("env", {})))
+            for job in jobs_json]
+    except (OSError, ValueError, KeyError, TypeError, AttributeError) as err:
+        message = "Cannot load jobs file {}: {}".format(path, err)
+        raise JobsFileError(message) from err
+
+
+def check_job_logfiles(jobs, concurrency):
+    """Return a list of jobs after checking that jobs running concurrently do
+    not share a log file, where their lines could not be told apart. Jobs
+    without their own log file share the main log."""
+    if concurrency <= 1:
+        return jobs
+    job_names_by_logfile = OrderedDict()
+    for job in jobs:
+        job_names_by_logfile.setdefault(job.logfile, []).append(job.name)
+    for logfile, job_names in job_names_by_logfile.items():
+        if len(job_names) > 1:
+            message = "Concurrent jobs {} share the {} log file. Give each " \
+                "job its own logfile or set JOB_CONCURRENCY=1.".format(
+                    ", ".join(job_names), logfile or "main")
+            raise JobsFileError(message)
+    return jobs
+
+
+def env_strings(env):
+    """Return a dictionary of environment variables with JSON strings in
+    place of any values that are not strings."""
+    return {
+        key: value if isinstance(value, str) else json.dumps(value)
+        for key, value in env.items()}
+
+
+class JobRunner:
+
+    """Runs jobs concurrently, each in its own application scope and job
+    context. A failed job does not stop the others."""
+
+    logger = logging.getLogger("JobRunner")
+
+    def __init__(self, jobs, enter_job_scope, executor, no_trace_exceptions):
+        """Initialize with a list of jobs, a function to enter a job's scope
+        and return its processor, an executor for running jobs, and a tuple of
+        exception classes that need no traceback."""
+        self.jobs = jobs
+        self.enter_job_scope = enter_job_scope
+        self.executor = executor
+        self.no_trace_exceptions = no_trace_exceptions
+
+    def run(self):
+        """Run all the jobs, log any that failed, and shut down the
+        executor."""
+        try:
+            futures = [
+                self.executor.submit(self.run_job, job) for job in self.jobs]
+            wait(futures)
+        finally:
+            self.executor.shutdown()
+        failed_job_names = [
+            job.name
+            for job, future in zip(self.jobs, futures)
+            if not future.result()]
+        if failed_job_names:
+            self.logger.error("Failed jobs: %s", ", ".join(failed_job_names))
+
+    def run_job(self, job):
+        """Run a job in its own job context. Return true if the job succeeded;
+        false otherwise."""
+        with JobContext(job.name):
+            self.logger.info("Start job %s", job.name)
+            try:
+                self.enter_job_scope(job).run()
+                return True
+            except self.no_trace_exceptions as err:
+                self.logger.error(
+                    "Job %s: %s - %s", job.name, type(err).__name__, err)
+                return False
+            except Exception:
+                self.logger.exception("Unexpected exception in job %s",
+                                      job.name)
+                return False
+            finally:
+                self.logger.info("End job %s", job.name)
+
+
+# vim: tabstop=8 expandtab shiftwidth=4 softtabstop=4 autoindent
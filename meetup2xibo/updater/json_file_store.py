@@ -0,0 +1,93 @@
+"""Stores JSON data in a file readable only by its owner."""
+
+from threading import Lock
+import json
+import logging
+import os
+import tempfile
+
+
+_path_locks = {}
+_path_locks_lock = Lock()
+
+
+def path_lock(path):
+    """Return the lock shared by all JSON file stores for a file path."""
+    with _path_locks_lock:
+        return _path_locks.setdefault(os.path.abspath(path), Lock())
+
+
+class JsonFileStore:
+
+    """Loads and saves a JSON object in a file readable only by its owner.
+    Stores for the same path, such as those of concurrent jobs, share a lock
+    while updating the file."""
+
+    logger = logging.getLogger("JsonFileStore")
+
+    def __init__(self, path):
+        """Initialize with a file path."""
+        self.path = path
+        self.lock = path_lock(path)
+
+    def load(self):
+        """Load and return the JSON object from the file. Return an empty
+        dictionary if the file is missing or unreadable."""
+        try:
+            with open(self.path) as json_file:
+                return json.load(json_file)
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as err:
+            self.logger.warning("Ignoring unreadable %s: %s", self.path, err)
+            return {}
+
+    def save(self, data):
+        """Save a JSON object to the file, replacing the file atomically."""
+        with self.lock:
+            self.replace(data)
+
+    def update(self, modify):
+        """Load the JSON object from the file, change it in place with a
+        modify function, and save it, keeping other stores for the same path
+        from saving in between."""
+        with self.lock:
+            data = self.load()
+            modify(data)
+            self.replace(data)
+
+    def replace(self, data):
+        """Write a JSON object to a uniquely named temporary file, readable
+        only by its owner, and rename it over the file."""
+        directory, name = os.path.split(self.path)
+        with tempfile.NamedTemporaryFile(
+                "w", dir=directory or ".", prefix=name + ".", suffix=".tmp",
+                delete=False) as json_file:
+            try:
+                json.dump(data, json_file)
+            except BaseException:
+                json_file.close()
+                os.remove(json_file.name)
+                raise
+        os.replace(json_file.name, self.path)
+
+
+class NullJsonFileStore:
+
+    """Stores nothing, substituting for a JSON file store when no file has
+    been configured."""
+
+    def load(self):
+        """Return an empty dictionary."""
+        return {}
+
+    def save(self, data):
+        """Save nothing."""
+        pass
+
+    def update(self, modify):
+        """Save nothing."""
+        pass
+
+
+# vim: tabstop=8 expandtab shiftwidth=4 softtabstop=4 autoindent
@@ -0,0 +1,46 @@
+"""Formats log records as lines of JSON."""
+
+import json
+import logging
+
+
+class JsonLinesFormatter(logging.Formatter):
+
+    """Formats each log record as a line of JSON holding its time, level,
+    logger name, message, message format, and message arguments. Named tuple
+    arguments, such as events and conflicts, become objects with their type
+    name and fields."""
+
+    def format(self, record):
+        """Format a log record as a line of JSON."""
+        record_dict = {
+            "time": self.formatTime(record),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            "format": str(record.msg),
+            "args": self.json_value(record.args),
+            }
+        if record.exc_info:
+            record_dict["exception"] = self.formatException(record.exc_info)
+        return json.dumps(record_dict)
+
+    @classmethod
+    def json_value(cls, value):
+        """Return a value converted to types that JSON can represent."""
+        if hasattr(value, "_asdict"):
+            return {
+                "type": type(value).__name__,
+                "fields": cls.json_value(value._asdict()),
+                }
+        if isinstance(value, (list, tuple)):
+            return [cls.json_value(item) for item in value]
+        if isinstance(value, dict):
+            return {
+                str(key): cls.json_value(item) for key, item in value.items()}
+        if value is None or isinstance(value, (str, int, float, bool)):
+            return value
+        return str(value)
+
+
+# vim: tabstop=8 expandtab shiftwidth=4 softtabstop=4 autoindent
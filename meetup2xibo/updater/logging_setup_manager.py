@@ -1,5 +1,7 @@
 """Sets up the Python logging system."""
 
+from .job_context import JobFilter, OtherJobsFilter
+from .json_lines_formatter import JsonLinesFormatter
 import logging
 import logging.handlers
 
@@ -16,15 +18,20 @@ class LoggingSetupManager:
 
     def __init__(
             self, log_level=logging.INFO, filename=None,
-            verbose=False, warnings=False, mappings=False):
+            verbose=False, warnings=False, mappings=False, job_logfiles=None,
+            json_lines=False):
         """Initialize with a log level, an optional log file name, a verbose
         flag (sending logs to stderr), a warnings flag (sending warnings to
-        stderr), and a mappings flag to force location mapping logs."""
+        stderr), a mappings flag to force location mapping logs, an optional
+        dictionary of job names and their own log file names, and a JSON
+        lines flag (formatting log files as JSON lines)."""
         self.log_level = log_level
         self.filename = filename
         self.verbose = verbose
         self.warnings = warnings
         self.mappings = mappings
+        self.job_logfiles = job_logfiles if job_logfiles else {}
+        self.json_lines = json_lines
 
     def setup(self):
         """Setup the Python logging system."""
@@ -37,6 +44,7 @@ class LoggingSetupManager:
         root_logger.setLevel(self.log_level)
         self.log_to_stderr(root_logger)
         self.log_to_file(root_logger)
+        self.log_jobs_to_files(root_logger)
 
     def setup_mappings_logger(self):
         """Setup the mappings logger if requested."""
@@ -45,15 +53,35 @@ class LoggingSetupManager:
             logger.setLevel(logging.DEBUG)
 
     def log_to_file(self, root_logger):
-        """Add a file handler that rotates daily at midnight."""
+        """Add a file handler that rotates daily at midnight, omitting logs
+        from jobs with their own log files."""
         if self.filename:
-            handler = logging.handlers.TimedRotatingFileHandler(
-                    filename=self.filename,
-                    when='midnight',
-                    backupCount=5)
-            handler.setFormatter(FORMATTER)
+            handler = self.make_file_handler(self.filename)
+            handler.addFilter(OtherJobsFilter(self.job_logfiles.keys()))
+            root_logger.addHandler(handler)
+
+    def log_jobs_to_files(self, root_logger):
+        """Add a file handler for each job with its own log file."""
+        for job_name, filename in self.job_logfiles.items():
+            handler = self.make_file_handler(filename)
+            handler.addFilter(JobFilter([job_name]))
             root_logger.addHandler(handler)
 
+    def make_file_handler(self, filename):
+        """Make a file handler that rotates daily at midnight."""
+        handler = logging.handlers.TimedRotatingFileHandler(
+                filename=filename,
+                when='midnight',
+                backupCount=5)
+        handler.setFormatter(self.file_formatter())
+        return handler
+
+    def file_formatter(self):
+        """Return a formatter for log files."""
+        if self.json_lines:
+            return JsonLinesFormatter()
+        return FORMATTER
+
     def log_to_stderr(self, root_logger):
         """Add a stream handler that logs to standard error."""
         if self.verbose or self.warnings or not self.filename:
@@ -1,7 +1,12 @@
 """Retrieve events from Meetup, extract data to display on signs, and update
 Xibo."""
 
+from .http_response_error import XiboApiError
+from .phase_timer import NullPhaseTimer
+from .serial_executor import SerialExecutor
 from collections import namedtuple
+from concurrent.futures import wait
+import logging
 
 
 XiboSessionScope = namedtuple(
@@ -17,13 +22,21 @@ class Meetup2Xibo:
 
     """Downloads Meetup events into a Xibo database."""
 
+    logger = logging.getLogger("Meetup2Xibo")
+
     def __init__(
             self, meetup_events_retriever, conflict_analyzer,
             event_list_converter, site_cert_assurer, oauth2_session_starter,
-            event_suppressor, enter_xibo_session_scope):
+            event_suppressor, enter_xibo_session_scope, executor,
+            share_xibo_session, place_finder, phase_timer=None,
+            shutdown_executors=None):
         """Initialize with a Meetup events retriever, an event list converter,
         a site certificate assurer, an OAuth2 session starter, an event
-        suppressor, and a Xibo sesson scope entrance function."""
+        suppressor, a Xibo sesson scope entrance function, an executor for
+        overlapping network requests, a function that shares one Xibo
+        session given a function to start it and a function to check it, a
+        caching place finder, an optional phase timer, and an optional
+        function that shuts down the executors of the run's scope."""
         self.meetup_events_retriever = meetup_events_retriever
         self.conflict_analyzer = conflict_analyzer
         self.event_list_converter = event_list_converter
@@ -31,36 +44,96 @@ class Meetup2Xibo:
         self.oauth2_session_starter = oauth2_session_starter
         self.event_suppressor = event_suppressor
         self.enter_xibo_session_scope = enter_xibo_session_scope
+        self.executor = executor
+        self.share_xibo_session = share_xibo_session
+        self.place_finder = place_finder
+        self.phase_timer = phase_timer if phase_timer else NullPhaseTimer()
+        self.shutdown_executors = \
+            shutdown_executors if shutdown_executors else executor.shutdown
 
     def run(self):
-        """Run the Meetup to Xibo conversion."""
-        meetup_events = self.retreive_meetup_events()
-        cancelled_meetup_events = self.retreive_cancelled_meetup_events()
-        self.convert(meetup_events, cancelled_meetup_events)
-        self.conflict_analyzer.analyze_conflicts(meetup_events)
-        self.event_suppressor.log_all_ids()
+        """Run the Meetup to Xibo conversion, reporting the time taken by
+        each phase and then shutting down the run's executors."""
+        try:
+            with self.phase_timer.phase("run"):
+                self.run_phases()
+        finally:
+            self.phase_timer.report()
+            self.shutdown_executors()
 
-    def convert(self, meetup_events, cancelled_meetup_events):
-        """Convert Meetup events to Xibo events."""
-        xibo_session = self.start_xibo_session()
-        self.update_xibo_events(
-                meetup_events, cancelled_meetup_events, xibo_session)
+    def run_phases(self):
+        """Run the phases of the Meetup to Xibo conversion, unless Meetup
+        reports that no events changed since the last run."""
+        phase = self.phase_timer.phase
+        with phase("retrieve"):
+            json_events, cancelled_json_events, xibo_session_future = \
+                self.retrieve_and_connect()
+        if self.meetup_events_retriever.all_not_modified():
+            self.logger.info("No changes: Meetup events not modified")
+            return
+        with phase("convert"):
+            meetup_events = self.convert_meetup_events(json_events)
+            cancelled_meetup_events = self.convert_cancelled_meetup_events(
+                    cancelled_json_events)
+            self.place_finder.save()
+        with phase("update_xibo"):
+            xibo_session = self.connect(xibo_session_future)
+            self.update_xibo_events(
+                    meetup_events, cancelled_meetup_events, xibo_session)
+        with phase("analyze_conflicts"):
+            self.conflict_analyzer.analyze_conflicts(meetup_events)
+        self.event_suppressor.log_all_ids()
 
-    def retreive_meetup_events(self):
-        """Retrieve a list of Meetup events."""
+    def retrieve_and_connect(self):
+        """Retrieve the JSON Meetup events and cancelled events, starting a
+        Xibo session meanwhile if the executor runs requests concurrently.
+        Return the events, the cancelled events, and the future Xibo session
+        (or None if not started). Raise the first Meetup error after every
+        request finishes."""
         retriever = self.meetup_events_retriever
-        json_events = retriever.retrieve_events_json()
+        futures = [
+            self.executor.submit(retriever.retrieve_events_json),
+            self.executor.submit(retriever.retrieve_cancelled_events_json),
+            ]
+        if not isinstance(self.executor, SerialExecutor):
+            futures.append(self.executor.submit(self.start_xibo_session))
+        try:
+            json_events, cancelled_json_events = [
+                future.result() for future in futures[:2]]
+        except BaseException:
+            wait(futures)
+            raise
+        xibo_session_future = futures[2] if len(futures) > 2 else None
+        return json_events, cancelled_json_events, xibo_session_future
+
+    def connect(self, xibo_session_future):
+        """Return the Xibo session started while retrieving Meetup events, or
+        start one now, after the Meetup events have been converted, when
+        none was started."""
+        if xibo_session_future is None:
+            return self.start_xibo_session()
+        return xibo_session_future.result()
+
+    def convert_meetup_events(self, json_events):
+        """Convert JSON Meetup events to a list of Meetup events."""
         converter = self.event_list_converter
         return converter.convert_meetup_events(json_events)
 
-    def retreive_cancelled_meetup_events(self):
-        """Retrieve a list of cancelled Meetup events."""
-        retriever = self.meetup_events_retriever
-        json_events = retriever.retrieve_cancelled_events_json()
+    def convert_cancelled_meetup_events(self, json_events):
+        """Convert JSON cancelled Meetup events to a list of Meetup events."""
         converter = self.event_list_converter
         return converter.convert_cancelled_meetup_events(json_events)
 
     def start_xibo_session(self):
+        """Return a web session with the Xibo API server, shared with any
+        other jobs or daemon cycles using the same server until its token
+        nears expiration."""
+        with self.phase_timer.phase("start_xibo_session"):
+            return self.share_xibo_session(
+                self.start_new_xibo_session,
+                self.oauth2_session_starter.has_usable_token)
+
+    def start_new_xibo_session(self):
         """Return a new web session with the Xibo API server."""
         self.site_cert_assurer.assure_site_cert()
         return self.oauth2_session_starter.start_session()
@@ -78,22 +151,61 @@ class XiboSessionProcessor:
 
     """Retreives event dataset metadata from Xibo."""
 
+    logger = logging.getLogger("XiboSessionProcessor")
+
     def __init__(
             self, event_dataset_code, dataset_id_finder, column_name_manager,
-            xibo_api, enter_xibo_event_crud_scope):
+            xibo_api, metadata_cache, enter_xibo_event_crud_scope,
+            phase_timer=None):
         """Initialize with an event dataset code, a Xibo dataset ID finder, a
-        Xibo event column name manager, a Xibo API manager, and a function to
-        enter a Xibo event CRUD scope."""
+        Xibo event column name manager, a Xibo API manager, a Xibo metadata
+        cache, a function to enter a Xibo event CRUD scope, and an optional
+        phase timer."""
         self.event_dataset_code = event_dataset_code
         self.dataset_id_finder = dataset_id_finder
         self.column_name_manager = column_name_manager
         self.xibo_api = xibo_api
+        self.metadata_cache = metadata_cache
         self.enter_xibo_event_crud_scope = enter_xibo_event_crud_scope
+        self.phase_timer = phase_timer if phase_timer else NullPhaseTimer()
 
     def run(self):
-        """Retrieve event dataset metadata from Xibo."""
-        dataset_id = self.lookup_dataset_id()
-        column_ids = self.map_dataset_column_names(dataset_id)
+        """Retrieve event dataset metadata from Xibo, or from the cache if
+        possible, then update Xibo events."""
+        if not self.update_with_cached_metadata():
+            self.update_with_fresh_metadata()
+
+    def update_with_cached_metadata(self):
+        """Update Xibo events using cached dataset metadata. Return true if
+        the update succeeded; false if no metadata was cached or if Xibo
+        reported an error, possibly due to stale metadata, before any event
+        changes were requested. Forget the cached metadata and raise any
+        error reported after event changes were requested, since retrying
+        could repeat them."""
+        metadata = self.metadata_cache.load_metadata()
+        if not metadata:
+            return False
+        processor = self.enter_xibo_event_crud_scope(
+            XiboEventCrudScope(metadata.dataset_id, metadata.column_ids))
+        try:
+            processor.run()
+            return True
+        except XiboApiError as err:
+            self.metadata_cache.forget_metadata()
+            if processor.changes_requested():
+                raise
+            self.logger.info(
+                "Refreshing cached metadata for dataset %s after error: %s",
+                self.event_dataset_code, err)
+            return False
+
+    def update_with_fresh_metadata(self):
+        """Retrieve and cache event dataset metadata from Xibo, then update
+        Xibo events."""
+        with self.phase_timer.phase("xibo_metadata"):
+            dataset_id = self.lookup_dataset_id()
+            column_ids = self.map_dataset_column_names(dataset_id)
+        self.metadata_cache.save_metadata(dataset_id, column_ids)
         self.update_xibo_events(dataset_id, column_ids)
 
     def lookup_dataset_id(self):
@@ -116,18 +228,58 @@ class XiboSessionProcessor:
 class XiboEventCrudProcessor:
     """Updates events stored in Xibo to match the Meetup events."""
 
-    def __init__(self, xibo_event_crud, provide_event_updater):
-        """Initialize a Xibo event CRUD manager, and a function that provides
-        an event updater.  """
+    logger = logging.getLogger("XiboEventCrudProcessor")
+
+    def __init__(
+            self, xibo_event_crud, provide_event_updater, sync_state_cache,
+            events_hash, phase_timer=None):
+        """Initialize a Xibo event CRUD manager, a function that provides an
+        event updater, a Xibo sync state cache, a hash of the Meetup events,
+        and an optional phase timer."""
         self.xibo_event_crud = xibo_event_crud
         self.provide_event_updater = provide_event_updater
+        self.sync_state_cache = sync_state_cache
+        self.events_hash = events_hash
+        self.phase_timer = phase_timer if phase_timer else NullPhaseTimer()
 
     def run(self):
-        """Update events stored in Xibo to match the Meetup events."""
-        xibo_events = self.xibo_event_crud.get_xibo_events()
+        """Update events stored in Xibo to match the Meetup events, unless
+        they matched after the last update and Xibo still has as many
+        events."""
+        with self.phase_timer.phase("xibo_sync_check"):
+            in_sync = self.is_in_sync()
+        if in_sync:
+            self.logger.info("No changes: Xibo events match Meetup events")
+            return
+        row_count = self.update_xibo_events()
+        self.sync_state_cache.save_state(self.events_hash, row_count)
+
+    def changes_requested(self):
+        """Return true if any Xibo event changes were requested; false
+        otherwise."""
+        return self.xibo_event_crud.changes_requested
+
+    def is_in_sync(self):
+        """Return true if the Meetup events and the Xibo row count match the
+        cached state of the last update; false otherwise."""
+        state = self.sync_state_cache.load_state()
+        return bool(state) and state.events_hash == self.events_hash \
+            and state.row_count == self.xibo_event_crud.count_xibo_events()
+
+    def update_xibo_events(self):
+        """Update events stored in Xibo to match the Meetup events. Return the
+        resulting number of Xibo events."""
+        phase = self.phase_timer.phase
+        with phase("xibo_paging"):
+            xibo_events = list(self.xibo_event_crud.get_xibo_events())
         event_updater = self.provide_event_updater(
             self.xibo_event_crud, xibo_events)
-        event_updater.update_xibo()
+        with phase("xibo_crud"):
+            try:
+                event_updater.update_xibo()
+            finally:
+                self.xibo_event_crud.finish()
+        return len(xibo_events) + self.xibo_event_crud.row_count_change
 
 
 # vim: tabstop=8 expandtab shiftwidth=4 softtabstop=4 autoindent
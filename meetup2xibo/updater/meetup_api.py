@@ -1,18 +1,28 @@
 """Access Meetup API to download events."""
 
 from .http_response_error import MeetupApiError
-import requests
+from .phase_timer import NullPhaseTimer
+
+
+MEETUP_API_URL = "https://api.meetup.com/"
 
 
 class MeetupEventsRetriever:
 
     def __init__(
-            self, group_url_name, events_wanted, cancelled_last_time):
-        """Initialize with a Meetup group URL name, the number of events wanted
-        from Meetup, and the last time allowed for cancelled events."""
+            self, session, group_url_name, events_wanted,
+            cancelled_last_time, response_cache, phase_timer=None):
+        """Initialize with a web session, a Meetup group URL name, the number
+        of events wanted from Meetup, the last time allowed for cancelled
+        events, a response cache for conditional requests, and an optional
+        phase timer for request latency."""
+        self.session = session
         self.group_url_name = group_url_name
         self.events_wanted = events_wanted
         self.cancelled_last_time = cancelled_last_time
+        self.response_cache = response_cache
+        self.modified_flags = []
+        self.phase_timer = phase_timer if phase_timer else NullPhaseTimer()
 
     def retrieve_events_json(self, **kwargs):
         """Retrieve the JSON event list, adding keyword arguments to the usual
@@ -20,8 +30,17 @@ class MeetupEventsRetriever:
         url = self.build_url()
         params = self.request_params()
         params.update(kwargs)
-        response = requests.get(url, params=params)
+        cache_key = self.cache_key(url, params)
+        headers = self.response_cache.conditional_headers(cache_key, params)
+        with self.phase_timer.request("meetup_get"):
+            response = self.session.get(
+                url, params=params, headers=headers)
+        if self.response_cache.is_not_modified(response):
+            self.modified_flags.append(False)
+            return self.response_cache.cached_json(cache_key)
         MeetupApiError.check_response_status(response)
+        self.modified_flags.append(True)
+        self.response_cache.save_response(cache_key, params, response)
         return response.json()
 
     def retrieve_cancelled_events_json(self, **kwargs):
@@ -32,9 +51,14 @@ class MeetupEventsRetriever:
             no_later_than=self.cancelled_last_time,
             **kwargs)
 
+    def all_not_modified(self):
+        """Return true if Meetup reported that every event list retrieved was
+        not modified since cached; false otherwise."""
+        return bool(self.modified_flags) and not any(self.modified_flags)
+
     def build_url(self):
         """Build a Meetup API URL to download events."""
-        return "https://api.meetup.com/{}/events".format(self.group_url_name)
+        return "{}{}/events".format(MEETUP_API_URL, self.group_url_name)
 
     def request_params(self):
         """Return a dictionary of request parameters."""
@@ -43,5 +67,11 @@ class MeetupEventsRetriever:
             "scroll": "recent_past"
             }
 
+    @staticmethod
+    def cache_key(url, params):
+        """Return a response cache key distinguishing event lists by their URL
+        and status."""
+        return "{} status={}".format(url, params.get("status", ""))
+
 
 # vim: tabstop=8 expandtab shiftwidth=4 softtabstop=4 autoindent
@@ -2,6 +2,11 @@
 
 from oauthlib.oauth2 import BackendApplicationClient, OAuth2Error
 from requests_oauthlib import OAuth2Session
+import logging
+import threading
+
+
+HTTP_UNAUTHORIZED = 401
 
 
 class Oauth2SessionStarterError(Exception):
@@ -13,30 +18,57 @@ class Oauth2SessionStarter(object):
 
     """Creates and authorizes an OAuth2 web session."""
 
-    def __init__(self, client_id, client_secret, token_url, user_agent):
+    logger = logging.getLogger("Oauth2SessionStarter")
+
+    def __init__(
+            self, client_id, client_secret, token_url, user_agent,
+            http_session_factory, token_cache):
         """Initialize with a client ID and secret, the URL for
-        obtaining a token, and an optional user agent."""
+        obtaining a token, an optional user agent, an HTTP session factory
+        providing pooled connections, and a token cache."""
         self.client_id = client_id
         self.client_secret = client_secret
         self.token_url = token_url
         self.user_agent = user_agent
+        self.http_session_factory = http_session_factory
+        self.token_cache = token_cache
+        self._token_lock = threading.Lock()
 
     def start_session(self):
         """Start an authorized OAuth2 web session."""
         session = self.create_session()
         self.set_user_agent(session)
-        self.authorize_session(session)
+        self.authorize_session_from_cache(session)
+        self.reauthorize_when_unauthorized(session)
         return session
 
+    def has_usable_token(self, session):
+        """Return true if a session's token will not expire soon; false
+        otherwise."""
+        return self.token_cache.is_usable(session.token)
+
     def create_session(self):
         """Create an OAuth2 session."""
         client = BackendApplicationClient(client_id=self.client_id)
-        return OAuth2Session(client=client)
+        session = OAuth2Session(client=client)
+        self.http_session_factory.mount_adapter(session, self.token_url)
+        return session
+
+    def authorize_session_from_cache(self, session):
+        """Authorize an OAuth2 session with a cached token if possible, or
+        with a new token otherwise."""
+        token = self.token_cache.load_token()
+        if token:
+            self.logger.debug("Using cached token for %s", self.token_url)
+            session.token = token
+        else:
+            self.authorize_session(session)
 
     def authorize_session(self, session):
-        """Authorize an OAuth2 session."""
+        """Authorize an OAuth2 session with a new token and cache the
+        token."""
         try:
-            session.fetch_token(
+            token = session.fetch_token(
                     token_url=self.token_url,
                     client_id=self.client_id,
                     client_secret=self.client_secret)
@@ -44,10 +76,45 @@ class Oauth2SessionStarter(object):
             message = "Cannot start OAuth2 session. URL=%s problem=%s" \
                     % (self.token_url, err)
             raise Oauth2SessionStarterError(message) from err
+        self.token_cache.save_token(token)
+
+    def reauthorize_when_unauthorized(self, session):
+        """Add a response hook to an OAuth2 session that fetches a new token
+        and resends a request rejected as unauthorized."""
+        def hook(response, **kwargs):
+            if response.status_code == HTTP_UNAUTHORIZED:
+                return self.reauthorize_and_resend(session, response, kwargs)
+            return response
+        session.hooks["response"].append(hook)
+
+    def reauthorize_and_resend(self, session, response, send_kwargs):
+        """Reauthorize a session after an unauthorized response and resend its
+        request once. Return the new response."""
+        rejected_authorization = response.request.headers.get("Authorization")
+        with self._token_lock:
+            if rejected_authorization == self.authorization(session):
+                self.logger.info(
+                    "Token rejected. Fetching new token from %s",
+                    self.token_url)
+                self.authorize_session(session)
+        response.content
+        response.close()
+        request = response.request.copy()
+        request.headers["Authorization"] = self.authorization(session)
+        request.hooks = {"response": []}
+        new_response = session.send(request, **send_kwargs)
+        new_response.history.append(response)
+        return new_response
 
     def set_user_agent(self, session):
         """Set the user agent for a web session."""
         if self.user_agent:
             session.headers.update({'User-Agent': self.user_agent})
 
+    @staticmethod
+    def authorization(session):
+        """Return the bearer authorization header value for a session's
+        current token."""
+        return "Bearer {}".format(session.access_token)
+
 # vim: tabstop=8 expandtab shiftwidth=4 softtabstop=4 autoindent
@@ -0,0 +1,46 @@
+"""Caches OAuth2 access tokens between runs."""
+
+import time
+
+
+class Oauth2TokenCache:
+
+    """Caches OAuth2 access tokens in a JSON file store, keyed by client ID and
+    token URL."""
+
+    def __init__(
+            self, json_file_store, client_id, token_url,
+            expiry_margin_seconds):
+        """Initialize with a JSON file store, a client ID, a token URL, and a
+        number of seconds before expiration to stop using a token."""
+        self.json_file_store = json_file_store
+        self.client_id = client_id
+        self.token_url = token_url
+        self.expiry_margin_seconds = expiry_margin_seconds
+
+    def load_token(self):
+        """Return the cached token if it remains usable. Return None
+        otherwise."""
+        token = self.json_file_store.load().get(self.key())
+        if token and self.is_usable(token):
+            return token
+        else:
+            return None
+
+    def save_token(self, token):
+        """Save a token in the cache."""
+        def modify(tokens):
+            tokens[self.key()] = token
+        self.json_file_store.update(modify)
+
+    def is_usable(self, token):
+        """Return true if a token will not expire soon; false otherwise."""
+        expires_at = token.get("expires_at", 0)
+        return time.time() < expires_at - self.expiry_margin_seconds
+
+    def key(self):
+        """Return the cache key for this client and token URL."""
+        return "{} {}".format(self.client_id, self.token_url)
+
+
+# vim: tabstop=8 expandtab shiftwidth=4 softtabstop=4 autoindent
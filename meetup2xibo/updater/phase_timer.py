@@ -0,0 +1,113 @@
+"""Times the phases of a run and the latency of HTTP requests."""
+
+from collections import OrderedDict
+from contextlib import contextmanager
+from threading import Lock
+import logging
+import math
+import time
+
+
+PERCENTS = (50, 90, 99)
+
+
+class PhaseTimer:
+
+    """Times the phases of a run and the latency of HTTP requests, reporting
+    them in one log line per run and saving them in a JSON file store."""
+
+    logger = logging.getLogger("PhaseTimer")
+
+    def __init__(self, json_file_store, clock=time.monotonic):
+        """Initialize with a JSON file store and a clock function returning
+        seconds."""
+        self.json_file_store = json_file_store
+        self.clock = clock
+        self.phase_seconds = OrderedDict()
+        self.request_seconds = OrderedDict()
+        self.lock = Lock()
+
+    @contextmanager
+    def phase(self, name):
+        """Time a named phase of a run, adding to the time of any earlier
+        phase with the same name."""
+        start = self.clock()
+        try:
+            yield
+        finally:
+            seconds = self.clock() - start
+            with self.lock:
+                self.phase_seconds[name] = \
+                    self.phase_seconds.get(name, 0) + seconds
+
+    @contextmanager
+    def request(self, name):
+        """Time an HTTP request of a named kind, such as "xibo_get"."""
+        start = self.clock()
+        try:
+            yield
+        finally:
+            seconds = self.clock() - start
+            with self.lock:
+                self.request_seconds.setdefault(name, []).append(seconds)
+
+    def report(self):
+        """Log the phase times and request latencies, save them in the JSON
+        file store, and forget them."""
+        with self.lock:
+            phase_seconds = self.phase_seconds
+            request_seconds = self.request_seconds
+            self.phase_seconds = OrderedDict()
+            self.request_seconds = OrderedDict()
+        self.logger.info(
+            "Timings: %s", timings_text(phase_seconds, request_seconds))
+        self.json_file_store.save({
+            "phases": phase_seconds,
+            "requests": request_seconds,
+            })
+
+
+class NullPhaseTimer:
+
+    """Times nothing, substituting for a phase timer."""
+
+    @contextmanager
+    def phase(self, name):
+        """Run a phase untimed."""
+        yield
+
+    @contextmanager
+    def request(self, name):
+        """Run an HTTP request untimed."""
+        yield
+
+    def report(self):
+        """Report nothing."""
+
+
+def timings_text(phase_seconds, request_seconds):
+    """Return text listing phase times as name=seconds and request latencies
+    as name=count/p50/p90/p99/maximum seconds."""
+    phase_texts = [
+        "{}={:.3f}".format(name, seconds)
+        for name, seconds in phase_seconds.items()]
+    request_texts = [
+        latency_text(name, latencies)
+        for name, latencies in request_seconds.items()]
+    return " ".join(phase_texts + request_texts)
+
+
+def latency_text(name, latencies):
+    """Return text listing a kind of request's latencies as
+    name=count/p50/p90/p99/maximum seconds."""
+    sorted_latencies = sorted(latencies)
+    count = len(sorted_latencies)
+    values = [
+        sorted_latencies[max(0, math.ceil(percent * count / 100) - 1)]
+        for percent in PERCENTS]
+    values.append(sorted_latencies[-1])
+    return "{}={}/{}".format(
+        name, count, "/".join("{:.3f}".format(value) for value in values))
+
+
+# vim: tabstop=8 expandtab shiftwidth=4 softtabstop=4 autoindent
@@ -45,6 +45,74 @@ class PhraseMapper:
         self.automaton.make_automaton()
         return self
 
+    def setup_from_cache(self, automaton_cache):
+        """Setup and return the phrase mapper with an automaton from a cache,
+        or setup the phrase mapper and cache its automaton if the cache holds
+        none for these phrases."""
+        automaton = automaton_cache.load(self.phrase_tuples)
+        if automaton is not None:
+            self.automaton = automaton
+            return self
+        self.setup()
+        automaton_cache.save(self.phrase_tuples, self.automaton)
+        return self
+
+
+class TieredPhraseMapper(PhraseMapper):
+
+    """Rewrites a string, mapping phrases from several tiers of phrase tuples
+    to preferred phrases, with one automaton scan for all tiers."""
+
+    def __init__(self, automaton, phrase_tuple_tiers):
+        """Initialize with an Aho-Corasick automaton and a sequence of tiers,
+        each a sequence of tuples containing a phrase and its preferred
+        phrase."""
+        super().__init__(
+            automaton, tuple(tuple(tier) for tier in phrase_tuple_tiers))
+
+    def map_phrases(self, text):
+        """Return a list of phrases preferred to those found in the text from
+        the first tier with any."""
+        for tier_phrases in self.map_phrases_by_tier(text):
+            if tier_phrases:
+                return tier_phrases
+        return []
+
+    def map_phrases_by_tier(self, text):
+        """Return a list of lists, one per tier, of phrases preferred to those
+        found in the text."""
+        normalized_text = normalize_text(text)
+        tier_matches = [[] for tier in self.phrase_tuples]
+        for end, tier_mappings in self.automaton.iter(normalized_text):
+            for tier, phrase_mapping in tier_mappings:
+                match = (end, phrase_mapping)
+                if is_valid_match(match, normalized_text):
+                    tier_matches[tier].append(match_to_sortable_match(match))
+        return [
+            [
+                match.preferred_phrase
+                for match in longest_non_overlapping_matches(sorted(matches))]
+            for matches in tier_matches]
+
+    def setup(self):
+        """Setup and return the phrase mapper. Each normalized phrase maps to
+        a tuple of (tier, phrase mapping) pairs."""
+        tier_mappings_by_phrase = {}
+        for tier, phrase_tuples in enumerate(self.phrase_tuples):
+            for phrase, preferred_phrase in phrase_tuples:
+                normalized_phrase = normalize_text(phrase)
+                tier_mappings = tier_mappings_by_phrase.setdefault(
+                    normalized_phrase, {})
+                tier_mappings[tier] = PhraseMapping(
+                    preferred_phrase,
+                    len(normalized_phrase))
+        for normalized_phrase, tier_mappings in \
+                tier_mappings_by_phrase.items():
+            self.automaton.add_word(
+                normalized_phrase, tuple(sorted(tier_mappings.items())))
+        self.automaton.make_automaton()
+        return self
+
 
 def normalize_text(text):
     """Normalize a text by converting it to lower case and removing
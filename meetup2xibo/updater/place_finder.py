@@ -34,4 +34,27 @@ class PlaceFinder:
         return phrase_mapper.map_phrases(partial_event.venue_name) \
             + phrase_mapper.map_phrases(partial_event.find_us)
 
+
+class TieredPlaceFinder(PlaceFinder):
+
+    """Builds a place list from partial event components with a tiered phrase
+    mapper, scanning each component once for all tiers."""
+
+    def __init__(self, tiered_phrase_mapper):
+        """Initialize with a tiered phrase mapper."""
+        self.tiered_phrase_mapper = tiered_phrase_mapper
+
+    def map_from_phrase_mappers(self, partial_event):
+        """Return the places from the first tier that finds phrases in a
+        partial event."""
+        mapper = self.tiered_phrase_mapper
+        venue_name_tiers = mapper.map_phrases_by_tier(partial_event.venue_name)
+        find_us_tiers = mapper.map_phrases_by_tier(partial_event.find_us)
+        for venue_name_places, find_us_places in \
+                zip(venue_name_tiers, find_us_tiers):
+            places = venue_name_places + find_us_places
+            if places:
+                return places
+        return []
+
 # vim: tabstop=8 expandtab shiftwidth=4 softtabstop=4 autoindent
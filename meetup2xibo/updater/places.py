@@ -1,7 +1,6 @@
 """Places for schedule conflict checking."""
 
 from .meetup_id_comparable import MeetupIdComparable
-from .exceptions import ContainmentLoopError
 from collections import namedtuple, Counter
 from operator import attrgetter
 import logging
@@ -23,6 +22,9 @@ class ContainingPlace:
         self.name = name
         self.contained_places = set()
         self.containing_places = set()
+        self.descendants = frozenset()
+        self.ancestors = frozenset()
+        self.component = None
 
     def __repr__(self):
         """Return the debugging representation of a containing place."""
@@ -40,30 +42,6 @@ class ContainingPlace:
         otherwise."""
         return other_place in self.contained_places
 
-    def start_event_carefully(self, event):
-        """Start an event at this place, checking for containment loops."""
-        try:
-            self.start_event(event)
-        except RecursionError:
-            raise ContainmentLoopError(self.containment_loop_message())
-
-    def start_event_in_contained_places(self, event):
-        """Start an event in places contained within this place."""
-        for place in self.contained_places:
-            place.start_event(event)
-
-    def end_event_carefully(self, event):
-        """End an event at this place, checking for containment loops."""
-        try:
-            self.end_event(event)
-        except RecursionError:
-            raise ContainmentLoopError(self.containment_loop_message())
-
-    def end_event_in_contained_places(self, event):
-        """End an event in places contained within this place."""
-        for place in self.contained_places:
-            place.end_event(event)
-
     def container_has_conflict(self, conflict):
         """Return true if any containing place has the same conflict as the
         given conflict."""
@@ -72,11 +50,6 @@ class ContainingPlace:
                 return True
         return False
 
-    def containment_loop_message(self):
-        """Return a containment loop error message for this place."""
-        return "Loop found among containing places. Check {!r}." \
-            .format(self.name)
-
     def log_place_name(self):
         """Log the name of this place."""
         self.logger.info("Name=%r", self.name)
@@ -95,17 +68,15 @@ class CheckedPlace(ContainingPlace):
         self.events = Counter()
         self.conflict = None
 
-    def start_event(self, event):
-        """Start an event at this place."""
+    def start_own_event(self, event):
+        """Start an event at this place only."""
         self.advance_clock(event.start_time)
         self.count_event(event, 1)
-        self.start_event_in_contained_places(event)
 
-    def end_event(self, event):
-        """End an event at this place."""
+    def end_own_event(self, event):
+        """End an event at this place only."""
         self.advance_clock(event.end_time)
         self.count_event(event, -1)
-        self.end_event_in_contained_places(event)
 
     def advance_clock(self, new_time):
         """Advance the clock to the new time. Note conflicts when clock
@@ -145,13 +116,17 @@ class CheckedPlace(ContainingPlace):
         if self.conflict \
                 and self.conflict.end_time == end_time \
                 and not self.container_has_conflict(self.conflict):
-            reportable_conflict = Conflict(
-                self.conflict.start_time,
-                self.conflict.end_time,
-                [comparable.event for comparable in self.conflict.events])
-            self.logger.info(
-                    "Schedule conflict: place=%r %s",
-                    self.name, reportable_conflict)
+            self.log_conflict(self.conflict)
+
+    def log_conflict(self, conflict):
+        """Log a conflict found at this place."""
+        reportable_conflict = Conflict(
+            conflict.start_time,
+            conflict.end_time,
+            [comparable.event for comparable in conflict.events])
+        self.logger.info(
+                "Schedule conflict: place=%r %s",
+                self.name, reportable_conflict)
 
 
 class UncheckedPlace(ContainingPlace):
@@ -160,13 +135,13 @@ class UncheckedPlace(ContainingPlace):
 
     logger = logging.getLogger("UncheckedPlace")
 
-    def start_event(self, event):
-        """Start an event at this place."""
-        self.start_event_in_contained_places(event)
+    def start_own_event(self, event):
+        """Ignore an event starting at this place only."""
+        pass
 
-    def end_event(self, event):
-        """End an event at this place."""
-        self.end_event_in_contained_places(event)
+    def end_own_event(self, event):
+        """Ignore an event ending at this place only."""
+        pass
 
     def has_conflict(self, conflict):
         """Return true if any of this place's containers have the same conflict
@@ -0,0 +1,35 @@
+"""Executors shared within a scope and shut down when the scope ends."""
+
+from collections import OrderedDict
+import threading
+
+
+class ScopeExecutors:
+
+    """Caches executors by name, so that the objects of one scope share
+    their worker threads, and shuts them all down when the scope ends."""
+
+    def __init__(self):
+        """Initialize with no executors."""
+        self._executors = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, name, fresh_provider):
+        """Invokes fresh_provider function once per name, caches the
+        executor, and returns that same executor every time."""
+        with self._lock:
+            if name not in self._executors:
+                self._executors[name] = fresh_provider()
+            return self._executors[name]
+
+    def shutdown(self):
+        """Shut down all the executors, waiting for their tasks to finish,
+        and forget them."""
+        with self._lock:
+            executors = list(self._executors.values())
+            self._executors.clear()
+        for executor in executors:
+            executor.shutdown()
+
+
+# vim: tabstop=8 expandtab shiftwidth=4 softtabstop=4 autoindent
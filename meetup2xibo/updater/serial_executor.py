@@ -0,0 +1,25 @@
+"""An executor that runs each task immediately in the calling thread."""
+
+from concurrent.futures import Executor, Future
+
+
+class SerialExecutor(Executor):
+
+    """Runs each submitted task immediately in the calling thread, returning
+    an already completed future. Substitutes for a thread pool when
+    concurrency is not wanted."""
+
+    def submit(self, fn, *args, **kwargs):
+        """Run a function with arguments. Return a future holding its result
+        or exception."""
+        future = Future()
+        try:
+            result = fn(*args, **kwargs)
+        except BaseException as err:
+            future.set_exception(err)
+        else:
+            future.set_result(result)
+        return future
+
+
+# vim: tabstop=8 expandtab shiftwidth=4 softtabstop=4 autoindent
@@ -0,0 +1,32 @@
+"""A thread-safe cache sharing resources among application scopes."""
+
+import threading
+
+
+class SharedCache:
+
+    """Caches the results from providers by key, so that application scopes
+    running in different threads can share resources. Each result is
+    provided once, even when several threads ask for it at the same time."""
+
+    def __init__(self):
+        """Initialize the cache to empty."""
+        self._cache = {}
+        self._key_locks = {}
+        self._lock = threading.Lock()
+
+    def get(self, key, fresh_provider, is_usable=None):
+        """Invokes fresh_provider function once per hashable key, caches the
+        result, and returns that same value every time. If given an is_usable
+        function, invokes fresh_provider again whenever is_usable returns
+        false for the cached value."""
+        with self._lock:
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+        with key_lock:
+            if key not in self._cache or \
+                    (is_usable and not is_usable(self._cache[key])):
+                self._cache[key] = fresh_provider()
+            return self._cache[key]
+
+
+# vim: tabstop=8 expandtab shiftwidth=4 softtabstop=4 autoindent
@@ -11,10 +11,13 @@ class SiteCertAssurer(object):
 
     logger = logging.getLogger("SiteCertAssurer")
 
-    def __init__(self, sys_ca_path, site_ca_path, site_url, user_agent):
-        """Initialize with paths to the Python Requests certificate authority
-        file and the site-specific certificate authority file (in PEM format),
-        a site URL, and a user agent for HTTPS requests."""
+    def __init__(
+            self, session, sys_ca_path, site_ca_path, site_url, user_agent):
+        """Initialize with a web session, paths to the Python Requests
+        certificate authority file and the site-specific certificate authority
+        file (in PEM format), a site URL, and a user agent for HTTPS
+        requests."""
+        self.session = session
         self.sys_ca_path = sys_ca_path
         self.site_ca_path = site_ca_path
         self.site_url = site_url
@@ -31,7 +34,7 @@ class SiteCertAssurer(object):
         """Check that we have a valid SSL certificate for the site URL."""
         try:
             headers = {'User-Agent': self.user_agent}
-            requests.get(self.site_url, headers=headers)
+            self.session.get(self.site_url, headers=headers)
             return True
         except requests.exceptions.SSLError:
             return False
@@ -63,7 +66,8 @@ def assure_site_cert(site_ca_path, site_url):
     if site_ca_path and site_url:
         sys_ca_path = certifi.where()
         assurer = SiteCertAssurer(
-                sys_ca_path, site_ca_path, site_url, "test/456")
+                requests.Session(), sys_ca_path, site_ca_path, site_url,
+                "test/456")
         assurer.assure_site_cert()
 
 
@@ -2,6 +2,7 @@
 
 
 from .http_response_error import XiboApiError
+from .phase_timer import NullPhaseTimer
 from itertools import chain
 import logging
 
@@ -12,16 +13,25 @@ class XiboApi:
 
     logger = logging.getLogger("Xibo_API_Connection")
 
-    def __init__(self, session, xibo_api_url_builder, page_length):
+    def __init__(
+            self, session, xibo_api_url_builder, page_length,
+            page_concurrency, page_executor, phase_timer=None):
         """Initialize with an OAuth2 session to the Xibo server,
-        a Xibo API URL builder, and a page length for paged retrievals."""
+        a Xibo API URL builder, a page length for paged retrievals, the
+        number of pages to request concurrently, an executor for
+        concurrent page requests, and an optional phase timer for request
+        latency."""
         self.session = session
         self.xibo_api_url_builder = xibo_api_url_builder
         self.page_length = page_length
+        self.page_concurrency = page_concurrency
+        self.page_executor = page_executor
+        self.phase_timer = phase_timer if phase_timer else NullPhaseTimer()
 
     def get_response(self, url, **payload):
         """Request a URL and return the response."""
-        response = self.session.get(url, params=payload)
+        with self.phase_timer.request("xibo_get"):
+            response = self.session.get(url, params=payload)
         XiboApiError.check_response_status(response)
         return response
 
@@ -42,26 +52,98 @@ class XiboApi:
                     url, start=start, length=self.page_length, **payload)
             yield response
 
+    def get_concurrent_json_pages(self, url, **payload):
+        """Return a generator of JSON pages requested from the URL, requesting
+        pages after the first concurrently."""
+        response = self.get_page_response(url, 0, payload)
+        page, total = self.page_and_total(response)
+        yield page
+        if len(page) < self.page_length:
+            return
+        if total is None:
+            yield from self.probe_json_pages(url, payload)
+        else:
+            yield from self.prefetch_json_pages(url, payload, total)
+
+    def prefetch_json_pages(self, url, payload, total):
+        """Return a generator of JSON pages after the first, requesting all
+        pages needed for a known total number of records concurrently."""
+        futures = [
+            self.page_executor.submit(self.get_page, url, start, payload)
+            for start in range(self.page_length, total, self.page_length)]
+        for future in futures:
+            yield future.result()
+
+    def probe_json_pages(self, url, payload):
+        """Return a generator of JSON pages after the first, requesting
+        batches of pages concurrently until a page is not full."""
+        start = self.page_length
+        while True:
+            batch_starts = range(
+                start,
+                start + self.page_concurrency * self.page_length,
+                self.page_length)
+            futures = [
+                self.page_executor.submit(self.get_page, url, s, payload)
+                for s in batch_starts]
+            for future in futures:
+                page = future.result()
+                yield page
+                if len(page) < self.page_length:
+                    return
+            start = batch_starts[-1] + self.page_length
+
+    def get_page(self, url, start, payload):
+        """Request the JSON page starting at a record number."""
+        response = self.get_page_response(url, start, payload)
+        page, total = self.page_and_total(response)
+        return page
+
+    def get_page_response(self, url, start, payload):
+        """Request the page starting at a record number and return the
+        response."""
+        return self.get_response(
+            url, start=start, length=self.page_length, **payload)
+
+    @staticmethod
+    def page_and_total(response):
+        """Return a response's JSON page and the total number of records
+        available, if reported in a "recordsTotal" field or an "X-Total-Count"
+        header. Return None for an unreported total."""
+        response_json = response.json()
+        if isinstance(response_json, dict) and "recordsTotal" in response_json:
+            return response_json["data"], int(response_json["recordsTotal"])
+        total = response.headers.get("X-Total-Count")
+        if total is not None:
+            return response_json, int(total)
+        return response_json, None
+
     def get_paged_json(self, url, **payload):
         """Request a URL and return an iterable of all paged JSON results."""
-        json_pages = self.get_json_pages(url, **payload)
+        if self.page_concurrency > 1:
+            json_pages = self.get_concurrent_json_pages(url, **payload)
+        else:
+            json_pages = self.get_json_pages(url, **payload)
         return chain.from_iterable(json_pages)
 
     def delete(self, url, **payload):
         """Request deletion at a URL and return the response."""
-        response = self.session.delete(url, params=payload)
+        with self.phase_timer.request("xibo_delete"):
+            response = self.session.delete(url, params=payload)
         XiboApiError.check_response_status(response)
         return response
 
     def post(self, url, **payload):
         """Request posting at a URL and return the response."""
-        response = self.session.post(url, data=payload)
+        with self.phase_timer.request("xibo_post"):
+            response = self.session.post(url, data=payload)
         XiboApiError.check_response_status(response)
         return response
 
     def put(self, url, **payload):
         """Request puting at a URL and return the response."""
-        response = self.session.put(url, data=payload)
+        with self.phase_timer.request("xibo_put"):
+            response = self.session.put(url, data=payload)
         XiboApiError.check_response_status(response)
         return response
 
@@ -93,6 +175,14 @@ class XiboApi:
         url = self.xibo_api_url_builder.dataset_data_url(dataset_id)
         return self.get_paged_json(url)
 
+    def count_dataset_data_by_id(self, dataset_id):
+        """Return the number of dataset rows, searching by its id, or None if
+        Xibo does not report a total."""
+        url = self.xibo_api_url_builder.dataset_data_url(dataset_id)
+        response = self.get_response(url, start=0, length=1)
+        page, total = self.page_and_total(response)
+        return total
+
     def delete_dataset_data_by_id(self, dataset_id, row_id):
         """Delete the dataset row."""
         url = self.xibo_api_url_builder.dataset_data_row_url(
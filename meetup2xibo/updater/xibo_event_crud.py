@@ -1,23 +1,33 @@
 """Create, read, update, and delete events in Xibo."""
 
+from collections import deque
+from concurrent.futures import wait
 import logging
 
 
 class XiboEventCrud:
 
-    """Create, read, update, and delete events in Xibo."""
+    """Create, read, update, and delete events in Xibo.
+
+    Inserts, updates, and deletes run on an executor, which may run several
+    Xibo API requests concurrently. Log messages are deferred until each
+    request completes, then emitted in the order the requests were made."""
 
     logger = logging.getLogger("XiboEventCrud")
 
     def __init__(
             self, xibo_api, dataset_id, column_name_manager,
-            column_id_manager):
-        """Initialize with a Xibo API, a dataset ID, and a column name
-        manager."""
+            column_id_manager, executor):
+        """Initialize with a Xibo API, a dataset ID, a column name manager, a
+        column ID manager, and an executor for Xibo API requests."""
         self.xibo_api = xibo_api
         self.dataset_id = dataset_id
         self.column_name_manager = column_name_manager
         self.column_id_manager = column_id_manager
+        self.executor = executor
+        self.pending_requests = deque()
+        self.row_count_change = 0
+        self.changes_requested = False
 
     def get_xibo_events(self):
         """Get a list of events from Xibo."""
@@ -27,24 +37,80 @@ class XiboEventCrud:
             for event_json in xibo_json
             )
 
+    def count_xibo_events(self):
+        """Return the number of events in Xibo, or None if unknown."""
+        return self.xibo_api.count_dataset_data_by_id(self.dataset_id)
+
     def delete_xibo_event(self, xibo_event, action="Deleted"):
         """Delete a Xibo event and log the action."""
-        self.xibo_api.delete_dataset_data_by_id(
+        future = self.executor.submit(
+            self.xibo_api.delete_dataset_data_by_id,
             self.dataset_id, xibo_event.xibo_id)
-        self.logger.info("%s %s", action, xibo_event)
+        self.row_count_change -= 1
+        self.log_when_done(future, ("%s %s", action, xibo_event))
 
     def insert_meetup_event(self, meetup_event):
         """Insert a Meetup event into the database."""
         columns = self.column_id_manager.event_to_columns(meetup_event)
-        self.xibo_api.insert_dataset_data(self.dataset_id, columns)
-        self.logger.info("Inserted %s", meetup_event)
+        future = self.executor.submit(
+            self.xibo_api.insert_dataset_data, self.dataset_id, columns)
+        self.row_count_change += 1
+        self.log_when_done(future, ("Inserted %s", meetup_event))
 
     def update_xibo_event(self, xibo_event, meetup_event):
         """Update a Xibo event with a Meetup event."""
         row_id = xibo_event.xibo_id
         columns = self.column_id_manager.event_to_columns(meetup_event)
-        self.xibo_api.update_dataset_data(self.dataset_id, row_id, columns)
-        self.logger.info("Updated from %s", xibo_event)
-        self.logger.info("Updated to %s", meetup_event)
+        future = self.executor.submit(
+            self.xibo_api.update_dataset_data,
+            self.dataset_id, row_id, columns)
+        self.log_when_done(
+            future,
+            ("Updated from %s", xibo_event),
+            ("Updated to %s", meetup_event))
+
+    def log_when_done(self, future, *log_messages):
+        """Queue log messages (tuples of format and arguments) to report when
+        a Xibo API request's future completes. Log any completed requests."""
+        self.changes_requested = True
+        self.pending_requests.append((future, log_messages))
+        self.log_completed_requests()
+
+    def log_completed_requests(self):
+        """Log completed requests in the order they were made, stopping at the
+        first request still in progress. Raise the exception of the first
+        failed request, leaving it for finish()."""
+        while self.pending_requests and self.pending_requests[0][0].done():
+            future, log_messages = self.pending_requests[0]
+            future.result()
+            self.pending_requests.popleft()
+            self.log_messages(log_messages)
+
+    def log_messages(self, log_messages):
+        """Log the messages of a completed request."""
+        for log_message in log_messages:
+            self.logger.info(*log_message)
+
+    def finish(self):
+        """Wait for all pending requests to complete, even after a failure,
+        logging each successful request in the order the requests were made.
+        Shut down the executor, then raise the exception of the first failed
+        request, if any."""
+        first_error = None
+        try:
+            wait([future for future, log_messages in self.pending_requests])
+            while self.pending_requests:
+                future, log_messages = self.pending_requests.popleft()
+                error = future.exception()
+                if error is None:
+                    self.log_messages(log_messages)
+                elif first_error is None:
+                    first_error = error
+                else:
+                    self.logger.error("Another request failed: %s", error)
+        finally:
+            self.executor.shutdown()
+        if first_error is not None:
+            raise first_error
 
 # vim: tabstop=8 expandtab shiftwidth=4 softtabstop=4 autoindent
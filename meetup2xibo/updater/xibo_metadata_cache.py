@@ -0,0 +1,65 @@
+"""Caches Xibo dataset metadata between runs."""
+
+from .xibo_event import XiboEvent
+from collections import namedtuple
+import time
+
+
+XiboDatasetMetadata = namedtuple(
+        "XiboDatasetMetadata",
+        "dataset_id column_ids")
+
+
+class XiboMetadataCache:
+
+    """Caches a Xibo dataset's ID and column IDs in a JSON file store, keyed by
+    Xibo host and dataset code."""
+
+    def __init__(
+            self, json_file_store, xibo_base_url, dataset_code, ttl_seconds):
+        """Initialize with a JSON file store, the Xibo base URL, a dataset
+        code, and the number of seconds to trust cached metadata."""
+        self.json_file_store = json_file_store
+        self.xibo_base_url = xibo_base_url
+        self.dataset_code = dataset_code
+        self.ttl_seconds = ttl_seconds
+
+    def load_metadata(self):
+        """Return cached dataset metadata if it remains fresh. Return None
+        otherwise."""
+        entry = self.json_file_store.load().get(self.key())
+        if entry and time.time() < entry["saved_at"] + self.ttl_seconds:
+            return XiboDatasetMetadata(
+                entry["dataset_id"],
+                XiboEvent(**entry["column_ids"]))
+        else:
+            return None
+
+    def save_metadata(self, dataset_id, column_ids):
+        """Save a dataset ID and column IDs (in a XiboEvent tuple) in the
+        cache."""
+        entry = {
+            "dataset_id": dataset_id,
+            "column_ids": column_ids._asdict(),
+            "saved_at": time.time(),
+            }
+
+        def modify(entries):
+            entries[self.key()] = entry
+        self.json_file_store.update(modify)
+
+    def forget_metadata(self):
+        """Remove this dataset's metadata from the cache."""
+        if self.key() not in self.json_file_store.load():
+            return
+
+        def modify(entries):
+            entries.pop(self.key(), None)
+        self.json_file_store.update(modify)
+
+    def key(self):
+        """Return the cache key for this Xibo host and dataset code."""
+        return "{} {}".format(self.xibo_base_url, self.dataset_code)
+
+
+# vim: tabstop=8 expandtab shiftwidth=4 softtabstop=4 autoindent
@@ -0,0 +1,62 @@
+"""Caches the state of the last Xibo event synchronization between runs."""
+
+from collections import namedtuple
+import hashlib
+import time
+
+
+XiboSyncState = namedtuple(
+        "XiboSyncState",
+        "events_hash row_count")
+
+
+def hash_events(*event_lists):
+    """Return a hex digest identifying the content of lists of events,
+    regardless of their order."""
+    content = repr([sorted(events) for events in event_lists])
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+
+class XiboSyncStateCache:
+
+    """Caches a hash of the Meetup events last synchronized to a Xibo dataset
+    and the dataset's row count afterward in a JSON file store, keyed by Xibo
+    host and dataset code."""
+
+    def __init__(
+            self, json_file_store, xibo_base_url, dataset_code, ttl_seconds):
+        """Initialize with a JSON file store, the Xibo base URL, a dataset
+        code, and the number of seconds to trust a cached state."""
+        self.json_file_store = json_file_store
+        self.xibo_base_url = xibo_base_url
+        self.dataset_code = dataset_code
+        self.ttl_seconds = ttl_seconds
+
+    def load_state(self):
+        """Return the cached synchronization state if it remains fresh.
+        Return None otherwise."""
+        entry = self.json_file_store.load().get(self.key())
+        if entry and time.time() < entry["saved_at"] + self.ttl_seconds:
+            return XiboSyncState(entry["events_hash"], entry["row_count"])
+        else:
+            return None
+
+    def save_state(self, events_hash, row_count):
+        """Save a hash of synchronized events and the resulting Xibo row count
+        in the cache."""
+        entry = {
+            "events_hash": events_hash,
+            "row_count": row_count,
+            "saved_at": time.time(),
+            }
+
+        def modify(entries):
+            entries[self.key()] = entry
+        self.json_file_store.update(modify)
+
+    def key(self):
+        """Return the cache key for this Xibo host and dataset code."""
+        return "{} {}".format(self.xibo_base_url, self.dataset_code)
+
+
+# vim: tabstop=8 expandtab shiftwidth=4 softtabstop=4 autoindent
@@ -14,6 +14,10 @@ DATE_TIME_TEMPLATE = "2019-03-04 06:{minutes:02d}:12"
 START_TEMPLATE = \
     "2019-03-04 06:{minutes:02d}:53,454 - INFO - meetup2xibo - Start meetup2xibo 2.0.1"
 
+NO_CHANGES_TEMPLATE = \
+    "2019-03-04 06:{minutes:02d}:58,102 - INFO - XiboEventCrudProcessor - " \
+    "No changes: Xibo events match Meetup events"
+
 END_TEMPLATE = \
     "2019-03-04 06:{minutes:02d}:14,566 - INFO - meetup2xibo - End meetup2xibo 2.0.1"
 
@@ -182,6 +186,12 @@ SCHEDULE_CONFLICT_TEMPLATE = \
     "start_time='2019-09-03 19:00:00', end_time='2019-09-03 21:00:00', " \
     "places=['Conference Room 2'])])" 
 
+TIMINGS_TEMPLATE = \
+    "2019-03-04 06:{minutes:02d}:14,560 - INFO - PhaseTimer - " \
+    "Timings: retrieve=2.514 update_xibo=1.250 run=3.998 " \
+    "meetup_get=3/0.801/0.912/0.912/0.912 " \
+    "xibo_get=12/0.043/0.098/0.120/0.120"
+
 
 class SampleLogLines:
 
@@ -205,6 +215,10 @@ class SampleLogLines:
         """Return a start line."""
         return self.make_line(START_TEMPLATE)
 
+    def no_changes_line(self):
+        """Return a no changes line."""
+        return self.make_line(NO_CHANGES_TEMPLATE)
+
     def end_line(self):
         """Return an end line."""
         return self.make_line(END_TEMPLATE)
@@ -261,6 +275,10 @@ class SampleLogLines:
         """Return a conflict line."""
         return self.make_line(SCHEDULE_CONFLICT_TEMPLATE)
 
+    def timings_line(self):
+        """Return a run timings line."""
+        return self.make_line(TIMINGS_TEMPLATE)
+
     @property
     def insert_fields(self):
         """Return fields that should be extracted from an insert log line."""
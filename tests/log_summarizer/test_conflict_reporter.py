@@ -124,5 +124,31 @@ def test_clear(conflict_reporter):
     assert conflict_reporter.sorted_conflict_places() == []
     assert conflict_reporter.sorted_checked_places() == []
 
+def test_merge(conflict_reporter):
+    """Test adding conflicts and places from another conflict reporter."""
+    conflict = make_conflict()
+    other_conflict = make_conflict(start_time=SAMPLE_OTHER_START_TIME)
+    conflict_reporter.add_checked_place("Woodshop")
+    conflict_reporter.add_conflict("Woodshop", conflict)
+    other_reporter = ConflictReporter(SAMPLE_START_DATE)
+    other_reporter.add_conflict("Woodshop", other_conflict)
+    conflict_reporter.merge(other_reporter)
+    assert conflict_reporter.sorted_checked_places() == ["Woodshop"]
+    assert conflict_reporter.sorted_conflict_places() == \
+        [("Woodshop", [conflict, other_conflict])]
+
+def test_merge_cleared(conflict_reporter):
+    """Test replacing conflicts and places with those from another conflict
+    reporter that started a new analysis."""
+    conflict = make_conflict()
+    conflict_reporter.add_checked_place("Woodshop")
+    conflict_reporter.add_conflict("Woodshop", conflict)
+    other_reporter = ConflictReporter(SAMPLE_START_DATE)
+    other_reporter.clear()
+    other_reporter.add_checked_place("Metal Shop")
+    conflict_reporter.merge(other_reporter)
+    assert conflict_reporter.sorted_checked_places() == ["Metal Shop"]
+    assert not conflict_reporter.has_conflicts()
+
 
 # vim: tabstop=8 expandtab shiftwidth=4 softtabstop=4 autoindent
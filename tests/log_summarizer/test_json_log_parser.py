@@ -0,0 +1,175 @@
+"""Test parsing JSON lines logs."""
+
+from .test_line_log_parser import make_summary, summary_state
+from meetup2xibo.log_summarizer.json_log_parser import JsonLogParser
+from meetup2xibo.log_summarizer.line_log_parser import LineLogParser
+from meetup2xibo.log_summarizer.log_parser import make_log_parser_class
+from meetup2xibo.updater.event_converter import Event, PartialEvent
+from meetup2xibo.updater.json_lines_formatter import JsonLinesFormatter
+from meetup2xibo.updater.logging_setup_manager import FORMATTER
+from meetup2xibo.updater.places import Conflict
+from meetup2xibo.updater.special_location import SpecialLocation
+from meetup2xibo.updater.xibo_event import XiboEvent
+import logging
+import pytest
+
+
+INSERTED_EVENT = Event(
+    meetup_id = "tmnbrqyzhbhb", name = "Maker Faire Organizing Team",
+    location = "Classroom A", start_time = "2019-05-05 18:00:00",
+    end_time = "2019-05-05 20:00:00", places = ["Classroom A"])
+
+XIBO_EVENT = XiboEvent(
+    meetup_id = "259565142", name = "EMPOWER2MAKE", location = "Nova Labs",
+    start_time = "2019-04-14 08:00:00", end_time = "2019-04-14 10:00:00",
+    xibo_id = "423")
+
+UPDATED_EVENT = Event(
+    meetup_id = "259565142", name = "EMPOWER2MAKE", location = "Orange Bay",
+    start_time = "2019-04-14 08:00:00", end_time = "2019-04-14 10:00:00",
+    places = ["Orange Bay"])
+
+DELETED_EVENT = XiboEvent(
+    meetup_id = "258645498", name = "DIYbio: Microfluidics",
+    location = "Classroom A", start_time = "2019-03-03 14:00:00",
+    end_time = "2019-03-03 16:00:00", xibo_id = "36")
+
+PARTIAL_EVENT = PartialEvent(
+    meetup_id = "259405866", name = "Customized Wooden Beer Caddy",
+    start_time = "2019-03-17 10:00:00", end_time = "2019-03-17 12:00:00",
+    venue_name = "Nova Labs (Woodshop)", find_us = "Back of the building")
+
+SPECIAL_LOCATION = SpecialLocation(
+    meetup_id = "258645498", location = "Orange Bay", override = False,
+    comment = "Just testing", places = ["Electronics"])
+
+CONFLICT = Conflict(
+    start_time = "2019-09-03 19:00:00", end_time = "2019-09-03 21:00:00",
+    events = [
+        Event(
+            meetup_id = "vzgnvqyzmbfb", name = "Computational Thinking",
+            location = "Conference Room 2",
+            start_time = "2019-09-03 19:00:00",
+            end_time = "2019-09-03 21:00:00",
+            places = ["Conference Room 2"]),
+        Event(
+            meetup_id = "264138349", name = "Rust Meetup",
+            location = "Conference Room 2",
+            start_time = "2019-09-03 19:00:00",
+            end_time = "2019-09-03 21:30:00",
+            places = ["Conference Room 2"]),
+        ])
+
+SAMPLE_MESSAGES = [
+    ("meetup2xibo", "%s %s %s", ("Start", "meetup2xibo", "3.4.0")),
+    ("XiboEventCrudProcessor",
+        "No changes: Xibo events match Meetup events", ()),
+    ("XiboEventCrud", "Inserted %s", (INSERTED_EVENT,)),
+    ("XiboEventCrud", "Updated from %s", (XIBO_EVENT,)),
+    ("XiboEventCrud", "Updated to %s", (UPDATED_EVENT,)),
+    ("XiboEventCrud", "%s %s", ("Deleted", DELETED_EVENT)),
+    ("XiboEventCrud", "%s %s", ("Retired", DELETED_EVENT)),
+    ("XiboEventCrud", "%s %s", ("Suppressed", XIBO_EVENT)),
+    ("LocationChooser", "Unknown location for %s", (PARTIAL_EVENT,)),
+    ("SpecialEventsMonitor", "No longer needed %s", (SPECIAL_LOCATION,)),
+    ("EventConverter", "Location='%s' MeetupEvent=%s",
+        ("Woodshop", PARTIAL_EVENT)),
+    ("ConflictAnalyzer", "Start conflict analysis", ()),
+    ("CheckedPlace", "Name=%r", ("Conference Room 2",)),
+    ("CheckedPlace", "Schedule conflict: place=%r %s",
+        ("Conference Room 2", CONFLICT)),
+    ("EventSuppressor", "Suppressed meetup_id=%r", ("266191234",)),
+    ("EventSuppressor",
+        "Suppressed Meetup ID was not checked. meetup_id=%r",
+        ("266192589",)),
+    ("PhaseTimer", "Timings: %s", ("retrieve=2.514 xibo_get=12/0.043/0.098/0.120/0.120",)),
+    ("meetup2xibo", "%s %s %s", ("End", "meetup2xibo", "3.4.0")),
+    ]
+
+
+@pytest.fixture(scope="module")
+def log_parser_class():
+    """Return a log parser class, which creates a parser when called
+    with string."""
+    return make_log_parser_class()
+
+
+def make_records(messages):
+    """Return log records for a list of (logger name, format, arguments)
+    tuples."""
+    records = []
+    for index, (name, msg, args) in enumerate(messages):
+        record = logging.LogRecord(
+            name, logging.INFO, __file__, 1, msg, args, None)
+        record.created = 1551697200 + 60 * index
+        records.append(record)
+    return records
+
+
+def format_lines(formatter, records):
+    """Return log records formatted as a list of log lines."""
+    return [formatter.format(record) + "\n" for record in records]
+
+
+def parse_lines(line_parser_class, log_parser_class, lines):
+    """Return the state of a summary of log lines."""
+    summary = make_summary()
+    line_parser_class(lines, log_parser_class).log_lines(summary)
+    return summary_state(summary)
+
+
+def test_json_lines_match_text_lines(log_parser_class):
+    """Test that a JSON lines log summarizes like the same text log."""
+    records = make_records(SAMPLE_MESSAGES)
+    text_lines = format_lines(FORMATTER, records)
+    json_lines = format_lines(JsonLinesFormatter(), records)
+    assert parse_lines(JsonLogParser, log_parser_class, json_lines) == \
+        parse_lines(LineLogParser, log_parser_class, text_lines)
+
+
+def test_json_lines_summarized(log_parser_class):
+    """Test that a JSON lines log is summarized without the grammar."""
+    records = make_records(SAMPLE_MESSAGES)
+    json_lines = format_lines(JsonLinesFormatter(), records)
+    summary = make_summary()
+    JsonLogParser(json_lines, None).log_lines(summary)
+    assert summary_state(summary) != summary_state(make_summary())
+
+
+def test_unreadable_lines_ignored():
+    """Test that lines without JSON log records are ignored."""
+    lines = ["not JSON\n", "[1, 2]\n", '{"time": "2019-03-04"}\n']
+    summary = make_summary()
+    JsonLogParser(lines, None).log_lines(summary)
+    assert summary_state(summary) == summary_state(make_summary())
+
+
+def test_mismatched_args_ignored():
+    """Test that a record lacking the expected arguments is ignored."""
+    records = make_records([
+        ("XiboEventCrud", "Inserted %s", ("not an event",)),
+        ])
+    json_lines = format_lines(JsonLinesFormatter(), records)
+    summary = make_summary()
+    JsonLogParser(json_lines, None).log_lines(summary)
+    assert summary_state(summary) == summary_state(make_summary())
+
+
+def test_is_start_line():
+    """Test recognizing a JSON program start line."""
+    start_line, end_line = format_lines(
+        JsonLinesFormatter(),
+        make_records([SAMPLE_MESSAGES[0], SAMPLE_MESSAGES[-1]]))
+    assert JsonLogParser.is_start_line(start_line)
+    assert not JsonLogParser.is_start_line(end_line)
+
+
+def test_starts_line_pair():
+    """Test recognizing a JSON "Updated from" line."""
+    records = make_records(SAMPLE_MESSAGES)
+    json_lines = format_lines(JsonLinesFormatter(), records)
+    assert JsonLogParser.starts_line_pair(json_lines[3])
+    assert not JsonLogParser.starts_line_pair(json_lines[4])
+
+
+# vim: tabstop=8 expandtab shiftwidth=4 softtabstop=4 autoindent
@@ -0,0 +1,182 @@
+"""Test parsing logs line by line."""
+
+from meetup2xibo.log_summarizer.line_log_parser import LineLogParser, \
+    make_line_log_parser
+from meetup2xibo.log_summarizer.log_parser import make_log_parser_class, \
+    Summary
+from meetup2xibo.log_summarizer.start_counter import StartCounter
+from meetup2xibo.log_summarizer.conflict_reporter import ConflictReporter
+from meetup2xibo.log_summarizer.crud_lister import CrudLister
+from meetup2xibo.log_summarizer.location_mapper import LocationMapper
+from meetup2xibo.log_summarizer.suppressed_event_tracker import \
+    SuppressedEventTracker
+from meetup2xibo.log_summarizer.timing_tracker import TimingTracker
+from parsley import ParseError
+import io
+import pytest
+
+
+OTHER_LINE = "2019-03-04 06:59:12,345 - INFO - XiboApi - Status 200\n"
+NOT_A_LOG_LINE = "Traceback (most recent call last):\n"
+BAD_EVENT_LINE = "2019-03-04 06:59:12,345 - INFO - XiboEventCrud - " \
+    "Inserted Event(meetup_id=123\n"
+
+
+@pytest.fixture(scope="module")
+def log_parser_class():
+    """Return a log parser class, which creates a parser when called
+    with string."""
+    return make_log_parser_class()
+
+
+def make_summary():
+    """Return an empty summary."""
+    return Summary(
+        StartCounter(),
+        CrudLister(),
+        ConflictReporter("2019-11-04"),
+        LocationMapper(),
+        SuppressedEventTracker(),
+        TimingTracker())
+
+
+def summary_state(value):
+    """Return a comparable representation of a summary or its contents."""
+    if isinstance(value, (list, tuple)):
+        return [summary_state(item) for item in value]
+    if isinstance(value, dict):
+        return sorted(
+            (repr(key), summary_state(item)) for key, item in value.items())
+    if isinstance(value, (set, frozenset)):
+        return sorted(value)
+    if hasattr(value, "__dict__"):
+        return (type(value).__name__, summary_state(vars(value)))
+    return value
+
+
+def sample_lines(sample_log_lines):
+    """Return a list of all kinds of sample log lines."""
+    return [
+        sample_log_lines.start_line(),
+        sample_log_lines.no_changes_line(),
+        sample_log_lines.insert_line(),
+        sample_log_lines.update_line(),
+        sample_log_lines.delete_line(),
+        sample_log_lines.retire_line(),
+        sample_log_lines.suppress_xibo_line(),
+        sample_log_lines.meetup_id_suppressed_line(),
+        sample_log_lines.suppressed_not_checked_line(),
+        sample_log_lines.unknown_location_line(),
+        sample_log_lines.special_location_line(),
+        sample_log_lines.event_location_line(),
+        sample_log_lines.start_conflict_analysis_line(),
+        sample_log_lines.checked_place_line(),
+        sample_log_lines.schedule_conflict_line(),
+        sample_log_lines.timings_line(),
+        sample_log_lines.end_line(),
+        ]
+
+
+def parse_both_ways(log_parser_class, log_text):
+    """Parse log text line by line and with the log grammar. Return the
+    states of both summaries."""
+    line_summary = make_summary()
+    input_stream = io.StringIO(log_text)
+    make_line_log_parser(log_parser_class)(input_stream).log_lines(
+        line_summary)
+    grammar_summary = make_summary()
+    log_parser_class(log_text).log_lines(grammar_summary)
+    return summary_state(line_summary), summary_state(grammar_summary)
+
+
+def test_sample_lines_match_grammar(log_parser_class, sample_log_lines):
+    """Test that all kinds of sample lines summarize like the grammar."""
+    log_text = "\n".join(sample_lines(sample_log_lines)) + "\n"
+    line_state, grammar_state = parse_both_ways(log_parser_class, log_text)
+    assert line_state == grammar_state
+
+
+def test_sample_lines_summarized(log_parser_class, sample_log_lines):
+    """Test that sample lines add to the summary."""
+    log_text = "\n".join(sample_lines(sample_log_lines)) + "\n"
+    summary = make_summary()
+    input_stream = io.StringIO(log_text)
+    make_line_log_parser(log_parser_class)(input_stream).log_lines(summary)
+    assert summary.counter.counts() == [("meetup2xibo 2.0.1", 1)]
+    assert summary.counter.no_changes_count == 1
+    assert len(summary.crud_lister.event_logs) == 6
+    assert summary.location_mapper.mapping_list()
+    assert summary.timing_tracker.has_timings()
+
+
+@pytest.mark.parametrize("extra_line", [
+    OTHER_LINE, NOT_A_LOG_LINE, BAD_EVENT_LINE, "\n"])
+def test_ignored_lines_match_grammar(
+        log_parser_class, sample_log_lines, extra_line):
+    """Test that lines between sample lines summarize like the grammar."""
+    log_text = extra_line.join(
+        line + "\n" for line in sample_lines(sample_log_lines))
+    line_state, grammar_state = parse_both_ways(log_parser_class, log_text)
+    assert line_state == grammar_state
+
+
+def test_update_from_line_alone(log_parser_class, sample_log_lines):
+    """Test ignoring an update from line without an update to line, like the
+    grammar."""
+    update_from_line = sample_log_lines.update_line().split("\n")[0]
+    log_text = "\n".join(
+        [update_from_line, sample_log_lines.insert_line(), update_from_line]
+        ) + "\n"
+    line_state, grammar_state = parse_both_ways(log_parser_class, log_text)
+    assert line_state == grammar_state
+
+
+def test_unterminated_line_raises(log_parser_class, sample_log_lines):
+    """Test that an unterminated last line raises a parse error, like the
+    grammar."""
+    log_text = sample_log_lines.start_line() + "\n" \
+        + sample_log_lines.insert_line()
+    parser = LineLogParser(log_text.splitlines(True), log_parser_class)
+    with pytest.raises(ParseError):
+        parser.log_lines(make_summary())
+
+
+def test_lines_read_as_needed(log_parser_class, sample_log_lines, mocker):
+    """Test reading only one line ahead of the line being parsed."""
+    lines_read = []
+
+    def read_lines():
+        for line in [sample_log_lines.start_line() + "\n", OTHER_LINE,
+                OTHER_LINE, sample_log_lines.start_line() + "\n"]:
+            lines_read.append(line)
+            yield line
+
+    summary = make_summary()
+    counts_seen = []
+    summary.counter.count = mocker.Mock(
+        side_effect = lambda program, timestamp:
+            counts_seen.append(len(lines_read)))
+    LineLogParser(read_lines(), log_parser_class).log_lines(summary)
+    assert counts_seen == [2, 4]
+
+
+def test_uninteresting_logger_not_parsed(mocker):
+    """Test skipping lines from uninteresting loggers without the grammar."""
+    log_parser_class = mocker.Mock()
+    parser = LineLogParser([OTHER_LINE, NOT_A_LOG_LINE], log_parser_class)
+    parser.log_lines(make_summary())
+    log_parser_class.assert_not_called()
+
+
+def test_split_line():
+    """Test splitting a log line into timestamp, logger, and message."""
+    expected = ("2019-03-04 06:59", "XiboApi", "Status 200")
+    assert LineLogParser.split_line(OTHER_LINE) == expected
+
+
+def test_split_line_not_a_log_line():
+    """Test rejecting a line that does not start like a log line."""
+    assert LineLogParser.split_line(NOT_A_LOG_LINE) is None
+
+
+# vim: tabstop=8 expandtab shiftwidth=4 softtabstop=4 autoindent
@@ -0,0 +1,215 @@
+"""Test summarizing a growing log file incrementally."""
+
+from meetup2xibo.log_summarizer.log_checkpoint import CheckpointedLogFile, \
+    NullCheckpoint
+from meetup2xibo.log_summarizer.line_log_parser import make_line_log_parser
+from meetup2xibo.log_summarizer.log_parser import make_log_parser_class, \
+    Summary
+from meetup2xibo.log_summarizer.start_counter import StartCounter
+from meetup2xibo.log_summarizer.conflict_reporter import ConflictReporter
+from meetup2xibo.log_summarizer.crud_lister import CrudLister
+from meetup2xibo.log_summarizer.location_mapper import LocationMapper
+from meetup2xibo.log_summarizer.suppressed_event_tracker import \
+    SuppressedEventTracker
+from meetup2xibo.log_summarizer.timing_tracker import TimingTracker
+import os
+import pytest
+
+
+@pytest.fixture(scope="module")
+def make_parser():
+    """Return a function that returns a line log parser for an input
+    stream."""
+    return make_line_log_parser(make_log_parser_class())
+
+
+@pytest.fixture
+def log_path(tmp_path):
+    """Return a log file path."""
+    return str(tmp_path / "meetup2xibo.log")
+
+
+@pytest.fixture
+def checkpoint_path(tmp_path):
+    """Return a checkpoint file path."""
+    return str(tmp_path / "checkpoint.pickle")
+
+
+def make_summary(critical_date = "2019-03-04"):
+    """Return an empty summary."""
+    return Summary(
+        StartCounter(),
+        CrudLister(),
+        ConflictReporter(critical_date),
+        LocationMapper(),
+        SuppressedEventTracker(),
+        TimingTracker())
+
+
+def append_lines(path, *lines):
+    """Append lines to a file."""
+    with open(path, "a") as log_file:
+        log_file.write("".join(lines))
+
+
+def summarize(log_path, checkpoint_path, make_parser, summary = None):
+    """Summarize a log file incrementally like a log summarizer. Return the
+    summary and the lines read."""
+    log_file = CheckpointedLogFile(log_path, checkpoint_path)
+    summary = log_file.load(summary or make_summary())
+    lines = list(log_file)
+    make_parser(iter(lines)).log_lines(summary)
+    log_file.save(summary)
+    return summary, lines
+
+
+def test_first_run_reads_all(
+        log_path, checkpoint_path, make_parser, sample_log_lines):
+    """Test reading all lines without a checkpoint."""
+    start_line = sample_log_lines.start_line() + "\n"
+    append_lines(log_path, start_line, start_line)
+    summary, lines = summarize(log_path, checkpoint_path, make_parser)
+    assert lines == [start_line, start_line]
+    assert summary.counter.counts() == [("meetup2xibo 2.0.1", 2)]
+
+
+def test_resume_reads_appended_lines(
+        log_path, checkpoint_path, make_parser, sample_log_lines):
+    """Test reading only appended lines, adding to the saved summary."""
+    start_line = sample_log_lines.start_line() + "\n"
+    insert_line = sample_log_lines.insert_line() + "\n"
+    append_lines(log_path, start_line)
+    summarize(log_path, checkpoint_path, make_parser)
+    append_lines(log_path, start_line, insert_line)
+    summary, lines = summarize(log_path, checkpoint_path, make_parser)
+    assert lines == [start_line, insert_line]
+    assert summary.counter.counts() == [("meetup2xibo 2.0.1", 2)]
+    assert len(summary.crud_lister.event_logs) == 1
+
+
+def test_incomplete_line_read_later(
+        log_path, checkpoint_path, make_parser, sample_log_lines):
+    """Test holding back an incomplete last line until it is complete."""
+    start_line = sample_log_lines.start_line() + "\n"
+    append_lines(log_path, start_line, start_line[:20])
+    summary, lines = summarize(log_path, checkpoint_path, make_parser)
+    assert lines == [start_line]
+    append_lines(log_path, start_line[20:])
+    summary, lines = summarize(log_path, checkpoint_path, make_parser)
+    assert lines == [start_line]
+    assert summary.counter.counts() == [("meetup2xibo 2.0.1", 2)]
+
+
+def test_update_pair_split_between_runs(
+        log_path, checkpoint_path, make_parser, sample_log_lines):
+    """Test rereading a final update from line with its update to line."""
+    from_line, to_line = sample_log_lines.update_line().split("\n")
+    append_lines(log_path, from_line + "\n")
+    summary, lines = summarize(log_path, checkpoint_path, make_parser)
+    assert not summary.crud_lister.event_logs
+    append_lines(log_path, to_line + "\n")
+    summary, lines = summarize(log_path, checkpoint_path, make_parser)
+    assert lines == [from_line + "\n", to_line + "\n"]
+    assert len(summary.crud_lister.event_logs) == 1
+
+
+def test_rotation_loses_nothing(
+        log_path, checkpoint_path, make_parser, sample_log_lines):
+    """Test finishing the rotated file before reading the new log file,
+    keeping the saved summary."""
+    start_line = sample_log_lines.start_line() + "\n"
+    insert_line = sample_log_lines.insert_line() + "\n"
+    append_lines(log_path, start_line, start_line)
+    summarize(log_path, checkpoint_path, make_parser)
+    append_lines(log_path, insert_line)
+    os.rename(log_path, log_path + ".2019-03-04")
+    append_lines(log_path, start_line)
+    summary, lines = summarize(log_path, checkpoint_path, make_parser)
+    assert lines == [insert_line, start_line]
+    assert summary.counter.counts() == [("meetup2xibo 2.0.1", 3)]
+    assert len(summary.crud_lister.event_logs) == 1
+    append_lines(log_path, start_line)
+    summary, lines = summarize(log_path, checkpoint_path, make_parser)
+    assert lines == [start_line]
+    assert summary.counter.counts() == [("meetup2xibo 2.0.1", 4)]
+
+
+def test_rotation_twice_loses_nothing(
+        log_path, checkpoint_path, make_parser, sample_log_lines):
+    """Test reading every file rotated since the checkpoint in order."""
+    start_line = sample_log_lines.start_line() + "\n"
+    insert_line = sample_log_lines.insert_line() + "\n"
+    append_lines(log_path, start_line)
+    summarize(log_path, checkpoint_path, make_parser)
+    os.rename(log_path, log_path + ".2019-03-04")
+    append_lines(log_path, insert_line)
+    os.rename(log_path, log_path + ".2019-03-05")
+    append_lines(log_path, start_line)
+    append_lines(log_path + ".checkpoint", "not a log")
+    summary, lines = summarize(log_path, checkpoint_path, make_parser)
+    assert lines == [insert_line, start_line]
+    assert summary.counter.counts() == [("meetup2xibo 2.0.1", 2)]
+
+
+def test_rotated_file_missing_starts_over(
+        log_path, checkpoint_path, make_parser, sample_log_lines):
+    """Test starting over when the rotated file has been removed."""
+    start_line = sample_log_lines.start_line() + "\n"
+    append_lines(log_path, start_line, start_line)
+    summarize(log_path, checkpoint_path, make_parser)
+    os.remove(log_path)
+    append_lines(log_path, start_line)
+    summary, lines = summarize(log_path, checkpoint_path, make_parser)
+    assert lines == [start_line]
+    assert summary.counter.counts() == [("meetup2xibo 2.0.1", 1)]
+
+
+def test_truncation_starts_over(
+        log_path, checkpoint_path, make_parser, sample_log_lines):
+    """Test starting over when the log file has been truncated in place."""
+    start_line = sample_log_lines.start_line() + "\n"
+    other_line = sample_log_lines.no_changes_line() + "\n"
+    append_lines(log_path, start_line, start_line)
+    summarize(log_path, checkpoint_path, make_parser)
+    with open(log_path, "w") as log_file:
+        log_file.write(other_line + start_line)
+    summary, lines = summarize(log_path, checkpoint_path, make_parser)
+    assert lines == [other_line, start_line]
+    assert summary.counter.counts() == [("meetup2xibo 2.0.1", 1)]
+
+
+def test_unreadable_checkpoint_ignored(
+        log_path, checkpoint_path, make_parser, sample_log_lines, caplog):
+    """Test starting over when the checkpoint cannot be read."""
+    start_line = sample_log_lines.start_line() + "\n"
+    append_lines(log_path, start_line)
+    append_lines(checkpoint_path, "not a pickle")
+    summary, lines = summarize(log_path, checkpoint_path, make_parser)
+    assert lines == [start_line]
+    assert "Ignoring unreadable checkpoint" in caplog.text
+
+
+def test_critical_date_checked_again(
+        log_path, checkpoint_path, make_parser, sample_log_lines):
+    """Test checking saved conflicts against the current critical date."""
+    append_lines(log_path, sample_log_lines.schedule_conflict_line() + "\n")
+    summary, lines = summarize(
+        log_path, checkpoint_path, make_parser, make_summary("2000-01-01"))
+    [(place, [conflict])] = summary.conflict_reporter.sorted_conflict_places()
+    assert not conflict.is_critical
+    critical_date = conflict.start_time[:len("YYYY-MM-DD")]
+    summary, lines = summarize(
+        log_path, checkpoint_path, make_parser, make_summary(critical_date))
+    [(place, [conflict])] = summary.conflict_reporter.sorted_conflict_places()
+    assert conflict.is_critical
+
+
+def test_null_checkpoint():
+    """Test that a null checkpoint returns the given summary."""
+    summary = make_summary()
+    checkpoint = NullCheckpoint()
+    assert checkpoint.load(summary) is summary
+    checkpoint.save(summary)
+
+
+# vim: tabstop=8 expandtab shiftwidth=4 softtabstop=4 autoindent
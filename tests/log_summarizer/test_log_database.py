@@ -0,0 +1,168 @@
+"""Test storing summarized log lines in an SQLite database."""
+
+from .test_line_log_parser import make_summary, summary_state, sample_lines
+from meetup2xibo.log_summarizer.line_log_parser import LineLogParser
+from meetup2xibo.log_summarizer.log_database import LogDatabase, \
+    NullLogDatabase, next_date
+from meetup2xibo.log_summarizer.log_parser import make_log_parser_class
+from contextlib import closing
+import pytest
+
+
+@pytest.fixture(scope="module")
+def log_parser_class():
+    """Return a log parser class, which creates a parser when called
+    with string."""
+    return make_log_parser_class()
+
+
+@pytest.fixture
+def database_path(tmp_path):
+    """Return a database file path."""
+    return str(tmp_path / "summary.sqlite")
+
+
+@pytest.fixture
+def sample_summary(log_parser_class, sample_log_lines):
+    """Return a summary of all kinds of sample log lines."""
+    lines = [line + "\n" for line in sample_lines(sample_log_lines)]
+    summary = make_summary()
+    LineLogParser(lines, log_parser_class).log_lines(summary)
+    return summary
+
+
+def saved_summary(database_path, summary, **kwargs):
+    """Save a summary in a database and return the summary loaded from
+    it."""
+    LogDatabase(database_path, make_summary).save(summary)
+    return LogDatabase(database_path, make_summary, **kwargs).load(None)
+
+
+def meetup_ids(summary):
+    """Return a sorted list of the Meetup IDs of a summary's event logs."""
+    return sorted(summary.crud_lister.event_logs.keys())
+
+
+def test_save_load(database_path, sample_summary):
+    """Test that a summary loaded from a database matches the summary
+    saved."""
+    summary = saved_summary(database_path, sample_summary)
+    assert summary_state(summary) == summary_state(sample_summary)
+
+
+def test_save_twice(database_path, sample_summary):
+    """Test that saving a summary again adds nothing."""
+    LogDatabase(database_path, make_summary).save(sample_summary)
+    summary = saved_summary(database_path, sample_summary)
+    assert summary_state(summary) == summary_state(sample_summary)
+
+
+def test_load_meetup_id(database_path, sample_summary):
+    """Test loading the log lines of one Meetup event."""
+    summary = saved_summary(
+        database_path, sample_summary, meetup_id = "259565142")
+    assert meetup_ids(summary) == ["259565142"]
+    assert summary.counter.counts() == []
+    assert not summary.conflict_reporter.has_conflicts()
+    assert not summary.location_mapper.has_mappings()
+
+
+def test_load_since(database_path, sample_summary):
+    """Test loading log lines and conflicts on or after a date."""
+    summary = saved_summary(database_path, sample_summary, since = "2019-03-05")
+    assert meetup_ids(summary) == []
+    assert summary.counter.counts() == []
+    assert summary.conflict_reporter.has_conflicts()
+
+
+def test_load_until(database_path, sample_summary):
+    """Test loading log lines and conflicts on or before a date."""
+    summary = saved_summary(database_path, sample_summary, until = "2019-03-04")
+    assert meetup_ids(summary) == meetup_ids(sample_summary)
+    assert summary.counter.counts() == sample_summary.counter.counts()
+    assert not summary.conflict_reporter.has_conflicts()
+
+
+def test_conflicts_kept_without_analysis(database_path, sample_summary):
+    """Test that saving a summary without a conflict analysis keeps the
+    saved conflicts."""
+    LogDatabase(database_path, make_summary).save(sample_summary)
+    summary = saved_summary(database_path, make_summary())
+    assert summary.conflict_reporter.sorted_conflict_places() == \
+        sample_summary.conflict_reporter.sorted_conflict_places()
+
+
+def test_conflicts_replaced_by_analysis(database_path, sample_summary):
+    """Test that saving a summary with a conflict analysis replaces the
+    saved conflicts."""
+    LogDatabase(database_path, make_summary).save(sample_summary)
+    new_summary = make_summary()
+    new_summary.conflict_reporter.clear()
+    new_summary.conflict_reporter.add_checked_place("Woodshop")
+    summary = saved_summary(database_path, new_summary)
+    assert not summary.conflict_reporter.has_conflicts()
+    assert summary.conflict_reporter.sorted_checked_places() == ["Woodshop"]
+
+
+def test_unreadable_rows_ignored(database_path, sample_summary, caplog):
+    """Test skipping stored log lines and conflicts that cannot be read."""
+    database = LogDatabase(database_path, make_summary)
+    database.save(sample_summary)
+    with closing(database.connect()) as connection, connection:
+        connection.execute(
+            "INSERT INTO log_lines VALUES ('1', '2019-03-04 06:00', "
+            "'Inserted', '{\"type\": \"NoSuchLogLine\"}', 1)")
+        connection.execute(
+            "INSERT INTO conflicts VALUES ('Woodshop', '2019-03-04', "
+            "'not json')")
+    summary = database.load(None)
+    assert summary_state(summary) == summary_state(sample_summary)
+    assert "Ignoring unreadable log line" in caplog.text
+    assert "Ignoring unreadable conflict" in caplog.text
+
+
+def test_repeated_log_lines_kept(
+        database_path, log_parser_class, sample_log_lines):
+    """Test keeping identical log lines logged in the same minute, while
+    saving the summary again adds nothing."""
+    insert_line = sample_log_lines.insert_line() + "\n"
+    summary = make_summary()
+    LineLogParser([insert_line, insert_line], log_parser_class).log_lines(
+        summary)
+    LogDatabase(database_path, make_summary).save(summary)
+    loaded_summary = saved_summary(database_path, summary)
+    [event_log] = loaded_summary.crud_lister.event_logs.values()
+    assert [log_line.action for log_line in event_log.log_lines] == \
+        ["Inserted", "Inserted"]
+
+
+def test_start_counts_keep_larger(database_path):
+    """Test keeping the larger of the start counts saved for the same time
+    and name."""
+    def save_count(count):
+        summary = make_summary()
+        summary.counter.add_timed_count(
+            "2019-03-04 06:01", "meetup2xibo 2.0.1", count)
+        LogDatabase(database_path, make_summary).save(summary)
+    save_count(2)
+    save_count(1)
+    summary = LogDatabase(database_path, make_summary).load(None)
+    assert summary.counter.counts() == [("meetup2xibo 2.0.1", 2)]
+    save_count(3)
+    summary = LogDatabase(database_path, make_summary).load(None)
+    assert summary.counter.counts() == [("meetup2xibo 2.0.1", 3)]
+
+
+def test_next_date():
+    """Test finding the date after a date."""
+    assert next_date("2019-12-31") == "2020-01-01"
+
+
+def test_null_database(sample_summary):
+    """Test that a null database returns the summary given."""
+    database = NullLogDatabase()
+    database.save(sample_summary)
+    assert database.load(sample_summary) is sample_summary
+
+
+# vim: tabstop=8 expandtab shiftwidth=4 softtabstop=4 autoindent
@@ -0,0 +1,114 @@
+"""Test reading lines from several log files."""
+
+from meetup2xibo.log_summarizer.log_files import LogFiles
+from meetup2xibo.log_summarizer.command_line import parse_args
+import gzip
+import lzma
+import pytest
+
+
+LINES_1 = [
+    "2019-03-04 06:00:12,345 - INFO - meetup2xibo - Start meetup2xibo 3.4\n",
+    "2019-03-04 06:00:13,345 - INFO - meetup2xibo - End meetup2xibo 3.4\n",
+    ]
+
+LINES_2 = [
+    "Preamble without a timestamp\n",
+    "2019-03-05 06:00:12,345 - INFO - meetup2xibo - Start meetup2xibo 3.4\n",
+    ]
+
+LINES_3 = [
+    "2019-03-06 06:00:12,345 - INFO - meetup2xibo - Start meetup2xibo 3.4\n",
+    ]
+
+
+def write_text(path, lines):
+    """Write lines to a text file."""
+    with open(str(path), "w") as text_file:
+        text_file.writelines(lines)
+
+
+def write_gzip(path, lines):
+    """Write lines to a gzip compressed file."""
+    with gzip.open(str(path), "wt") as gzip_file:
+        gzip_file.writelines(lines)
+
+
+def write_xz(path, lines):
+    """Write lines to an xz compressed file."""
+    with lzma.open(str(path), "wt") as xz_file:
+        xz_file.writelines(lines)
+
+
+@pytest.fixture
+def log_dir(tmp_path):
+    """Return a directory of log files with names out of timestamp
+    order."""
+    write_xz(tmp_path / "meetup2xibo.log.a.xz", LINES_2)
+    write_gzip(tmp_path / "meetup2xibo.log.b.gz", LINES_1)
+    write_text(tmp_path / "meetup2xibo.log", LINES_3)
+    return tmp_path
+
+
+def test_lines_in_timestamp_order(log_dir):
+    """Test reading lines from plain and compressed files in timestamp
+    order."""
+    log_files = LogFiles([str(log_dir / "meetup2xibo.log*")])
+    assert list(log_files) == LINES_1 + LINES_2 + LINES_3
+
+
+def test_read(log_dir):
+    """Test reading all text from the log files."""
+    log_files = LogFiles([str(log_dir / "meetup2xibo.log*")])
+    assert log_files.read() == "".join(LINES_1 + LINES_2 + LINES_3)
+
+
+def test_paths_without_duplicates(log_dir):
+    """Test expanding patterns and paths without duplicates."""
+    log_path = str(log_dir / "meetup2xibo.log")
+    log_files = LogFiles([log_path, str(log_dir / "*.gz"), log_path])
+    assert log_files.paths() == [
+        log_path, str(log_dir / "meetup2xibo.log.b.gz")]
+
+
+def test_unmatched_pattern(log_dir):
+    """Test ignoring a glob pattern that matches no files."""
+    log_files = LogFiles([str(log_dir / "*.bz2")])
+    assert log_files.paths() == []
+
+
+def test_missing_path(log_dir):
+    """Test reporting a missing file."""
+    log_files = LogFiles([str(log_dir / "missing.log")])
+    with pytest.raises(FileNotFoundError):
+        list(log_files)
+
+
+def test_unterminated_last_line(tmp_path):
+    """Test ending an unterminated last line of a file."""
+    write_text(tmp_path / "partial.log", ["partial line"])
+    log_files = LogFiles([str(tmp_path / "partial.log")])
+    assert list(log_files) == ["partial line\n"]
+
+
+def test_first_timestamp_none(tmp_path):
+    """Test finding no timestamp in a file."""
+    write_text(tmp_path / "empty.log", [])
+    log_files = LogFiles([])
+    assert log_files.first_timestamp(str(tmp_path / "empty.log")) == ""
+
+
+def test_parse_args_inputs():
+    """Test repeated input options."""
+    args = parse_args(["-i", "a.log", "--input", "b*.gz"])
+    assert args.inputs == ["a.log", "b*.gz"]
+
+
+def test_parse_args_inputs_with_infile(tmp_path):
+    """Test rejecting an infile with input options."""
+    write_text(tmp_path / "in.log", LINES_1)
+    with pytest.raises(SystemExit):
+        parse_args(["-i", "a.log", str(tmp_path / "in.log")])
+
+
+# vim: tabstop=8 expandtab shiftwidth=4 softtabstop=4 autoindent
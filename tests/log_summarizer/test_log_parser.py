@@ -12,6 +12,7 @@ from meetup2xibo.log_summarizer.conflict_reporter import ConflictReporter
 from meetup2xibo.log_summarizer.crud_lister import CrudLister
 from meetup2xibo.log_summarizer.location_mapper import LocationMapper
 from meetup2xibo.log_summarizer.suppressed_event_tracker import SuppressedEventTracker
+from meetup2xibo.log_summarizer.timing_tracker import TimingTracker
 from parsley import ParseError
 import pytest
 
@@ -48,9 +49,14 @@ def suppressed_event_tracker():
     return SuppressedEventTracker()
 
 @pytest.fixture
-def summary(counter, crud_lister, conflict_reporter, location_mapper, suppressed_event_tracker):
+def timing_tracker():
+    """Return a timing tracker."""
+    return TimingTracker()
+
+@pytest.fixture
+def summary(counter, crud_lister, conflict_reporter, location_mapper, suppressed_event_tracker, timing_tracker):
     """Return a summary tuple."""
-    return Summary(counter, crud_lister, conflict_reporter, location_mapper, suppressed_event_tracker)
+    return Summary(counter, crud_lister, conflict_reporter, location_mapper, suppressed_event_tracker, timing_tracker)
 
 def test_dash(log_parser_class):
     """Test recognizing the dash separator between log line components."""
@@ -104,6 +110,21 @@ def test_start_log_line(log_parser_class, sample_log_lines, counter):
     parser.start_log_line(counter)
     assert counter.counts() == [("meetup2xibo 2.0.1", 1)]
 
+def test_no_changes_log_line(log_parser_class, sample_log_lines, counter):
+    """Test recognizing a no changes log line."""
+    log_line = sample_log_lines.no_changes_line()
+    parser = log_parser_class(log_line)
+    parser.no_changes_log_line(counter)
+    assert counter.no_changes_count == 1
+
+def test_no_changes_meetup_log_line(log_parser_class, counter):
+    """Test recognizing a no changes log line about Meetup events."""
+    log_line = "2019-03-04 16:52:14,131 - INFO - Meetup2Xibo - " \
+        "No changes: Meetup events not modified"
+    parser = log_parser_class(log_line)
+    parser.no_changes_log_line(counter)
+    assert counter.no_changes_count == 1
+
 def test_quoted_value(log_parser_class):
     """Test recognizing a quoted value."""
     parser = log_parser_class("'The quick brown fox'")
@@ -0,0 +1,94 @@
+"""Test parsing shards of logs concurrently."""
+
+from .test_line_log_parser import make_summary, summary_state
+from meetup2xibo.log_summarizer.sharded_log_parser import ShardedLogParser, \
+    make_sharded_log_parser
+from meetup2xibo.log_summarizer.line_log_parser import LineLogParser
+from meetup2xibo.log_summarizer.log_parser import make_log_parser_class
+from meetup2xibo.updater.serial_executor import SerialExecutor
+from concurrent.futures import ProcessPoolExecutor
+import pytest
+
+
+@pytest.fixture(scope="module")
+def log_parser_class():
+    """Return a log parser class, which creates a parser when called
+    with string."""
+    return make_log_parser_class()
+
+
+def run_lines(sample_log_lines, conflicts):
+    """Return the lines logged by one sample program run."""
+    run_lines = [
+        sample_log_lines.start_line(),
+        sample_log_lines.insert_line(),
+        sample_log_lines.unknown_location_line(),
+        sample_log_lines.update_line(),
+        sample_log_lines.suppress_xibo_line(),
+        sample_log_lines.suppressed_not_checked_line(),
+        sample_log_lines.event_location_line(),
+        ]
+    if conflicts:
+        run_lines.extend([
+            sample_log_lines.start_conflict_analysis_line(),
+            sample_log_lines.checked_place_line(),
+            sample_log_lines.schedule_conflict_line(),
+            ])
+    run_lines.append(sample_log_lines.end_line())
+    return "".join(line + "\n" for line in run_lines).splitlines(True)
+
+
+def sample_log(sample_log_lines):
+    """Return the lines logged by several sample program runs."""
+    lines = []
+    for run in range(7):
+        lines.extend(run_lines(sample_log_lines, run % 3 != 2))
+    return lines
+
+
+def parse_sequentially(log_parser_class, lines):
+    """Return the state of a summary of lines parsed in one process."""
+    summary = make_summary()
+    LineLogParser(lines, log_parser_class).log_lines(summary)
+    return summary_state(summary)
+
+
+@pytest.mark.parametrize("min_shard_lines", [1, 5, 20, 1000])
+def test_shards_match_sequential(
+        log_parser_class, sample_log_lines, min_shard_lines):
+    """Test that merged shard summaries match a sequential summary."""
+    lines = sample_log(sample_log_lines)
+    summary = make_summary()
+    parser = ShardedLogParser(
+        lines, make_summary, SerialExecutor, 2, min_shard_lines)
+    parser.log_lines(summary)
+    assert summary_state(summary) == \
+        parse_sequentially(log_parser_class, lines)
+
+
+def test_shards_in_processes(log_parser_class, sample_log_lines):
+    """Test merging summaries of shards parsed in separate processes."""
+    lines = sample_log(sample_log_lines)
+    summary = make_summary()
+    make_parser = make_sharded_log_parser(
+        make_summary, lambda: ProcessPoolExecutor(max_workers = 2), 3, 10)
+    make_parser(iter(lines)).log_lines(summary)
+    assert summary_state(summary) == \
+        parse_sequentially(log_parser_class, lines)
+
+
+def test_shards_start_at_start_lines(sample_log_lines):
+    """Test splitting shards only at start lines after the minimum number of
+    lines."""
+    lines = sample_log(sample_log_lines)
+    parser = ShardedLogParser(lines, make_summary, SerialExecutor, 2, 12)
+    shards = list(parser.shards())
+    assert sum(shards, []) == lines
+    assert len(shards) > 1
+    for shard in shards[1:]:
+        assert LineLogParser.is_start_line(shard[0])
+    for shard in shards[:-1]:
+        assert len(shard) >= 12
+
+
+# vim: tabstop=8 expandtab shiftwidth=4 softtabstop=4 autoindent
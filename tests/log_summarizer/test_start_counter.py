@@ -1,6 +1,7 @@
 """Test counting program starts."""
 
-from meetup2xibo.log_summarizer.start_counter import StartCounter
+from meetup2xibo.log_summarizer.start_counter import StartCounter, \
+    NO_CHANGES
 import pytest
 
 @pytest.fixture
@@ -26,5 +27,53 @@ def test_count_two_programs(start_counter):
     start_counter.count("Foo 1.0.0")
     assert start_counter.counts() == [("Bar 2.0.0", 1), ("Foo 1.0.0", 2)]
 
+
+def test_count_no_changes(start_counter):
+    """Test counting runs with no changes."""
+    start_counter.count_no_changes()
+    start_counter.count_no_changes()
+    assert start_counter.no_changes_count == 2
+    assert start_counter.counts() == []
+
+def test_merge(start_counter):
+    """Test adding the counts from another start counter."""
+    start_counter.count("Foo 1.0.0")
+    start_counter.count_no_changes()
+    other_counter = StartCounter()
+    other_counter.count("Foo 1.0.0")
+    other_counter.count("Bar 2.0.0")
+    other_counter.count_no_changes()
+    start_counter.merge(other_counter)
+    assert start_counter.counts() == [("Bar 2.0.0", 1), ("Foo 1.0.0", 2)]
+    assert start_counter.no_changes_count == 2
+
+def test_timed_counts(start_counter):
+    """Test counting program starts and runs with no changes by time."""
+    start_counter.count("Foo 1.0.0", "2019-03-04 06:01")
+    start_counter.count("Foo 1.0.0", "2019-03-04 06:01")
+    start_counter.count_no_changes("2019-03-04 06:02")
+    assert start_counter.timed_counts() == [
+        ("2019-03-04 06:01", "Foo 1.0.0", 2),
+        ("2019-03-04 06:02", NO_CHANGES, 1)]
+
+def test_add_timed_count(start_counter):
+    """Test adding counts of program starts and runs with no changes."""
+    start_counter.add_timed_count("2019-03-04 06:01", "Foo 1.0.0", 3)
+    start_counter.add_timed_count("2019-03-04 06:02", NO_CHANGES, 2)
+    assert start_counter.counts() == [("Foo 1.0.0", 3)]
+    assert start_counter.no_changes_count == 2
+
+def test_timed_counts_capped():
+    """Test keeping only the latest counts by time, but every start in the
+    totals."""
+    start_counter = StartCounter(max_timed_counts = 2)
+    start_counter.count("Foo 1.0.0", "2019-03-04 06:01")
+    start_counter.count("Foo 1.0.0", "2019-03-04 06:02")
+    start_counter.count("Foo 1.0.0", "2019-03-04 06:03")
+    assert start_counter.timed_counts() == [
+        ("2019-03-04 06:02", "Foo 1.0.0", 1),
+        ("2019-03-04 06:03", "Foo 1.0.0", 1)]
+    assert start_counter.counts() == [("Foo 1.0.0", 3)]
+
 # vim: tabstop=8 expandtab shiftwidth=4 softtabstop=4 autoindent
 
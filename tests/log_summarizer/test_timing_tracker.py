@@ -0,0 +1,92 @@
+"""Test tracking run timings and reporting their percentiles."""
+
+from meetup2xibo.log_summarizer.timing_tracker import TimingTracker, \
+    percentiles
+import pytest
+
+
+FIRST_TIMINGS = "retrieve=2.000 run=3.000 xibo_get=4/0.100/0.400/0.500/0.500"
+SECOND_TIMINGS = \
+    "retrieve=1.000 run=2.500 xibo_get=2/0.300/0.350/0.400/0.400"
+
+
+def test_no_timings():
+    """Test an empty timing tracker."""
+    tracker = TimingTracker()
+    assert not tracker.has_timings()
+    assert tracker.phase_percentiles() == []
+    assert tracker.request_percentiles() == []
+
+
+def test_add_timings_kept():
+    """Test keeping the timestamps and text of the timings."""
+    tracker = TimingTracker()
+    tracker.add_timings("2019-03-04 06:00", FIRST_TIMINGS)
+    assert tracker.has_timings()
+    assert tracker.timings() == [("2019-03-04 06:00", FIRST_TIMINGS)]
+
+
+def test_phase_percentiles():
+    """Test phase percentiles across runs."""
+    tracker = TimingTracker()
+    tracker.add_timings("2019-03-04 06:00", FIRST_TIMINGS)
+    tracker.add_timings("2019-03-04 06:10", SECOND_TIMINGS)
+    assert tracker.phase_percentiles() == [
+        ("retrieve", 2, 1.0, 2.0, 2.0, 2.0),
+        ("run", 2, 2.5, 3.0, 3.0, 3.0),
+        ]
+
+
+def test_request_percentiles():
+    """Test request percentiles of each run's percentiles with the overall
+    maximum."""
+    tracker = TimingTracker()
+    tracker.add_timings("2019-03-04 06:00", FIRST_TIMINGS)
+    tracker.add_timings("2019-03-04 06:10", SECOND_TIMINGS)
+    assert tracker.request_percentiles() == [
+        ("xibo_get", 6, 0.1, 0.4, 0.5, 0.5),
+        ]
+
+
+@pytest.mark.parametrize("text", [
+    "retrieve", "retrieve=", "retrieve=fast", "xibo_get=1/0.1/0.2",
+    "xibo_get=one/0.1/0.2/0.3/0.4", "xibo_get=1/0.1/0.2/0.3/0.4/0.5",
+    ])
+def test_malformed_timings_ignored(text):
+    """Test ignoring malformed timings."""
+    tracker = TimingTracker()
+    tracker.add_timings("2019-03-04 06:00", text + " run=1.000")
+    assert tracker.phase_percentiles() == [("run", 1, 1.0, 1.0, 1.0, 1.0)]
+    assert tracker.request_percentiles() == []
+
+
+def test_merge():
+    """Test merging the timings of another tracker."""
+    tracker = TimingTracker()
+    tracker.add_timings("2019-03-04 06:00", FIRST_TIMINGS)
+    other = TimingTracker()
+    other.add_timings("2019-03-04 06:10", SECOND_TIMINGS)
+    tracker.merge(other)
+    assert tracker.timings() == [
+        ("2019-03-04 06:00", FIRST_TIMINGS),
+        ("2019-03-04 06:10", SECOND_TIMINGS),
+        ]
+    assert tracker.phase_percentiles()[0] == ("retrieve", 2, 1.0, 2.0, 2.0, 2.0)
+
+
+def test_runs_capped():
+    """Test keeping only the latest runs."""
+    tracker = TimingTracker(max_runs = 1)
+    tracker.add_timings("2019-03-04 06:00", FIRST_TIMINGS)
+    tracker.add_timings("2019-03-04 06:10", SECOND_TIMINGS)
+    assert tracker.timings() == [("2019-03-04 06:10", SECOND_TIMINGS)]
+    assert tracker.phase_percentiles()[0] == ("retrieve", 1, 1.0, 1.0, 1.0, 1.0)
+
+
+def test_percentiles_nearest_rank():
+    """Test nearest rank percentiles of a hundred values."""
+    values = [float(value) for value in range(100, 0, -1)]
+    assert percentiles(values) == (50.0, 90.0, 99.0, 100.0)
+
+
+# vim: tabstop=8 expandtab shiftwidth=4 softtabstop=4 autoindent
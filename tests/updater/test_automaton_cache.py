@@ -0,0 +1,71 @@
+"""Test caching built Aho-Corasick automata."""
+
+from meetup2xibo.updater.automaton_cache import AutomatonCache, \
+    NullAutomatonCache
+from meetup2xibo.updater.phrase_mapper import PhraseMapper
+import ahocorasick
+import logging
+
+
+PHRASES = (("Rm A", "Room A"), ("Bk Rm", "Back Room"))
+
+
+def built_automaton():
+    """Return an automaton built from the test phrases."""
+    return PhraseMapper(ahocorasick.Automaton(), PHRASES).setup().automaton
+
+def test_load_missing(tmpdir):
+    """Test loading nothing from an empty cache."""
+    cache = AutomatonCache(str(tmpdir.join("automata")))
+    assert cache.load(PHRASES) is None
+
+def test_save_and_load(tmpdir):
+    """Test saving and reloading a working automaton."""
+    cache = AutomatonCache(str(tmpdir.join("automata")))
+    cache.save(PHRASES, built_automaton())
+    mapper = PhraseMapper(None, PHRASES)
+    mapper.automaton = cache.load(PHRASES)
+    assert mapper.map_phrases("The bk rm") == ["Back Room"]
+
+def test_load_other_phrases(tmpdir):
+    """Test loading nothing for different phrases."""
+    cache = AutomatonCache(str(tmpdir))
+    cache.save(PHRASES, built_automaton())
+    assert cache.load(PHRASES[:1]) is None
+
+def test_load_corrupt(tmpdir, caplog):
+    """Test ignoring a corrupt cache file."""
+    cache = AutomatonCache(str(tmpdir))
+    with open(cache.path(PHRASES), "wb") as automaton_file:
+        automaton_file.write(b"not a pickle")
+    assert cache.load(PHRASES) is None
+    assert caplog.records[0].levelno == logging.WARNING
+
+def test_save_unwritable(tmpdir, caplog):
+    """Test warning instead of failing when the cache cannot be saved."""
+    blocker = tmpdir.join("automata")
+    blocker.write("not a directory")
+    cache = AutomatonCache(str(blocker))
+    cache.save(PHRASES, built_automaton())
+    assert cache.load(PHRASES) is None
+    assert caplog.records[0].levelno == logging.WARNING
+
+def test_save_unpicklable(tmpdir, caplog):
+    """Test warning instead of failing when the automaton cannot be
+    pickled."""
+    cache = AutomatonCache(str(tmpdir.join("automata")))
+    cache.save(PHRASES, lambda: None)
+    assert caplog.records[0].levelno == logging.WARNING
+
+def test_key_accepts_iterables():
+    """Test computing the same key from a list or a tuple."""
+    assert AutomatonCache.key(list(PHRASES)) == AutomatonCache.key(PHRASES)
+
+def test_null_cache():
+    """Test that the null cache never holds an automaton."""
+    cache = NullAutomatonCache()
+    cache.save(PHRASES, built_automaton())
+    assert cache.load(PHRASES) is None
+
+
+# vim: tabstop=8 expandtab shiftwidth=4 softtabstop=4 autoindent
@@ -0,0 +1,112 @@
+"""Test remembering the places found for venue and find us texts."""
+
+from meetup2xibo.updater.caching_place_finder import CachingPlaceFinder
+from meetup2xibo.updater.event_converter import PartialEvent
+from meetup2xibo.updater.json_file_store import JsonFileStore, \
+    NullJsonFileStore
+import pytest
+
+
+CONFIG_KEY = "abc123"
+
+
+def make_partial_event(venue_name = "", find_us = ""):
+    """Return a partial event with a venue name and find us text."""
+    return PartialEvent("", "", "", "", venue_name, find_us)
+
+
+@pytest.fixture()
+def place_finder(mocker):
+    """Return a mock place finder that finds the venue name as a place."""
+    place_finder = mocker.Mock()
+    place_finder.find_places.side_effect = \
+        lambda partial_event: [partial_event.venue_name]
+    return place_finder
+
+
+def test_find_places_miss(place_finder):
+    """Test finding places not yet cached."""
+    finder = CachingPlaceFinder(
+        place_finder, 10, NullJsonFileStore(), CONFIG_KEY)
+    assert finder.find_places(make_partial_event("Room A")) == ["Room A"]
+    assert finder.hits == 0
+    assert finder.misses == 1
+
+
+def test_find_places_hit_normalized(place_finder):
+    """Test finding cached places for differently spaced and cased texts."""
+    finder = CachingPlaceFinder(
+        place_finder, 10, NullJsonFileStore(), CONFIG_KEY)
+    finder.find_places(make_partial_event("Room A", "Back  door"))
+    places = finder.find_places(make_partial_event(" room a ", "BACK door"))
+    assert places == ["Room A"]
+    assert place_finder.find_places.call_count == 1
+    assert finder.hits == 1
+    assert finder.misses == 1
+
+
+def test_find_places_returns_copies(place_finder):
+    """Test that changing found places does not change the cache."""
+    finder = CachingPlaceFinder(
+        place_finder, 10, NullJsonFileStore(), CONFIG_KEY)
+    finder.find_places(make_partial_event("Room A")).append("Room B")
+    assert finder.find_places(make_partial_event("Room A")) == ["Room A"]
+
+
+def test_find_places_evicts_least_recently_used(place_finder):
+    """Test forgetting the least recently used places beyond the maximum."""
+    finder = CachingPlaceFinder(
+        place_finder, 2, NullJsonFileStore(), CONFIG_KEY)
+    finder.find_places(make_partial_event("A"))
+    finder.find_places(make_partial_event("B"))
+    finder.find_places(make_partial_event("A"))
+    finder.find_places(make_partial_event("C"))
+    assert list(finder.entries) == [("a", ""), ("c", "")]
+
+
+def test_save_and_load(tmpdir, place_finder):
+    """Test saving cached places for a later run."""
+    path = str(tmpdir.join("places.json"))
+    finder = CachingPlaceFinder(
+        place_finder, 10, JsonFileStore(path), CONFIG_KEY)
+    finder.find_places(make_partial_event("Room A", "Upstairs"))
+    finder.save()
+    place_finder.reset_mock()
+    loaded_finder = CachingPlaceFinder(
+        place_finder, 10, JsonFileStore(path), CONFIG_KEY).load()
+    places = loaded_finder.find_places(make_partial_event("Room A", "Upstairs"))
+    assert places == ["Room A"]
+    assert place_finder.find_places.call_count == 0
+    assert not loaded_finder.changed
+
+
+def test_load_ignores_other_config(tmpdir, place_finder):
+    """Test ignoring places cached for other place phrases."""
+    path = str(tmpdir.join("places.json"))
+    finder = CachingPlaceFinder(
+        place_finder, 10, JsonFileStore(path), CONFIG_KEY)
+    finder.find_places(make_partial_event("Room A"))
+    finder.save()
+    loaded_finder = CachingPlaceFinder(
+        place_finder, 10, JsonFileStore(path), "other").load()
+    assert len(loaded_finder.entries) == 0
+
+
+def test_save_unchanged(mocker, place_finder):
+    """Test not saving unchanged cached places."""
+    json_file_store = mocker.Mock()
+    json_file_store.load.return_value = {}
+    finder = CachingPlaceFinder(
+        place_finder, 10, json_file_store, CONFIG_KEY).load()
+    finder.save()
+    json_file_store.save.assert_not_called()
+
+
+def test_config_key_from():
+    """Test identifying place phrase configurations."""
+    key = CachingPlaceFinder.config_key_from([[("a", "A")], []])
+    assert key == CachingPlaceFinder.config_key_from([[("a", "A")], []])
+    assert key != CachingPlaceFinder.config_key_from([[("a", "B")], []])
+
+
+# vim: tabstop=8 expandtab shiftwidth=4 softtabstop=4 autoindent
@@ -101,5 +101,37 @@ def test_conflicts_flag_long():
     args = parse_command_line("--conflicts")
     assert args.conflicts
 
+def test_jobs_default():
+    """Test the default jobs file."""
+    args = parse_without_args()
+    assert args.jobs is None
+
+def test_jobs_short():
+    """Test setting the jobs file with the short argument."""
+    args = parse_command_line("-j jobs.json")
+    assert args.jobs == "jobs.json"
+
+def test_jobs_long():
+    """Test setting the jobs file with the long argument."""
+    args = parse_command_line("--jobs jobs.json")
+    assert args.jobs == "jobs.json"
+
+def test_daemon_defaults():
+    """Test the default daemon options."""
+    args = parse_without_args()
+    assert not args.daemon
+    assert args.envfile is None
+    assert args.interval == 15
+    assert args.jitter == 60
+
+def test_daemon_options():
+    """Test setting the daemon options."""
+    args = parse_command_line(
+        "--daemon --envfile test.env --interval 5 --jitter 2.5")
+    assert args.daemon
+    assert args.envfile == "test.env"
+    assert args.interval == 5
+    assert args.jitter == 2.5
+
 
 # vim: tabstop=8 expandtab shiftwidth=4 softtabstop=4 autoindent
@@ -1,10 +1,12 @@
 """Test the anti-flapper's judgements about event times."""
 
-from meetup2xibo.updater.conflict_analyzer import ConflictAnalyzer
+from meetup2xibo.updater.conflict_analyzer import ConflictAnalyzer, \
+    IntervalConflictAnalyzer
 from meetup2xibo.updater.conflict_places import ConflictPlaces
 from meetup2xibo.updater.event_converter import Event
 from meetup2xibo.updater.exceptions import ContainmentLoopError
-from hypothesis import given, assume, example
+from meetup2xibo.updater.injector import inject_make_process_executor
+from hypothesis import given, assume, example, settings
 from .sample_events import SampleEvents
 import pytest
 import hypothesis.strategies as st
@@ -42,8 +44,7 @@ sortable_events_lists = st.lists(
         unique_by = lambda event: event.meetup_id)
 
 
-@pytest.fixture
-def conflict_places():
+def make_conflict_places():
     """Return a populated conflict places."""
     conflict_places = ConflictPlaces()
     conflict_places.add_checked_place("Woodshop")
@@ -55,10 +56,26 @@ def conflict_places():
     conflict_places.add_containing_place("Classroom A/B", ["Classroom A", "Classroom B"])
     return conflict_places
 
+
+def make_nested_conflict_places():
+    """Return conflict places with checked and unchecked places nested
+    several ways."""
+    conflict_places = make_conflict_places()
+    conflict_places.add_checked_place("Building")
+    conflict_places.add_containing_place("Building", ["Shops", "Woodshop", "Classroom A/B"])
+    conflict_places.add_containing_place("Upstairs", ["Classroom A/B", "Classroom B"])
+    return conflict_places
+
+
 @pytest.fixture
-def conflict_analyzer(conflict_places):
-    """Return a conflict analyzer for the conflict places."""
-    return ConflictAnalyzer(conflict_places)
+def conflict_places():
+    """Return a populated conflict places."""
+    return make_conflict_places()
+
+@pytest.fixture(params = [ConflictAnalyzer, IntervalConflictAnalyzer])
+def conflict_analyzer(request, conflict_places):
+    """Return each kind of conflict analyzer for the conflict places."""
+    return request.param(conflict_places)
 
 @given(sortable_events_lists)
 @example(SampleEvents().make_sample_sortable_events())
@@ -217,12 +234,108 @@ def test_overlapping_events_from_sequence(sample_events, conflict_analyzer,
 def test_analyzing_containment_loops(sample_events, conflict_places,
         conflict_analyzer, caplog):
     """Test analyzing an event in a place that contains a place that contains
-    the first place.."""
+    the first place."""
     caplog.set_level(logging.INFO)
     conflict_places.add_containing_place("Storeroom", ["Shops"])
+    events = sample_events.make_overlapping_events(["Storeroom"])
+    with pytest.raises(ContainmentLoopError) as excinfo:
+        conflict_analyzer.sort_and_analyze_events(events)
+    assert str(excinfo.value) == "Loop found among containing places: " \
+        "'Shops' contains 'Storeroom' contains 'Shops'."
+
+
+class ConflictLogHandler(logging.Handler):
+
+    """Collects logged schedule conflict messages."""
+
+    def __init__(self):
+        super().__init__()
+        self.messages = []
+
+    def emit(self, record):
+        message = record.getMessage()
+        if message.startswith("Schedule conflict"):
+            self.messages.append(message)
+
+def logged_conflicts(make_analyzer, events):
+    """Return the conflicts logged by a conflict analyzer made for nested
+    conflict places."""
+    handler = ConflictLogHandler()
+    logger = logging.getLogger("CheckedPlace")
+    old_level = logger.level
+    logger.addHandler(handler)
+    logger.setLevel(logging.INFO)
     try:
-        sample_events.make_overlapping_events(["Storeroom"])
-    except ContainmentLoopError as err:
-        assert str(err) == "Loop found among containing places. Check 'Storeroom'."
+        make_analyzer(make_nested_conflict_places()).sort_and_analyze_events(events)
+    finally:
+        logger.removeHandler(handler)
+        logger.setLevel(old_level)
+    return handler.messages
+
+small_times = st.sampled_from([
+        "2019-01-01 10:00:00", "2019-01-01 11:00:00", "2019-01-01 12:00:00",
+        "2019-01-01 13:00:00", "2019-01-01 14:00:00"])
+
+place_names = st.sampled_from([
+        "Woodshop", "Metal Shop", "Classroom A", "Classroom B", "Classroom A/B",
+        "Shops", "Storeroom", "Building", "Upstairs", "Lobby"])
+
+crowded_events = st.builds(
+        Event,
+        meetup_id = st.text(alphabet = "abcdef", min_size = 1, max_size = 1),
+        name = st.just("Some Event"),
+        start_time = small_times,
+        end_time = small_times,
+        places = st.lists(place_names, max_size = 3),
+        location = st.just("Somewhere"))
+
+@given(st.lists(crowded_events, max_size = 12))
+def test_interval_analyzer_matches_clock_analyzer(events):
+    """Test that the interval conflict analyzer logs the same conflicts in the
+    same order as the clock sweeping conflict analyzer."""
+    expected_messages = logged_conflicts(ConflictAnalyzer, events)
+    assert logged_conflicts(IntervalConflictAnalyzer, events) == expected_messages
+
+def make_process_pool():
+    """Return a process pool executor with two spawned workers, as
+    configured for the application."""
+    return inject_make_process_executor(2)()
+
+@settings(max_examples = 10, deadline = None)
+@given(st.lists(crowded_events, max_size = 12))
+def test_interval_analyzer_process_pool(events):
+    """Test that analyzing places in separate processes logs the same
+    conflicts as analyzing them in the main process."""
+    expected_messages = logged_conflicts(IntervalConflictAnalyzer, events)
+    def make_analyzer(conflict_places):
+        return IntervalConflictAnalyzer(conflict_places, make_process_pool)
+    assert logged_conflicts(make_analyzer, events) == expected_messages
+
+def test_analyze_endpoint_lists_by_component(sample_events, mocker):
+    """Test submitting one task for each connected component of places."""
+    conflict_places = make_conflict_places()
+    executor = mocker.MagicMock()
+    executor.__enter__.return_value = executor
+    def submit(function, endpoint_lists):
+        future = mocker.Mock()
+        future.result.return_value = [{} for endpoints in endpoint_lists]
+        return future
+    executor.submit.side_effect = submit
+    analyzer = IntervalConflictAnalyzer(conflict_places, lambda: executor)
+    events = sample_events.make_overlapping_events(["Woodshop", "Metal Shop", "Classroom A", "Lobby"])
+    analyzer.sort_and_analyze_events(list(events))
+    endpoint_list_lengths = sorted(
+        len(args[1]) for args, kwargs in executor.submit.call_args_list)
+    assert endpoint_list_lengths == [1, 2]
+
+def test_interval_analyzer_containment_loop(sample_events, conflict_places):
+    """Test finding a loop among containing places."""
+    conflict_places.add_containing_place("Storeroom", ["Shops"])
+    events = sample_events.make_overlapping_events(["Woodshop"])
+    analyzer = IntervalConflictAnalyzer(conflict_places)
+    with pytest.raises(ContainmentLoopError) as excinfo:
+        analyzer.sort_and_analyze_events(events)
+    assert str(excinfo.value) == "Loop found among containing places: " \
+        "'Shops' contains 'Storeroom' contains 'Shops'."
 
 # vim: tabstop=8 expandtab shiftwidth=4 softtabstop=4 autoindent
@@ -3,6 +3,7 @@
 from meetup2xibo.updater.conflict_places import ConflictPlaces
 from meetup2xibo.updater.places import CheckedPlace, UncheckedPlace
 import pytest
+import sys
 
 
 @pytest.fixture
@@ -54,5 +55,18 @@ def test_add_containing_place_mixed(conflict_places):
     assert_conflict_place(conflict_places, "Room B", CheckedPlace)
     assert_contains(conflict_places, known_place, contained_places)
 
+def test_closure_of_deep_containment(conflict_places):
+    """Test computing the containment closure of a chain of places deeper
+    than the recursion limit."""
+    depth = sys.getrecursionlimit() + 100
+    names = ["Place {}".format(index) for index in range(depth)]
+    for name, contained_name in zip(names, names[1:]):
+        conflict_places.add_containing_place(name, [contained_name])
+    conflict_places.compute_containment_closure()
+    top = conflict_places.named_place(names[0])
+    bottom = conflict_places.named_place(names[-1])
+    assert len(top.descendants) == depth - 1
+    assert len(bottom.ancestors) == depth - 1
+
 
 # vim: tabstop=8 expandtab shiftwidth=4 softtabstop=4 autoindent
@@ -1,6 +1,7 @@
 """Test adding places and containment to conflict places."""
 
 from meetup2xibo.updater.conflict_places import ConflictPlaces, ConflictPlacesLoader
+from meetup2xibo.updater.exceptions import ContainmentLoopError
 from meetup2xibo.updater.places import CheckedPlace, UncheckedPlace
 import pytest
 
@@ -52,6 +53,10 @@ def assert_containing_places(conflict_places):
     for place in CONTAINING_PLACES:
         assert_contains(conflict_places, place["place"], place["contains"])
 
+def place_names(places):
+    """Return the set of names of places."""
+    return {place.name for place in places}
+
 def test_add_checked_places(conflict_places, conflict_places_loader):
     """Test adding checked places."""
     conflict_places_loader.add_checked_places()
@@ -69,4 +74,44 @@ def test_load(conflict_places, conflict_places_loader):
     assert_unchecked_places(loaded_conflict_places)
     assert_containing_places(loaded_conflict_places)
 
+def test_load_containment_closure():
+    """Test computing all places containing and contained by each place."""
+    containing_places = CONTAINING_PLACES + [
+        {"place": "Building", "contains": ["Shops", "CAD Lab"]},
+        {"place": "Campus", "contains": ["Building", "Woodshop"]},
+        ]
+    conflict_places = ConflictPlacesLoader(ConflictPlaces(),
+            CHECKED_PLACE_NAMES, containing_places).load()
+    campus = conflict_places.named_place("Campus")
+    woodshop = conflict_places.named_place("Woodshop")
+    assert place_names(campus.descendants) == {"Building", "Shops", "CAD Lab",
+            "Woodshop", "Metal Shop", "Computer Room", "Printer Room"}
+    assert place_names(woodshop.ancestors) == {"Shops", "Building", "Campus"}
+    assert not campus.ancestors
+    assert not woodshop.descendants
+
+def test_load_components():
+    """Test numbering the groups of places connected by containment."""
+    conflict_places = ConflictPlacesLoader(ConflictPlaces(),
+            CHECKED_PLACE_NAMES + ["Lobby"], CONTAINING_PLACES).load()
+    def component(name):
+        return conflict_places.named_place(name).component
+    assert component("Woodshop") == component("Shops") == component("Metal Shop")
+    assert component("CAD Lab") == component("Printer Room")
+    assert len({component("Woodshop"), component("CAD Lab"), component("Classroom"),
+        component("Lobby")}) == 4
+
+def test_load_containment_loop():
+    """Test reporting the path of a containment loop."""
+    containing_places = CONTAINING_PLACES + [
+        {"place": "Metal Shop", "contains": ["Forge"]},
+        {"place": "Forge", "contains": ["Shops"]},
+        ]
+    loader = ConflictPlacesLoader(ConflictPlaces(), CHECKED_PLACE_NAMES,
+            containing_places)
+    with pytest.raises(ContainmentLoopError) as excinfo:
+        loader.load()
+    assert str(excinfo.value) == "Loop found among containing places: " \
+        "'Shops' contains 'Metal Shop' contains 'Forge' contains 'Shops'."
+
 # vim: tabstop=8 expandtab shiftwidth=4 softtabstop=4 autoindent
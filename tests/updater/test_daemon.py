@@ -0,0 +1,140 @@
+"""Test running Meetup to Xibo cycles in a long-running process."""
+
+from meetup2xibo.updater.application_scope import ApplicationScope
+from meetup2xibo.updater.careful_environment import CarefulEnvironment
+from meetup2xibo.updater.daemon import Daemon
+from meetup2xibo.updater.exceptions import EnvFileError
+from meetup2xibo.updater.oauth2_session_starter import Oauth2SessionStarter
+from meetup2xibo.updater.oauth2_token_cache import Oauth2TokenCache
+from meetup2xibo.updater.json_file_store import NullJsonFileStore
+import logging
+import os
+import signal
+import threading
+import pytest
+
+
+@pytest.fixture
+def restore_signals():
+    """Restore the SIGTERM and SIGHUP handlers after a test."""
+    handlers = {
+        signum: signal.getsignal(signum)
+        for signum in (signal.SIGTERM, signal.SIGHUP)}
+    yield
+    for signum, handler in handlers.items():
+        signal.signal(signum, handler)
+
+def make_daemon(mocker, cycle_function, interval_seconds = 60):
+    """Return a daemon that runs a function each cycle."""
+    processor = mocker.Mock()
+    processor.run.side_effect = cycle_function
+    return Daemon(
+        mocker.Mock(return_value = "scope"),
+        mocker.Mock(return_value = processor),
+        interval_seconds, 0, (EnvFileError,))
+
+def test_stop_after_cycles(mocker, restore_signals):
+    """Test running cycles until stopped."""
+    cycles = []
+
+    def cycle():
+        cycles.append(len(cycles))
+        if len(cycles) == 3:
+            daemon.stop()
+
+    daemon = make_daemon(mocker, cycle, interval_seconds = 0)
+    daemon.run()
+    assert cycles == [0, 1, 2]
+    daemon.enter_cycle_scope.assert_called_with("scope")
+
+def test_sigterm_stops(mocker, restore_signals):
+    """Test stopping after SIGTERM without starting another cycle."""
+    daemon = make_daemon(mocker, None)
+    timer = threading.Timer(0.1, os.kill, (os.getpid(), signal.SIGTERM))
+    timer.start()
+    daemon.run()
+    timer.join()
+    assert daemon.enter_cycle_scope.call_count == 1
+
+def test_sighup_reloads(mocker, restore_signals):
+    """Test reloading configuration and starting a cycle after SIGHUP."""
+    def cycle():
+        if daemon.enter_cycle_scope.call_count == 1:
+            threading.Timer(0.1, os.kill, (os.getpid(), signal.SIGHUP)).start()
+        else:
+            daemon.stop()
+
+    daemon = make_daemon(mocker, cycle)
+    daemon.reload_application_scope.side_effect = ["scope", "new scope"]
+    daemon.run()
+    assert daemon.enter_cycle_scope.call_args_list == [
+        mocker.call("scope"), mocker.call("new scope")]
+
+def test_failed_reload_keeps_scope(mocker, caplog):
+    """Test keeping the configuration when it cannot be reloaded."""
+    daemon = make_daemon(mocker, None)
+    daemon.reload_application_scope.side_effect = EnvFileError("Bad file")
+    daemon.reloading = True
+    assert daemon.reload("scope") == "scope"
+    assert not daemon.reloading
+    assert caplog.messages == ["Cannot reload configuration: Bad file"]
+
+def test_cycle_exception_continues(mocker, caplog, restore_signals):
+    """Test logging an exception and continuing with the next cycle."""
+    def cycle():
+        if daemon.enter_cycle_scope.call_count == 1:
+            raise RuntimeError("Oops")
+        daemon.stop()
+
+    caplog.set_level(logging.INFO)
+    daemon = make_daemon(mocker, cycle, interval_seconds = 0)
+    daemon.run()
+    assert daemon.enter_cycle_scope.call_count == 2
+    assert "Unexpected exception in cycle 1" in caplog.messages
+
+def test_cycles_restart_expiring_xibo_session(mocker, restore_signals):
+    """Test that daemon cycles share a Xibo session until its token nears
+    expiration, then start a new one."""
+    cycle_times = [1000.0, 2000.0, 4400.0, 5000.0]
+    clock = mocker.patch("meetup2xibo.updater.oauth2_token_cache.time")
+    token_cache = Oauth2TokenCache(NullJsonFileStore(), "id", "url", 300)
+    starter = Oauth2SessionStarter(
+        "id", "secret", "url", None, mocker.Mock(), token_cache)
+    sessions = []
+
+    def start_session():
+        return mocker.Mock(token = {"expires_at": clock.time() + 3600})
+
+    def enter_cycle_scope(application_scope):
+        cycle_scope = application_scope.cycle_scope()
+        processor = mocker.Mock()
+
+        def run():
+            clock.time.return_value = cycle_times[len(sessions)]
+            sessions.append(cycle_scope.xibo_session(
+                start_session, starter.has_usable_token))
+            if len(sessions) == len(cycle_times):
+                daemon.stop()
+        processor.run.side_effect = run
+        return processor
+
+    env_vars = CarefulEnvironment(
+        {"XIBO_HOST": "xibo", "XIBO_PORT": "443", "XIBO_CLIENT_ID": "id"})
+    application_scope = ApplicationScope(None, env_vars)
+    daemon = Daemon(
+        lambda: application_scope, enter_cycle_scope, 0, 0, ())
+    daemon.run()
+    assert sessions[1] is sessions[0]
+    assert sessions[2] is not sessions[1]
+    assert sessions[3] is sessions[2]
+
+def test_delay_after(mocker):
+    """Test waiting the interval plus jitter after a cycle starts."""
+    mocker.patch("time.monotonic", return_value = 100.0)
+    mocker.patch("random.uniform", return_value = 5.0)
+    daemon = Daemon(None, None, 60, 10, ())
+    assert daemon.delay_after(90.0) == 55.0
+    assert daemon.delay_after(0.0) == 0
+
+
+# vim: tabstop=8 expandtab shiftwidth=4 softtabstop=4 autoindent
@@ -0,0 +1,46 @@
+"""Test reading environment variables from a shell-style file."""
+
+from meetup2xibo.updater.env_file import read_env_file
+from meetup2xibo.updater.exceptions import EnvFileError
+import pytest
+
+
+def test_read_env_file(tmpdir):
+    """Test reading exported and plain assignments with comments."""
+    path = tmpdir.join("test.env")
+    path.write("""# Comment
+export XIBO_HOST="xibo.example.com"
+XIBO_PORT=443
+export PLACES='[
+    "Lobby",
+    "Woodshop"
+]'
+""")
+    expected_env = {
+        "XIBO_HOST": "xibo.example.com",
+        "XIBO_PORT": "443",
+        "PLACES": '[\n    "Lobby",\n    "Woodshop"\n]',
+        }
+    assert read_env_file(str(path)) == expected_env
+
+def test_read_env_file_missing(tmpdir):
+    """Test reporting a missing file."""
+    with pytest.raises(EnvFileError):
+        read_env_file(str(tmpdir.join("missing.env")))
+
+def test_read_env_file_unclosed_quote(tmpdir):
+    """Test reporting an unclosed quotation."""
+    path = tmpdir.join("test.env")
+    path.write("export PLACES='[\n")
+    with pytest.raises(EnvFileError):
+        read_env_file(str(path))
+
+def test_read_env_file_not_assignment(tmpdir):
+    """Test reporting a word that is not an assignment."""
+    path = tmpdir.join("test.env")
+    path.write("echo hello\n")
+    with pytest.raises(EnvFileError):
+        read_env_file(str(path))
+
+
+# vim: tabstop=8 expandtab shiftwidth=4 softtabstop=4 autoindent
@@ -0,0 +1,76 @@
+"""Test caching JSON web responses for conditional requests."""
+
+from meetup2xibo.updater.http_response_cache import HttpResponseCache
+from meetup2xibo.updater.json_file_store import JsonFileStore
+import pytest
+
+
+SAMPLE_KEY = "https://example.com/events status="
+SAMPLE_PARAMS = {"page": 10}
+SAMPLE_JSON = [{"id": "123"}]
+SAMPLE_ETAG = '"abc"'
+SAMPLE_LAST_MODIFIED = "Sat, 17 Oct 2020 12:00:00 GMT"
+
+
+@pytest.fixture()
+def response_cache(tmpdir):
+    """Return a response cache stored in a temporary file."""
+    store = JsonFileStore(str(tmpdir.join("responses.json")))
+    return HttpResponseCache(store, 3600)
+
+def fake_response(mocker, headers, status_code = 200):
+    """Return a fake web response with headers."""
+    response = mocker.Mock(status_code = status_code, headers = headers)
+    response.json.return_value = SAMPLE_JSON
+    return response
+
+def test_conditional_headers_empty(response_cache):
+    """Test sending no conditional headers without a cached response."""
+    assert response_cache.conditional_headers(SAMPLE_KEY, SAMPLE_PARAMS) == {}
+
+def test_conditional_headers_same_params(mocker, response_cache):
+    """Test sending both validators for the same request parameters."""
+    response = fake_response(mocker, {
+            "ETag": SAMPLE_ETAG, "Last-Modified": SAMPLE_LAST_MODIFIED})
+    response_cache.save_response(SAMPLE_KEY, SAMPLE_PARAMS, response)
+    expected_headers = {
+            "If-None-Match": SAMPLE_ETAG,
+            "If-Modified-Since": SAMPLE_LAST_MODIFIED,
+            }
+    headers = response_cache.conditional_headers(SAMPLE_KEY, SAMPLE_PARAMS)
+    assert headers == expected_headers
+    assert response_cache.cached_json(SAMPLE_KEY) == SAMPLE_JSON
+
+def test_conditional_headers_other_params(mocker, response_cache):
+    """Test sending only the ETag for different request parameters."""
+    response = fake_response(mocker, {
+            "ETag": SAMPLE_ETAG, "Last-Modified": SAMPLE_LAST_MODIFIED})
+    response_cache.save_response(SAMPLE_KEY, SAMPLE_PARAMS, response)
+    headers = response_cache.conditional_headers(SAMPLE_KEY, {"page": 11})
+    assert headers == {"If-None-Match": SAMPLE_ETAG}
+
+def test_conditional_headers_expired(mocker, response_cache):
+    """Test sending no conditional headers after the maximum age."""
+    response = fake_response(mocker, {"ETag": SAMPLE_ETAG})
+    response_cache.save_response(SAMPLE_KEY, SAMPLE_PARAMS, response)
+    mocker.patch("time.time", return_value = 9e12)
+    assert response_cache.conditional_headers(SAMPLE_KEY, SAMPLE_PARAMS) == {}
+
+def test_save_response_without_validators(mocker, response_cache):
+    """Test not caching a response without validators."""
+    response = fake_response(mocker, {})
+    response_cache.save_response(SAMPLE_KEY, SAMPLE_PARAMS, response)
+    assert response_cache.json_file_store.load() == {}
+
+def test_is_not_modified(mocker):
+    """Test recognizing a not modified response."""
+    response = fake_response(mocker, {}, status_code = 304)
+    assert HttpResponseCache.is_not_modified(response)
+
+def test_is_modified(mocker):
+    """Test recognizing a modified response."""
+    response = fake_response(mocker, {})
+    assert not HttpResponseCache.is_not_modified(response)
+
+
+# vim: tabstop=8 expandtab shiftwidth=4 softtabstop=4 autoindent
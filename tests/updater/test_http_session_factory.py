@@ -0,0 +1,68 @@
+"""Test providing web sessions with pooled connections."""
+
+from meetup2xibo.updater.http_session_factory import HttpSessionFactory, \
+    TimeoutHTTPAdapter
+import requests
+import pytest
+
+
+@pytest.fixture
+def factory():
+    """Return an HTTP session factory."""
+    return HttpSessionFactory("test/123", 7, 2, 30)
+
+def test_origin():
+    """Test extracting the origin from a URL."""
+    origin = HttpSessionFactory.origin("https://Example.com:8443/api/about?x=1")
+    assert origin == "https://example.com:8443"
+
+def test_session_for_same_host(factory):
+    """Test sharing one session among URLs at the same host."""
+    session1 = factory.session_for("https://example.com/api/about")
+    session2 = factory.session_for("https://example.com/api/dataset")
+    assert session1 is session2
+
+def test_session_for_different_hosts(factory):
+    """Test providing different sessions for different hosts."""
+    session1 = factory.session_for("https://example.com/api/about")
+    session2 = factory.session_for("https://api.meetup.com/foo/events")
+    assert session1 is not session2
+
+def test_session_user_agent(factory):
+    """Test setting the user agent in new sessions."""
+    session = factory.session_for("https://example.com/")
+    assert session.headers["User-Agent"] == "test/123"
+
+def test_session_adapter(factory):
+    """Test configuring the pooled adapter."""
+    session = factory.session_for("https://example.com/")
+    adapter = session.get_adapter("https://example.com/api/about")
+    assert isinstance(adapter, TimeoutHTTPAdapter)
+    assert adapter.timeout == 30
+    assert adapter._pool_maxsize == 7
+    assert adapter.max_retries.total == 2
+
+def test_mount_adapter_shares_pool(factory):
+    """Test sharing one adapter between a provided session and another
+    session."""
+    session = requests.Session()
+    factory.mount_adapter(session, "https://example.com/token")
+    pooled_session = factory.session_for("https://example.com/")
+    url = "https://example.com/api/about"
+    assert session.get_adapter(url) is pooled_session.get_adapter(url)
+
+def test_timeout_default(mocker):
+    """Test applying the default timeout to a request."""
+    send = mocker.patch("requests.adapters.HTTPAdapter.send")
+    adapter = TimeoutHTTPAdapter(timeout=12)
+    adapter.send("request")
+    send.assert_called_once_with("request", timeout=12)
+
+def test_timeout_override(mocker):
+    """Test keeping a request's own timeout."""
+    send = mocker.patch("requests.adapters.HTTPAdapter.send")
+    adapter = TimeoutHTTPAdapter(timeout=12)
+    adapter.send("request", timeout=3)
+    send.assert_called_once_with("request", timeout=3)
+
+# vim: tabstop=8 expandtab shiftwidth=4 softtabstop=4 autoindent
@@ -0,0 +1,43 @@
+"""Test tracking the job each thread is working on."""
+
+from meetup2xibo.updater.job_context import JobContext, JobFilter, \
+    OtherJobsFilter, JobContextExecutor, current_job_name
+from concurrent.futures import ThreadPoolExecutor
+import logging
+
+
+def test_job_context():
+    """Test entering and exiting nested job contexts."""
+    assert current_job_name() is None
+    with JobContext("outer"):
+        assert current_job_name() == "outer"
+        with JobContext("inner"):
+            assert current_job_name() == "inner"
+        assert current_job_name() == "outer"
+    assert current_job_name() is None
+
+def test_job_filter():
+    """Test passing log records only from selected jobs."""
+    record = logging.makeLogRecord({"msg": "Hello"})
+    job_filter = JobFilter(["a"])
+    other_jobs_filter = OtherJobsFilter(["a"])
+    with JobContext("a"):
+        assert job_filter.filter(record)
+        assert not other_jobs_filter.filter(record)
+    with JobContext("b"):
+        assert not job_filter.filter(record)
+        assert other_jobs_filter.filter(record)
+    assert not job_filter.filter(record)
+    assert other_jobs_filter.filter(record)
+
+def test_job_context_executor():
+    """Test running tasks in the job context of the submitting thread."""
+    executor = JobContextExecutor(ThreadPoolExecutor(2))
+    with JobContext("a"):
+        future = executor.submit(current_job_name)
+    assert future.result() == "a"
+    assert executor.submit(current_job_name).result() is None
+    executor.shutdown()
+
+
+# vim: tabstop=8 expandtab shiftwidth=4 softtabstop=4 autoindent
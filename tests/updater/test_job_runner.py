@@ -0,0 +1,109 @@
+"""Test running several Meetup to Xibo jobs concurrently."""
+
+from meetup2xibo.updater.job_runner import JobRunner, Job, load_jobs, \
+    check_job_logfiles
+from meetup2xibo.updater.job_context import current_job_name
+from meetup2xibo.updater.exceptions import JobsFileError
+from meetup2xibo.updater.serial_executor import SerialExecutor
+from concurrent.futures import ThreadPoolExecutor
+import logging
+import pytest
+
+
+JOB_A = Job("a", "a.log", {"MEETUP_GROUP_URL_NAME": "A"})
+JOB_B = Job("b", None, {"MEETUP_GROUP_URL_NAME": "B"})
+
+
+def test_load_jobs(tmpdir):
+    """Test loading jobs from a JSON file."""
+    path = tmpdir.join("jobs.json")
+    path.write("""[
+        {"name": "a", "logfile": "a.log", "env": {"MEETUP_GROUP_URL_NAME": "A"}},
+        {"name": "b", "env": {"XIBO_PAGE_LENGTH": 20, "DEFAULT_PLACES": ["X"]}}
+        ]""")
+    expected_jobs = [
+        JOB_A,
+        Job("b", None, {"XIBO_PAGE_LENGTH": "20", "DEFAULT_PLACES": '["X"]'}),
+        ]
+    assert load_jobs(str(path)) == expected_jobs
+
+def test_load_jobs_missing_name(tmpdir):
+    """Test reporting a job without a name."""
+    path = tmpdir.join("jobs.json")
+    path.write('[{"env": {}}]')
+    with pytest.raises(JobsFileError):
+        load_jobs(str(path))
+
+def test_load_jobs_missing_file(tmpdir):
+    """Test reporting a missing jobs file."""
+    with pytest.raises(JobsFileError):
+        load_jobs(str(tmpdir.join("missing.json")))
+
+def test_check_job_logfiles_separate():
+    """Test accepting concurrent jobs with their own log files and one job
+    logging to the main log."""
+    jobs = [JOB_A, JOB_B, Job("c", "c.log", {})]
+    assert check_job_logfiles(jobs, 4) == jobs
+
+@pytest.mark.parametrize("other_job, shared_log", [
+    (Job("c", None, {}), "main"),
+    (Job("c", "a.log", {}), "a.log"),
+    ])
+def test_check_job_logfiles_shared(other_job, shared_log):
+    """Test reporting concurrent jobs sharing a log file."""
+    with pytest.raises(JobsFileError) as exc_info:
+        check_job_logfiles([JOB_A, JOB_B, other_job], 2)
+    assert "share the {} log file".format(shared_log) in str(exc_info.value)
+
+def test_check_job_logfiles_serial():
+    """Test accepting jobs sharing the main log when run one at a time."""
+    jobs = [JOB_B, Job("c", None, {})]
+    assert check_job_logfiles(jobs, 1) == jobs
+
+def test_run_jobs_in_context(mocker):
+    """Test running each job in its own job context."""
+    job_names = []
+
+    def enter_job_scope(job):
+        processor = mocker.Mock()
+        processor.run.side_effect = lambda: job_names.append(current_job_name())
+        return processor
+
+    runner = JobRunner([JOB_A, JOB_B], enter_job_scope,
+            ThreadPoolExecutor(2), ())
+    runner.run()
+    assert sorted(job_names) == ["a", "b"]
+
+def test_run_jobs_despite_failure(mocker, caplog):
+    """Test running all jobs when one fails."""
+    processor_a = mocker.Mock()
+    processor_a.run.side_effect = KeyError("Oops")
+    processor_b = mocker.Mock()
+    processors = {"a": processor_a, "b": processor_b}
+    runner = JobRunner([JOB_A, JOB_B], lambda job: processors[job.name],
+            SerialExecutor(), ())
+    runner.run()
+    processor_b.run.assert_called_once_with()
+    assert caplog.records[-1].getMessage() == "Failed jobs: a"
+
+def test_run_jobs_shuts_down_executor(mocker):
+    """Test shutting down the executor after running the jobs."""
+    executor = ThreadPoolExecutor(2)
+    shutdown = mocker.spy(executor, "shutdown")
+    runner = JobRunner([JOB_A, JOB_B], lambda job: mocker.Mock(), executor, ())
+    runner.run()
+    shutdown.assert_called_once_with()
+
+def test_run_job_no_trace_exception(mocker, caplog):
+    """Test logging an expected exception without a traceback."""
+    processor = mocker.Mock()
+    processor.run.side_effect = JobsFileError("Bad")
+    runner = JobRunner([JOB_A], lambda job: processor, SerialExecutor(),
+            (JobsFileError,))
+    assert not runner.run_job(JOB_A)
+    error_records = [r for r in caplog.records if r.levelno == logging.ERROR]
+    assert error_records[0].getMessage() == "Job a: JobsFileError - Bad"
+    assert error_records[0].exc_info is None
+
+
+# vim: tabstop=8 expandtab shiftwidth=4 softtabstop=4 autoindent
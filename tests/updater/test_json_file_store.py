@@ -0,0 +1,72 @@
+"""Test storing JSON data in files."""
+
+from meetup2xibo.updater.json_file_store import JsonFileStore, NullJsonFileStore
+import logging
+import os
+import stat
+import threading
+
+
+def test_load_missing(tmpdir):
+    """Test loading an empty dictionary from a missing file."""
+    store = JsonFileStore(str(tmpdir.join("missing.json")))
+    assert store.load() == {}
+
+def test_save_and_load(tmpdir):
+    """Test saving and reloading JSON data."""
+    store = JsonFileStore(str(tmpdir.join("store.json")))
+    store.save({"a": [1, 2], "b": "c"})
+    assert store.load() == {"a": [1, 2], "b": "c"}
+
+def test_save_owner_only(tmpdir):
+    """Test restricting file permissions to the owner."""
+    path = str(tmpdir.join("store.json"))
+    JsonFileStore(path).save({})
+    mode = stat.S_IMODE(os.stat(path).st_mode)
+    assert mode == 0o600
+
+def test_load_corrupt(tmpdir, caplog):
+    """Test loading an empty dictionary from a corrupt file."""
+    path = tmpdir.join("store.json")
+    path.write("{not json")
+    store = JsonFileStore(str(path))
+    assert store.load() == {}
+    assert "Ignoring unreadable" in caplog.text
+
+def test_save_leaves_no_temp_files(tmpdir):
+    """Test replacing the file without leaving temporary files behind."""
+    path = tmpdir.join("store.json")
+    JsonFileStore(str(path)).save({"a": 1})
+    JsonFileStore(str(path)).save({"a": 2})
+    assert tmpdir.listdir() == [path]
+
+def test_update(tmpdir):
+    """Test changing the saved JSON data in place."""
+    path = str(tmpdir.join("store.json"))
+    JsonFileStore(path).save({"a": 1})
+    JsonFileStore(path).update(lambda data: data.update(b = 2))
+    assert JsonFileStore(path).load() == {"a": 1, "b": 2}
+
+def test_update_concurrently_keeps_every_change(tmpdir):
+    """Test that stores for the same path updating from several threads
+    keep each other's changes."""
+    path = str(tmpdir.join("store.json"))
+    def update(key):
+        JsonFileStore(path).update(lambda data: data.update({key: key}))
+    keys = [str(key) for key in range(20)]
+    threads = [threading.Thread(target = update, args = (key,)) for key in keys]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert JsonFileStore(path).load() == {key: key for key in keys}
+    assert tmpdir.listdir() == [tmpdir.join("store.json")]
+
+def test_null_store():
+    """Test storing nothing in a null store."""
+    store = NullJsonFileStore()
+    store.save({"a": 1})
+    store.update(lambda data: data.update(b = 2))
+    assert store.load() == {}
+
+# vim: tabstop=8 expandtab shiftwidth=4 softtabstop=4 autoindent
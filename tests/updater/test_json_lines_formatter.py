@@ -0,0 +1,80 @@
+"""Test formatting log records as lines of JSON."""
+
+from meetup2xibo.updater.json_lines_formatter import JsonLinesFormatter
+from meetup2xibo.updater.places import Conflict
+from meetup2xibo.updater.xibo_event import XiboEvent
+from datetime import date
+import json
+import logging
+import sys
+
+
+XIBO_EVENT = XiboEvent(
+    meetup_id = "259565142", name = "EMPOWER2MAKE", location = "Nova Labs",
+    start_time = "2019-04-14 08:00:00", end_time = "2019-04-14 10:00:00",
+    xibo_id = "423")
+
+
+def make_record(msg, args, exc_info=None):
+    """Return a log record."""
+    return logging.LogRecord(
+        "XiboEventCrud", logging.INFO, __file__, 1, msg, args, exc_info)
+
+
+def test_format_fields():
+    """Test formatting a record's time, level, logger, and message."""
+    formatter = JsonLinesFormatter()
+    record = make_record("Updated from %s", (XIBO_EVENT,))
+    record_dict = json.loads(formatter.format(record))
+    assert record_dict["time"] == formatter.formatTime(record)
+    assert record_dict["level"] == "INFO"
+    assert record_dict["logger"] == "XiboEventCrud"
+    assert record_dict["message"] == "Updated from " + str(XIBO_EVENT)
+    assert record_dict["format"] == "Updated from %s"
+    assert "exception" not in record_dict
+
+
+def test_format_named_tuple_args():
+    """Test formatting named tuple arguments as typed objects."""
+    record = make_record("Deleted %s", (XIBO_EVENT,))
+    record_dict = json.loads(JsonLinesFormatter().format(record))
+    expected_fields = dict(XIBO_EVENT._asdict())
+    assert record_dict["args"] == [
+        {"type": "XiboEvent", "fields": expected_fields}]
+
+
+def test_format_nested_args():
+    """Test formatting named tuples nested in lists."""
+    conflict = Conflict("2019-04-14 08:00:00", "2019-04-14 10:00:00",
+        [XIBO_EVENT])
+    record = make_record("Conflict %s", (conflict,))
+    record_dict = json.loads(JsonLinesFormatter().format(record))
+    events = record_dict["args"][0]["fields"]["events"]
+    assert events[0]["type"] == "XiboEvent"
+    assert events[0]["fields"]["xibo_id"] == "423"
+
+
+def test_format_other_args_as_strings():
+    """Test formatting arguments JSON cannot represent as strings."""
+    record = make_record("%s %d", (date(2019, 4, 14), 7))
+    record_dict = json.loads(JsonLinesFormatter().format(record))
+    assert record_dict["args"] == ["2019-04-14", 7]
+
+
+def test_format_exception():
+    """Test formatting a record's exception."""
+    try:
+        raise ValueError("Oops")
+    except ValueError:
+        record = make_record("Failed", (), sys.exc_info())
+    record_dict = json.loads(JsonLinesFormatter().format(record))
+    assert "ValueError: Oops" in record_dict["exception"]
+
+
+def test_format_one_line():
+    """Test that each record is formatted as a single line."""
+    record = make_record("Name=%r", ("Line one\nLine two",))
+    assert "\n" not in JsonLinesFormatter().format(record)
+
+
+# vim: tabstop=8 expandtab shiftwidth=4 softtabstop=4 autoindent
@@ -0,0 +1,146 @@
+"""Test retrieving Meetup events and updating Xibo."""
+
+from meetup2xibo.updater.meetup2xibo import Meetup2Xibo, XiboSessionScope
+from meetup2xibo.updater.serial_executor import SerialExecutor
+from meetup2xibo.updater.http_response_error import MeetupApiError
+from concurrent.futures import ThreadPoolExecutor
+import logging
+import threading
+import pytest
+
+
+def make_meetup2xibo(mocker, executor):
+    """Return a Meetup to Xibo converter with mock collaborators."""
+    retriever = mocker.Mock()
+    retriever.retrieve_events_json.return_value = "events"
+    retriever.retrieve_cancelled_events_json.return_value = "cancelled"
+    retriever.all_not_modified.return_value = False
+    converter = mocker.Mock()
+    converter.convert_meetup_events.side_effect = lambda j: [j]
+    converter.convert_cancelled_meetup_events.side_effect = lambda j: [j]
+    oauth2_session_starter = mocker.Mock()
+    oauth2_session_starter.start_session.return_value = "session"
+    return Meetup2Xibo(
+        retriever, mocker.Mock(), converter, mocker.Mock(),
+        oauth2_session_starter, mocker.Mock(), mocker.Mock(), executor,
+        lambda start, is_usable: start(), mocker.Mock())
+
+def wait_then_return(barrier, value):
+    """Return a function that waits at a barrier and then returns a
+    value."""
+    def wait_then():
+        barrier.wait()
+        return value
+    return wait_then
+
+def test_run(mocker):
+    """Test converting Meetup events and updating Xibo."""
+    meetup2xibo = make_meetup2xibo(mocker, SerialExecutor())
+    meetup2xibo.run()
+    meetup2xibo.enter_xibo_session_scope.assert_called_once_with(
+        XiboSessionScope(["events"], ["cancelled"], "session"))
+    meetup2xibo.conflict_analyzer.analyze_conflicts.assert_called_once_with(
+        ["events"])
+    meetup2xibo.event_suppressor.log_all_ids.assert_called_once_with()
+
+def test_run_shuts_down_executors(mocker):
+    """Test shutting down the run's executors even when the run fails."""
+    meetup2xibo = make_meetup2xibo(mocker, SerialExecutor())
+    meetup2xibo.shutdown_executors = mocker.Mock()
+    meetup2xibo.conflict_analyzer.analyze_conflicts.side_effect = \
+        RuntimeError("Oops")
+    with pytest.raises(RuntimeError):
+        meetup2xibo.run()
+    meetup2xibo.shutdown_executors.assert_called_once_with()
+
+def test_run_not_modified(mocker, caplog):
+    """Test skipping the update when Meetup events were not modified."""
+    caplog.set_level(logging.INFO)
+    meetup2xibo = make_meetup2xibo(mocker, SerialExecutor())
+    meetup2xibo.meetup_events_retriever.all_not_modified.return_value = True
+    meetup2xibo.run()
+    meetup2xibo.enter_xibo_session_scope.assert_not_called()
+    meetup2xibo.conflict_analyzer.analyze_conflicts.assert_not_called()
+    assert caplog.messages == ["No changes: Meetup events not modified"]
+
+def test_run_overlaps_requests(mocker):
+    """Test retrieving Meetup events while starting a Xibo session."""
+    barrier = threading.Barrier(3, timeout=5)
+    meetup2xibo = make_meetup2xibo(mocker, ThreadPoolExecutor(3))
+    retriever = meetup2xibo.meetup_events_retriever
+    retriever.retrieve_events_json.side_effect = \
+        wait_then_return(barrier, "events")
+    retriever.retrieve_cancelled_events_json.side_effect = \
+        wait_then_return(barrier, "cancelled")
+    meetup2xibo.site_cert_assurer.assure_site_cert.side_effect = barrier.wait
+    meetup2xibo.run()
+    meetup2xibo.enter_xibo_session_scope.assert_called_once_with(
+        XiboSessionScope(["events"], ["cancelled"], "session"))
+
+def test_run_raises_first_error(mocker):
+    """Test raising the Meetup error before a later Xibo session error."""
+    meetup2xibo = make_meetup2xibo(mocker, ThreadPoolExecutor(3))
+    meetup2xibo.meetup_events_retriever.retrieve_events_json.side_effect = \
+        MeetupApiError("Meetup failed")
+    meetup2xibo.oauth2_session_starter.start_session.side_effect = \
+        RuntimeError("Xibo failed")
+    with pytest.raises(MeetupApiError):
+        meetup2xibo.run()
+    meetup2xibo.oauth2_session_starter.start_session.assert_called_once_with()
+    meetup2xibo.enter_xibo_session_scope.assert_not_called()
+
+def test_run_serial_connects_after_converting(mocker):
+    """Test starting the Xibo session after converting the Meetup events
+    when start-up requests run serially."""
+    steps = []
+    meetup2xibo = make_meetup2xibo(mocker, SerialExecutor())
+    meetup2xibo.event_list_converter.convert_meetup_events.side_effect = \
+        lambda j: steps.append("convert")
+    meetup2xibo.site_cert_assurer.assure_site_cert.side_effect = \
+        lambda: steps.append("cert")
+    meetup2xibo.run()
+    assert steps == ["convert", "cert"]
+
+def test_run_serial_meetup_error_skips_xibo(mocker):
+    """Test raising a Meetup error without starting a Xibo session when
+    start-up requests run serially."""
+    meetup2xibo = make_meetup2xibo(mocker, SerialExecutor())
+    meetup2xibo.meetup_events_retriever.retrieve_events_json.side_effect = \
+        MeetupApiError("Meetup failed")
+    with pytest.raises(MeetupApiError):
+        meetup2xibo.run()
+    meetup2xibo.site_cert_assurer.assure_site_cert.assert_not_called()
+    meetup2xibo.oauth2_session_starter.start_session.assert_not_called()
+
+def test_run_meetup_error_before_xibo_result(mocker):
+    """Test raising a Meetup error after a concurrent Xibo session starts
+    successfully, without converting events or updating Xibo."""
+    meetup_failed = threading.Event()
+    def fail_meetup():
+        meetup_failed.set()
+        raise MeetupApiError("Meetup failed")
+    meetup2xibo = make_meetup2xibo(mocker, ThreadPoolExecutor(3))
+    meetup2xibo.meetup_events_retriever.retrieve_events_json.side_effect = \
+        fail_meetup
+    meetup2xibo.site_cert_assurer.assure_site_cert.side_effect = \
+        lambda: meetup_failed.wait(5)
+    with pytest.raises(MeetupApiError):
+        meetup2xibo.run()
+    meetup2xibo.oauth2_session_starter.start_session.assert_called_once_with()
+    meetup2xibo.event_list_converter.convert_meetup_events.assert_not_called()
+    meetup2xibo.enter_xibo_session_scope.assert_not_called()
+
+def test_run_concurrent_xibo_error_after_converting(mocker):
+    """Test raising a concurrent Xibo session error after converting the
+    Meetup events, as when requests run serially."""
+    meetup2xibo = make_meetup2xibo(mocker, ThreadPoolExecutor(3))
+    meetup2xibo.oauth2_session_starter.start_session.side_effect = \
+        RuntimeError("Xibo failed")
+    with pytest.raises(RuntimeError):
+        meetup2xibo.run()
+    meetup2xibo.event_list_converter.convert_meetup_events.assert_called_once_with(
+        "events")
+    meetup2xibo.enter_xibo_session_scope.assert_not_called()
+
+
+# vim: tabstop=8 expandtab shiftwidth=4 softtabstop=4 autoindent
@@ -1,13 +1,18 @@
 """Tests for Meetup API"""
 
 from meetup2xibo.updater.meetup_api import MeetupEventsRetriever
+from meetup2xibo.updater.http_response_cache import HttpResponseCache
+from meetup2xibo.updater.json_file_store import NullJsonFileStore
 from datetime import datetime
+import requests
 import os
 import json
 import pytest
 
 
 MEETUP_EVENTS_WANTED = 199
+SAMPLE_URL = "https://api.meetup.com/foo_name/events"
+SAMPLE_JSON = [{"id": "123"}]
 
 
 @pytest.fixture()
@@ -15,7 +20,21 @@ def meetup_event_retriever():
     """Return a Meetup events retriever configured to connect to Meetup.com."""
     group_name = os.getenv("MEETUP_GROUP_URL_NAME")
     last_time = os.getenv("NEAR_FUTURE_DATE")
-    return MeetupEventsRetriever(group_name, MEETUP_EVENTS_WANTED, last_time)
+    return MeetupEventsRetriever(requests.Session(), group_name, MEETUP_EVENTS_WANTED, last_time,
+            null_response_cache())
+
+def null_response_cache():
+    """Return a response cache that never caches."""
+    return HttpResponseCache(NullJsonFileStore(), 3600)
+
+def fake_response(mocker, status_code):
+    """Return a fake web response with a status code."""
+    response = mocker.Mock(
+            status_code = status_code,
+            headers = {"ETag": '"abc"'},
+            ok = status_code < 400)
+    response.json.return_value = SAMPLE_JSON
+    return response
 
 def save_json(the_json, path):
     """Save JSON to a file."""
@@ -25,18 +44,74 @@ def save_json(the_json, path):
 
 def test_build_url():
     """Test building a URL."""
-    retriever = MeetupEventsRetriever("foo_name", MEETUP_EVENTS_WANTED, None)
+    retriever = MeetupEventsRetriever(None, "foo_name", MEETUP_EVENTS_WANTED, None,
+            null_response_cache())
     assert retriever.build_url() == "https://api.meetup.com/foo_name/events"
 
 def test_request_params():
     """Test building a request parameter dictionary."""
-    retriever = MeetupEventsRetriever("foo_name", MEETUP_EVENTS_WANTED, None)
+    retriever = MeetupEventsRetriever(None, "foo_name", MEETUP_EVENTS_WANTED, None,
+            null_response_cache())
     expected_params = {
             "page": MEETUP_EVENTS_WANTED,
             "scroll": "recent_past"
             }
     assert retriever.request_params() == expected_params
 
+def test_retrieve_events_json_modified(mocker):
+    """Test retrieving and caching modified events."""
+    session = mocker.Mock()
+    session.get.return_value = fake_response(mocker, 200)
+    response_cache = mocker.Mock(wraps = null_response_cache())
+    retriever = MeetupEventsRetriever(session, "foo_name",
+            MEETUP_EVENTS_WANTED, None, response_cache)
+    assert retriever.retrieve_events_json() == SAMPLE_JSON
+    assert not retriever.all_not_modified()
+    response_cache.save_response.assert_called_once_with(
+            SAMPLE_URL + " status=", retriever.request_params(),
+            session.get.return_value)
+
+def test_retrieve_events_json_not_modified(mocker):
+    """Test retrieving cached events when Meetup reports them unmodified."""
+    session = mocker.Mock()
+    session.get.return_value = fake_response(mocker, 304)
+    response_cache = mocker.Mock(wraps = null_response_cache())
+    response_cache.conditional_headers.return_value = {"If-None-Match": "x"}
+    response_cache.cached_json.return_value = SAMPLE_JSON
+    retriever = MeetupEventsRetriever(session, "foo_name",
+            MEETUP_EVENTS_WANTED, None, response_cache)
+    assert retriever.retrieve_events_json() == SAMPLE_JSON
+    assert retriever.all_not_modified()
+    session.get.assert_called_once_with(SAMPLE_URL,
+            params = retriever.request_params(),
+            headers = {"If-None-Match": "x"})
+    response_cache.save_response.assert_not_called()
+
+def test_all_not_modified_requires_all(mocker):
+    """Test that one modified event list means not all were unmodified."""
+    session = mocker.Mock()
+    session.get.side_effect = [
+            fake_response(mocker, 304), fake_response(mocker, 200)]
+    response_cache = mocker.Mock(wraps = null_response_cache())
+    response_cache.cached_json.return_value = SAMPLE_JSON
+    retriever = MeetupEventsRetriever(session, "foo_name",
+            MEETUP_EVENTS_WANTED, None, response_cache)
+    retriever.retrieve_events_json()
+    retriever.retrieve_cancelled_events_json()
+    assert not retriever.all_not_modified()
+
+def test_all_not_modified_before_retrieval():
+    """Test that nothing is unmodified before any retrieval."""
+    retriever = MeetupEventsRetriever(None, "foo_name", MEETUP_EVENTS_WANTED,
+            None, null_response_cache())
+    assert not retriever.all_not_modified()
+
+def test_cache_key():
+    """Test distinguishing cached event lists by URL and status."""
+    params = {"status": "cancelled", "no_later_than": "2020-01-01T00:00:00"}
+    assert MeetupEventsRetriever.cache_key(SAMPLE_URL, params) \
+            == SAMPLE_URL + " status=cancelled"
+
 def test_events_response(module_file_path, meetup_event_retriever):
     """Save response from an events request to Meetup."""
     response_json = meetup_event_retriever.retrieve_events_json()
@@ -2,6 +2,12 @@
 
 from meetup2xibo.updater.oauth2_session_starter import Oauth2SessionStarter, Oauth2SessionStarterError
 from meetup2xibo.updater.site_cert_assurer import assure_site_cert
+from meetup2xibo.updater.http_session_factory import HttpSessionFactory
+from meetup2xibo.updater.oauth2_token_cache import Oauth2TokenCache
+from meetup2xibo.updater.json_file_store import JsonFileStore, NullJsonFileStore
+from requests.adapters import BaseAdapter
+from requests.models import Response
+import time
 from requests_oauthlib import OAuth2Session
 from oauthlib.oauth2 import MissingTokenError
 import os
@@ -15,15 +21,62 @@ def assure_self_signed_cert():
     if site_ca_path and xibo_url:
         assure_site_cert(site_ca_path, xibo_url)
 
+def http_session_factory():
+    """Return an HTTP session factory."""
+    return HttpSessionFactory("a_user_agent", 10, 3, 60)
+
+def null_token_cache():
+    """Return a token cache that caches nothing."""
+    return Oauth2TokenCache(NullJsonFileStore(), "a_client_id", "a_token_url", 300)
+
+class FakeAdapter(BaseAdapter):
+
+    """Responds to requests with a list of HTTP status codes."""
+
+    def __init__(self, status_codes):
+        """Initialize with a list of status codes for successive responses."""
+        super().__init__()
+        self.status_codes = list(status_codes)
+        self.authorizations = []
+
+    def send(self, request, **kwargs):
+        """Return the next response, noting the request authorization."""
+        self.authorizations.append(request.headers.get("Authorization"))
+        response = Response()
+        response.status_code = self.status_codes.pop(0)
+        response.request = request
+        response._content = b""
+        return response
+
+    def close(self):
+        pass
+
+def sample_token(access_token):
+    """Return a sample token dictionary."""
+    return {
+        "access_token": access_token,
+        "token_type": "Bearer",
+        "expires_in": 3600,
+        "expires_at": time.time() + 3600}
+
 def test_create_session():
     """Test that an OAuth2 session is created."""
-    starter = Oauth2SessionStarter("a_client_id", "a_client_secret", "a_token_url", "a_user_agent")
+    starter = Oauth2SessionStarter("a_client_id", "a_client_secret", "a_token_url", "a_user_agent", http_session_factory(), null_token_cache())
     session = starter.create_session()
     assert isinstance(session, OAuth2Session)
 
+def test_create_session_pooled():
+    """Test that an OAuth2 session shares pooled connections to the token
+    URL's host."""
+    factory = http_session_factory()
+    starter = Oauth2SessionStarter("a_client_id", "a_client_secret", "https://example.com/token", "a_user_agent", factory, null_token_cache())
+    session = starter.create_session()
+    pooled_session = factory.session_for("https://example.com/")
+    assert session.get_adapter("https://example.com/api") is pooled_session.get_adapter("https://example.com/api")
+
 def test_set_user_agent():
     """Test that the user agent header is set."""
-    starter = Oauth2SessionStarter("a_client_id", "a_client_secret", "a_token_url", "a_user_agent")
+    starter = Oauth2SessionStarter("a_client_id", "a_client_secret", "a_token_url", "a_user_agent", http_session_factory(), null_token_cache())
     session = starter.create_session()
     starter.set_user_agent(session)
     assert session.headers["user-agent"] == "a_user_agent"
@@ -31,7 +84,7 @@ def test_set_user_agent():
 def test_set_user_agent_none():
     """Test that the user agent header is set to something
     even if the OAuth2 session starter user agent is None."""
-    starter = Oauth2SessionStarter("a_client_id", "a_client_secret", "a_token_url", None)
+    starter = Oauth2SessionStarter("a_client_id", "a_client_secret", "a_token_url", None, http_session_factory(), null_token_cache())
     session = starter.create_session()
     starter.set_user_agent(session)
     assert session.headers["user-agent"] is not None
@@ -39,7 +92,7 @@ def test_set_user_agent_none():
 def test_authorize_session(mocker):
     """Test that a token is fetched to authorize a session."""
     mock_session = mocker.Mock()
-    starter = Oauth2SessionStarter("a_client_id", "a_client_secret", "a_token_url", "a_user_agent")
+    starter = Oauth2SessionStarter("a_client_id", "a_client_secret", "a_token_url", "a_user_agent", http_session_factory(), null_token_cache())
     starter.authorize_session(mock_session)
     mock_session.assert_not_called()
     mock_session.fetch_token.assert_called_once_with(
@@ -51,13 +104,79 @@ def test_authorize_session_no_token_error(mocker):
     """Test handling a missing token error when trying to authorize a session.."""
     mock_session = mocker.Mock()
     mock_session.fetch_token = mocker.Mock(side_effect=MissingTokenError("Missing access token parameter"))
-    starter = Oauth2SessionStarter("a_client_id", "a_client_secret", "a_token_url", "a_user_agent")
+    starter = Oauth2SessionStarter("a_client_id", "a_client_secret", "a_token_url", "a_user_agent", http_session_factory(), null_token_cache())
     expected_message = r"Cannot start OAuth2 session. " \
             r"URL=a_token_url " \
             r"problem=\(missing_token\) Missing access token parameter"
     with pytest.raises(Oauth2SessionStarterError, match=expected_message):
         starter.authorize_session(mock_session)
 
+def test_authorize_session_saves_token(tmpdir, mocker):
+    """Test that a fetched token is saved in the token cache."""
+    token_cache = Oauth2TokenCache(JsonFileStore(str(tmpdir.join("tokens.json"))), "a_client_id", "a_token_url", 300)
+    token = sample_token("abc")
+    mock_session = mocker.Mock()
+    mock_session.fetch_token = mocker.Mock(return_value=token)
+    starter = Oauth2SessionStarter("a_client_id", "a_client_secret", "a_token_url", "a_user_agent", http_session_factory(), token_cache)
+    starter.authorize_session(mock_session)
+    assert token_cache.load_token() == token
+
+def test_authorize_session_from_cache(mocker):
+    """Test that a cached token authorizes a session without fetching a new
+    token."""
+    token = sample_token("abc")
+    token_cache = mocker.Mock()
+    token_cache.load_token = mocker.Mock(return_value=token)
+    starter = Oauth2SessionStarter("a_client_id", "a_client_secret", "a_token_url", "a_user_agent", http_session_factory(), token_cache)
+    session = starter.create_session()
+    session.fetch_token = mocker.Mock()
+    starter.authorize_session_from_cache(session)
+    session.fetch_token.assert_not_called()
+    assert session.access_token == "abc"
+
+def test_has_usable_token(mocker):
+    """Test checking whether a session's token will expire soon."""
+    mocker.patch("meetup2xibo.updater.oauth2_token_cache.time.time", return_value = 1000.0)
+    starter = Oauth2SessionStarter("a_client_id", "a_client_secret", "a_token_url", "a_user_agent", http_session_factory(), null_token_cache())
+    session = starter.create_session()
+    session.token = {"access_token": "abc", "token_type": "Bearer", "expires_at": 1400.0}
+    assert starter.has_usable_token(session)
+    session.token = {"access_token": "abc", "token_type": "Bearer", "expires_at": 1200.0}
+    assert not starter.has_usable_token(session)
+
+def test_reauthorize_when_unauthorized(mocker):
+    """Test fetching a new token and resending a request rejected as
+    unauthorized."""
+    starter = Oauth2SessionStarter("a_client_id", "a_client_secret", "https://example.com/token", "a_user_agent", http_session_factory(), null_token_cache())
+    session = starter.create_session()
+    session.token = sample_token("old")
+    def fetch_token(**kwargs):
+        session.token = sample_token("new")
+        return session.token
+    session.fetch_token = mocker.Mock(side_effect=fetch_token)
+    adapter = FakeAdapter([401, 200])
+    session.mount("https://example.com/", adapter)
+    starter.reauthorize_when_unauthorized(session)
+    response = session.get("https://example.com/api/about")
+    assert response.status_code == 200
+    assert adapter.authorizations == ["Bearer old", "Bearer new"]
+    session.fetch_token.assert_called_once()
+
+def test_reauthorize_only_once(mocker):
+    """Test returning a repeated unauthorized response without looping."""
+    starter = Oauth2SessionStarter("a_client_id", "a_client_secret", "https://example.com/token", "a_user_agent", http_session_factory(), null_token_cache())
+    session = starter.create_session()
+    session.token = sample_token("old")
+    def fetch_token(**kwargs):
+        session.token = sample_token("new")
+        return session.token
+    session.fetch_token = mocker.Mock(side_effect=fetch_token)
+    session.mount("https://example.com/", FakeAdapter([401, 401]))
+    starter.reauthorize_when_unauthorized(session)
+    response = session.get("https://example.com/api/about")
+    assert response.status_code == 401
+    session.fetch_token.assert_called_once()
+
 @pytest.mark.skipif(not os.getenv("XIBO_TOKEN_URL"),
             reason = "environment variable XIBO_TOKEN_URL needed to test live session")
 @pytest.mark.skipif(not os.getenv("XIBO_CLIENT_ID"),
@@ -70,7 +189,7 @@ def test_start_session():
     xibo_token_url = os.getenv("XIBO_TOKEN_URL")
     xibo_client_id = os.getenv("XIBO_CLIENT_ID")
     xibo_client_secret = os.getenv("XIBO_CLIENT_SECRET")
-    starter = Oauth2SessionStarter(xibo_client_id, xibo_client_secret, xibo_token_url, "test_start_session")
+    starter = Oauth2SessionStarter(xibo_client_id, xibo_client_secret, xibo_token_url, "test_start_session", http_session_factory(), null_token_cache())
     session = starter.start_session()
     assert isinstance(session, OAuth2Session)
 
@@ -0,0 +1,47 @@
+"""Test caching OAuth2 access tokens."""
+
+from meetup2xibo.updater.oauth2_token_cache import Oauth2TokenCache
+from meetup2xibo.updater.json_file_store import JsonFileStore
+import time
+import pytest
+
+
+@pytest.fixture
+def json_file_store(tmpdir):
+    """Return a JSON file store in a temporary directory."""
+    return JsonFileStore(str(tmpdir.join("tokens.json")))
+
+def make_token(expires_in):
+    """Return a token expiring some seconds from now."""
+    return {"access_token": "abc", "expires_at": time.time() + expires_in}
+
+def test_load_empty(json_file_store):
+    """Test loading no token from an empty cache."""
+    cache = Oauth2TokenCache(json_file_store, "id1", "https://a/token", 300)
+    assert cache.load_token() is None
+
+def test_save_and_load(json_file_store):
+    """Test reloading a saved token."""
+    cache = Oauth2TokenCache(json_file_store, "id1", "https://a/token", 300)
+    token = make_token(3600)
+    cache.save_token(token)
+    assert cache.load_token() == token
+
+def test_load_expiring(json_file_store):
+    """Test ignoring a token expiring within the margin."""
+    cache = Oauth2TokenCache(json_file_store, "id1", "https://a/token", 300)
+    cache.save_token(make_token(200))
+    assert cache.load_token() is None
+
+def test_keyed_by_client_and_url(json_file_store):
+    """Test keeping tokens separate for different clients and URLs."""
+    cache1 = Oauth2TokenCache(json_file_store, "id1", "https://a/token", 300)
+    cache2 = Oauth2TokenCache(json_file_store, "id2", "https://a/token", 300)
+    cache3 = Oauth2TokenCache(json_file_store, "id1", "https://b/token", 300)
+    token = make_token(3600)
+    cache1.save_token(token)
+    assert cache2.load_token() is None
+    assert cache3.load_token() is None
+    assert cache1.load_token() == token
+
+# vim: tabstop=8 expandtab shiftwidth=4 softtabstop=4 autoindent
@@ -0,0 +1,117 @@
+"""Test timing the phases of a run and HTTP requests."""
+
+from meetup2xibo.updater.phase_timer import PhaseTimer, NullPhaseTimer, \
+    timings_text, latency_text
+from meetup2xibo.updater.json_file_store import NullJsonFileStore
+import logging
+import pytest
+
+
+class FakeClock:
+
+    """A clock that advances a fixed number of seconds each reading."""
+
+    def __init__(self, step = 0.5):
+        """Initialize with the seconds to advance each reading."""
+        self.step = step
+        self.seconds = 0.0
+
+    def __call__(self):
+        """Return the current seconds and advance."""
+        seconds = self.seconds
+        self.seconds += self.step
+        return seconds
+
+
+@pytest.fixture
+def json_file_store(mocker):
+    """Return a mock JSON file store."""
+    return mocker.Mock()
+
+
+@pytest.fixture
+def phase_timer(json_file_store):
+    """Return a phase timer with a fake clock."""
+    return PhaseTimer(json_file_store, FakeClock())
+
+
+def test_phase_accumulates(phase_timer):
+    """Test that timing a phase twice adds the times."""
+    with phase_timer.phase("convert"):
+        pass
+    with phase_timer.phase("convert"):
+        pass
+    assert phase_timer.phase_seconds == {"convert": 1.0}
+
+
+def test_phase_timed_despite_exception(phase_timer):
+    """Test timing a phase that raises an exception."""
+    with pytest.raises(ValueError):
+        with phase_timer.phase("retrieve"):
+            raise ValueError()
+    assert phase_timer.phase_seconds == {"retrieve": 0.5}
+
+
+def test_request_appends(phase_timer):
+    """Test that timing requests lists each latency."""
+    with phase_timer.request("xibo_get"):
+        pass
+    with phase_timer.request("xibo_get"):
+        pass
+    assert phase_timer.request_seconds == {"xibo_get": [0.5, 0.5]}
+
+
+def test_report_logs_and_saves(phase_timer, json_file_store, caplog):
+    """Test reporting logs one line, saves the timings, and forgets
+    them."""
+    with phase_timer.phase("run"):
+        with phase_timer.request("meetup_get"):
+            pass
+    caplog.set_level(logging.INFO, logger = "PhaseTimer")
+    phase_timer.report()
+    assert caplog.messages == ["Timings: run=1.500 meetup_get=1/0.500/0.500/0.500/0.500"]
+    json_file_store.save.assert_called_once_with({
+        "phases": {"run": 1.5},
+        "requests": {"meetup_get": [0.5]},
+        })
+    assert phase_timer.phase_seconds == {}
+    assert phase_timer.request_seconds == {}
+
+
+def test_report_with_null_json_file_store(caplog):
+    """Test reporting without saving the timings."""
+    phase_timer = PhaseTimer(NullJsonFileStore(), FakeClock())
+    caplog.set_level(logging.INFO, logger = "PhaseTimer")
+    phase_timer.report()
+    assert caplog.messages == ["Timings: "]
+
+
+def test_null_phase_timer():
+    """Test that a null phase timer runs its phases and requests."""
+    phase_timer = NullPhaseTimer()
+    steps = []
+    with phase_timer.phase("run"):
+        with phase_timer.request("xibo_put"):
+            steps.append("put")
+    phase_timer.report()
+    assert steps == ["put"]
+
+
+def test_timings_text_order():
+    """Test listing phases before requests in the order timed."""
+    phase_seconds = {"retrieve": 2.0, "convert": 0.25}
+    request_seconds = {"xibo_get": [0.1, 0.3, 0.2], "xibo_post": [1.0]}
+    assert timings_text(phase_seconds, request_seconds) == \
+        "retrieve=2.000 convert=0.250 " \
+        "xibo_get=3/0.200/0.300/0.300/0.300 " \
+        "xibo_post=1/1.000/1.000/1.000/1.000"
+
+
+def test_latency_text_percentiles():
+    """Test listing nearest rank percentiles of a hundred latencies."""
+    latencies = [value / 1000 for value in range(100, 0, -1)]
+    assert latency_text("xibo_get", latencies) == \
+        "xibo_get=100/0.050/0.090/0.099/0.100"
+
+
+# vim: tabstop=8 expandtab shiftwidth=4 softtabstop=4 autoindent
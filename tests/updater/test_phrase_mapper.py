@@ -99,5 +99,31 @@ def test_is_valid_match_no(match_end):
     phrase_mapping = phrase_mapper.PhraseMapping("xx", 2)
     match = (match_end, phrase_mapping)
     assert not phrase_mapper.is_valid_match(match, SAMPLE_TEXT)
+def test_setup_from_empty_cache(mocker, sample_phrase_mapper):
+    """Test building and caching an automaton when none is cached."""
+    automaton_cache = mocker.Mock()
+    automaton_cache.load.return_value = None
+    mapper = sample_phrase_mapper.setup_from_cache(automaton_cache)
+    automaton_cache.save.assert_called_once_with(PHRASES, mapper.automaton)
+    assert mapper.map_phrases("Rm A") == ["Room A"]
+
+def test_setup_from_cache(mocker, setup_phrase_mapper):
+    """Test using a cached automaton."""
+    automaton_cache = mocker.Mock()
+    automaton_cache.load.return_value = setup_phrase_mapper.automaton
+    mapper = phrase_mapper.PhraseMapper(ahocorasick.Automaton(), PHRASES)
+    mapper.setup_from_cache(automaton_cache)
+    assert mapper.automaton is setup_phrase_mapper.automaton
+    automaton_cache.save.assert_not_called()
+def test_tiered_map_phrases_by_tier():
+    """Test mapping phrases in separate tiers with one automaton."""
+    tiers = [PHRASES, [("Rm A", "First Floor"), ("Lobby", "Lobby")]]
+    mapper = phrase_mapper.TieredPhraseMapper(ahocorasick.Automaton(), tiers)
+    mapper.setup()
+    assert mapper.map_phrases_by_tier("Rm A and the lobby") == [
+        ["Room A"], ["First Floor", "Lobby"]]
+    assert mapper.map_phrases("Rm A and the lobby") == ["Room A"]
+    assert mapper.map_phrases("The lobby") == ["Lobby"]
+    assert mapper.map_phrases("Nowhere") == []
 
 # vim: tabstop=8 expandtab shiftwidth=4 softtabstop=4 autoindent
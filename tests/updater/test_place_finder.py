@@ -1,9 +1,11 @@
 """Test finding places from a Meetup event."""
 
 from meetup2xibo.updater.event_converter import PartialEvent
-from meetup2xibo.updater.place_finder import PlaceFinder
-from meetup2xibo.updater.phrase_mapper import PhraseMapper
+from meetup2xibo.updater.place_finder import PlaceFinder, TieredPlaceFinder
+from meetup2xibo.updater.phrase_mapper import PhraseMapper, TieredPhraseMapper
 from ahocorasick import Automaton
+from hypothesis import given
+import hypothesis.strategies as st
 import pytest
 
 
@@ -104,5 +106,41 @@ def test_find_places(venue_name, find_us, expected_place_list, place_finder):
     place_list = place_finder.find_places(partial_event)
     assert expected_place_list == place_list
 
+@pytest.fixture(scope="module")
+def tiered_place_finder():
+    """Return a tiered place finder with the test phrases."""
+    tiered_phrase_mapper = TieredPhraseMapper(
+        Automaton(), [LOCATION_PHRASES, DEFAULT_PHRASES]).setup()
+    return TieredPlaceFinder(tiered_phrase_mapper)
+
+@pytest.mark.parametrize("venue_name,find_us,expected_places", TEST_VENUE_MAPPINGS_2)
+def test_tiered_map_from_phrase_mappers(venue_name, find_us, expected_places, tiered_place_finder):
+    """Test mapping phrases using all tiers of a tiered phrase mapper."""
+    partial_event = make_partial_event(venue_name = venue_name, find_us = find_us)
+    places = tiered_place_finder.map_from_phrase_mappers(partial_event)
+    assert places == expected_places
+
+@pytest.mark.parametrize("venue_name,find_us,expected_place_list", TEST_FIND_LOCATIONS)
+def test_tiered_find_places(venue_name, find_us, expected_place_list, tiered_place_finder):
+    """Test finding places with a tiered place finder."""
+    partial_event = make_partial_event(venue_name = venue_name, find_us = find_us)
+    place_list = tiered_place_finder.find_places(partial_event)
+    assert expected_place_list == place_list
+
+VENUE_WORDS = ["Nova", "Labs", "TBD", "Classroom", "A", "and", "B", "A/B",
+    "Conference", "Rm", "1", "2", "Metal", "shop", "Metalshop", "(", "["]
+
+@given(
+    venue_words = st.lists(st.sampled_from(VENUE_WORDS), max_size = 8),
+    find_us_words = st.lists(st.sampled_from(VENUE_WORDS), max_size = 8))
+def test_tiered_matches_phrase_mappers(venue_words, find_us_words,
+        phrase_mappers, tiered_place_finder):
+    """Test that the tiered place finder finds the same places as trying each
+    phrase mapper in turn."""
+    partial_event = make_partial_event(
+        venue_name = " ".join(venue_words), find_us = " ".join(find_us_words))
+    expected_place_list = PlaceFinder(phrase_mappers).find_places(partial_event)
+    assert tiered_place_finder.find_places(partial_event) == expected_place_list
+
 
 # vim: tabstop=8 expandtab shiftwidth=4 softtabstop=4 autoindent
@@ -31,6 +31,7 @@ def shops(woodshop, metalshop):
     shops = CheckedPlace("Shops")
     shops.contain(woodshop)
     shops.contain(metalshop)
+    shops.descendants = frozenset([woodshop, metalshop])
     return shops
 
 @pytest.fixture
@@ -40,8 +41,19 @@ def blacksmithing(forge, metalshop):
     blacksmithing = UncheckedPlace("Blacksmithing Area")
     blacksmithing.contain(forge)
     blacksmithing.contain(metalshop)
+    blacksmithing.descendants = frozenset([forge, metalshop])
     return blacksmithing
 
+def start_event(event, place):
+    """Start an event at a place and its descendants."""
+    for event_place in [place, *place.descendants]:
+        event_place.start_own_event(event)
+
+def end_event(event, place):
+    """End an event at a place and its descendants."""
+    for event_place in [place, *place.descendants]:
+        event_place.end_own_event(event)
+
 def log_conflicts(clock, places):
     """Log conflicts at a clock time in a list of places."""
     for place in places:
@@ -49,13 +61,13 @@ def log_conflicts(clock, places):
 
 def overlap_events(event1, event2, place1, place2, log_places):
     """Overlap two events at their respective places."""
-    place1.start_event(event1)
+    start_event(event1, place1)
     log_conflicts(event1.start_time, log_places)
-    place2.start_event(event2)
+    start_event(event2, place2)
     log_conflicts(event2.start_time, log_places)
-    place1.end_event(event1)
+    end_event(event1, place1)
     log_conflicts(event1.end_time, log_places)
-    place2.end_event(event2)
+    end_event(event2, place2)
     log_conflicts(event2.end_time, log_places)
 
 def test_contains_not(woodshop, metalshop):
@@ -77,13 +89,13 @@ def test_non_overlapping_events(sample_events, woodshop, caplog):
     """Test logging nothing when events do not overlap."""
     caplog.set_level(logging.INFO)
     event1, event2 = sample_events.make_non_overlapping_events()
-    woodshop.start_event(event1)
+    woodshop.start_own_event(event1)
     woodshop.log_conflicts(event1.start_time)
-    woodshop.end_event(event1)
+    woodshop.end_own_event(event1)
     woodshop.log_conflicts(event1.end_time)
-    woodshop.start_event(event2)
+    woodshop.start_own_event(event2)
     woodshop.log_conflicts(event2.start_time)
-    woodshop.end_event(event2)
+    woodshop.end_own_event(event2)
     woodshop.log_conflicts(event2.end_time)
     assert caplog.text == ""
 
@@ -91,12 +103,12 @@ def test_consecutive_events(sample_events, woodshop, caplog):
     """Test logging nothing when one event follows another."""
     caplog.set_level(logging.INFO)
     event1, event2 = sample_events.make_consecutive_events()
-    woodshop.start_event(event1)
+    woodshop.start_own_event(event1)
     woodshop.log_conflicts(event1.start_time)
-    woodshop.start_event(event2)
-    woodshop.end_event(event1)
+    woodshop.start_own_event(event2)
+    woodshop.end_own_event(event1)
     woodshop.log_conflicts(event1.end_time)
-    woodshop.end_event(event2)
+    woodshop.end_own_event(event2)
     woodshop.log_conflicts(event2.end_time)
     assert caplog.text == ""
 
@@ -118,13 +130,13 @@ def test_straddling_events(sample_events, woodshop, caplog):
     """Test logging when one event straddles another."""
     caplog.set_level(logging.INFO)
     event1, event2 = sample_events.make_straddling_events()
-    woodshop.start_event(event1)
+    woodshop.start_own_event(event1)
     woodshop.log_conflicts(event1.start_time)
-    woodshop.start_event(event2)
+    woodshop.start_own_event(event2)
     woodshop.log_conflicts(event2.start_time)
-    woodshop.end_event(event2)
+    woodshop.end_own_event(event2)
     woodshop.log_conflicts(event2.end_time)
-    woodshop.end_event(event1)
+    woodshop.end_own_event(event1)
     woodshop.log_conflicts(event1.end_time)
     assert len(caplog.messages) == 1
     message = caplog.messages[0]
@@ -139,12 +151,12 @@ def test_same_start_events(sample_events, woodshop, caplog):
     """Test logging when events start at the same time."""
     caplog.set_level(logging.INFO)
     event1, event2 = sample_events.make_same_start_events()
-    woodshop.start_event(event1)
-    woodshop.start_event(event2)
+    woodshop.start_own_event(event1)
+    woodshop.start_own_event(event2)
     woodshop.log_conflicts(event2.start_time)
-    woodshop.end_event(event1)
+    woodshop.end_own_event(event1)
     woodshop.log_conflicts(event1.end_time)
-    woodshop.end_event(event2)
+    woodshop.end_own_event(event2)
     woodshop.log_conflicts(event2.end_time)
     assert len(caplog.messages) == 1
     message = caplog.messages[0]
@@ -159,12 +171,12 @@ def test_same_end_events(sample_events, woodshop, caplog):
     """Test logging when events end at the same time."""
     caplog.set_level(logging.INFO)
     event1, event2 = sample_events.make_same_end_events()
-    woodshop.start_event(event1)
+    woodshop.start_own_event(event1)
     woodshop.log_conflicts(event1.start_time)
-    woodshop.start_event(event2)
+    woodshop.start_own_event(event2)
     woodshop.log_conflicts(event2.start_time)
-    woodshop.end_event(event1)
-    woodshop.end_event(event2)
+    woodshop.end_own_event(event1)
+    woodshop.end_own_event(event2)
     woodshop.log_conflicts(event2.end_time)
     assert len(caplog.messages) == 1
     message = caplog.messages[0]
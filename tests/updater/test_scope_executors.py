@@ -0,0 +1,30 @@
+"""Test sharing executors within a scope and shutting them down."""
+
+from meetup2xibo.updater.scope_executors import ScopeExecutors
+
+
+def test_get_once_per_name(mocker):
+    """Test that each name's provider is invoked only once."""
+    provider = mocker.Mock(side_effect = [mocker.Mock(), mocker.Mock()])
+    executors = ScopeExecutors()
+    first = executors.get("pages", provider)
+    assert executors.get("pages", provider) is first
+    assert executors.get("startup", provider) is not first
+    assert provider.call_count == 2
+
+
+def test_shutdown_all(mocker):
+    """Test shutting down every executor and forgetting them."""
+    pages = mocker.Mock()
+    startup = mocker.Mock()
+    executors = ScopeExecutors()
+    executors.get("pages", lambda: pages)
+    executors.get("startup", lambda: startup)
+    executors.shutdown()
+    pages.shutdown.assert_called_once_with()
+    startup.shutdown.assert_called_once_with()
+    executors.shutdown()
+    pages.shutdown.assert_called_once_with()
+
+
+# vim: tabstop=8 expandtab shiftwidth=4 softtabstop=4 autoindent
@@ -0,0 +1,27 @@
+"""Test the serial executor."""
+
+from meetup2xibo.updater.serial_executor import SerialExecutor
+import pytest
+
+
+def test_submit_result():
+    """Test running a task immediately and returning its result."""
+    calls = []
+    def task(x, y=0):
+        calls.append((x, y))
+        return x + y
+    future = SerialExecutor().submit(task, 2, y=3)
+    assert calls == [(2, 3)]
+    assert future.done()
+    assert future.result() == 5
+
+def test_submit_exception():
+    """Test holding a task's exception in the returned future."""
+    def task():
+        raise ValueError("oops")
+    future = SerialExecutor().submit(task)
+    assert future.done()
+    with pytest.raises(ValueError, match="oops"):
+        future.result()
+
+# vim: tabstop=8 expandtab shiftwidth=4 softtabstop=4 autoindent
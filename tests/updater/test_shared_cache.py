@@ -0,0 +1,46 @@
+"""Tests the shared cache."""
+
+from meetup2xibo.updater.shared_cache import SharedCache
+from concurrent.futures import ThreadPoolExecutor
+import threading
+import time
+
+
+def test_get_once_per_key(mocker):
+    """Test that the provider is invoked only once per key."""
+    provider1 = mocker.Mock(return_value = "abcd")
+    provider2 = mocker.Mock(return_value = "wxyz")
+    cache = SharedCache()
+    assert cache.get("a", provider1) == "abcd"
+    assert cache.get("a", provider2) == "abcd"
+    assert cache.get("b", provider2) == "wxyz"
+    provider1.assert_called_once_with()
+    provider2.assert_called_once_with()
+
+def test_get_again_when_unusable(mocker):
+    """Test invoking the provider again when the cached value is not
+    usable."""
+    provider = mocker.Mock(side_effect = ["old", "new"])
+    cache = SharedCache()
+    assert cache.get("a", provider, lambda value: True) == "old"
+    assert cache.get("a", provider, lambda value: value != "old") == "new"
+    assert cache.get("a", provider, lambda value: value != "old") == "new"
+    assert provider.call_count == 2
+
+def test_get_concurrently():
+    """Test that concurrent requests for a key invoke the provider once."""
+    calls = []
+
+    def provider():
+        calls.append(threading.current_thread())
+        time.sleep(0.05)
+        return "abcd"
+
+    cache = SharedCache()
+    with ThreadPoolExecutor(4) as executor:
+        futures = [executor.submit(cache.get, "a", provider) for i in range(4)]
+    assert [future.result() for future in futures] == ["abcd"] * 4
+    assert len(calls) == 1
+
+
+# vim: tabstop=8 expandtab shiftwidth=4 softtabstop=4 autoindent
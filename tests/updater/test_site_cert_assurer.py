@@ -2,6 +2,7 @@
 
 from meetup2xibo.updater.site_cert_assurer import SiteCertAssurer
 import logging
+import requests
 
 
 GOOD_SSL_URL = "https://www.google.com/"
@@ -22,6 +23,7 @@ def"""
 def test_cert_message():
     """Test the formatting of a certificate message."""
     assurer = SiteCertAssurer(
+            session = requests.Session(),
             sys_ca_path = "/sys/ca/path",
             site_ca_path = "/site/ca/path",
             site_url = "https://example.com",
@@ -37,6 +39,7 @@ def test_file_append(tmpdir, caplog):
     bar_path = tmpdir.join("bar")
     bar_path.write("def")
     assurer = SiteCertAssurer(
+            session = requests.Session(),
             sys_ca_path = str(foo_path),
             site_ca_path = str(bar_path),
             site_url = "https://example2.com",
@@ -49,6 +52,7 @@ def test_have_valid_cert_good():
     """Test checking for a valid site certificate at
     a site with a good SSL certificate."""
     assurer = SiteCertAssurer(
+            session = requests.Session(),
             sys_ca_path = None,
             site_ca_path = None,
             site_url = GOOD_SSL_URL,
@@ -59,6 +63,7 @@ def test_have_valid_cert_bad():
     """Test checking for a valid site certificate at
     a site with a bad SSL certificate."""
     assurer = SiteCertAssurer(
+            session = requests.Session(),
             sys_ca_path = None,
             site_ca_path = None,
             site_url = BAD_SSL_URL,
@@ -68,6 +73,7 @@ def test_have_valid_cert_bad():
 def test_assure_site_cert_known(mocker):
     """Test assuring a site certificate when it already is known."""
     assurer = SiteCertAssurer(
+            session = requests.Session(),
             sys_ca_path = None,
             site_ca_path = None,
             site_url = None,
@@ -80,6 +86,7 @@ def test_assure_site_cert_known(mocker):
 def test_assure_site_cert_unknown(mocker):
     """Test assuring a site certificate when it is unknown."""
     assurer = SiteCertAssurer(
+            session = requests.Session(),
             sys_ca_path = "/foo",
             site_ca_path = "/bar",
             site_url = "https://example.com",
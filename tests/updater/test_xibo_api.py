@@ -3,7 +3,9 @@
 from meetup2xibo.updater.xibo_api import XiboApi
 from meetup2xibo.updater.xibo_event import XiboEvent
 from meetup2xibo.updater.http_response_error import XiboApiError
+from meetup2xibo.updater.serial_executor import SerialExecutor
 from requests_toolbelt.utils import dump
+from concurrent.futures import ThreadPoolExecutor
 import json
 import os
 import pytest
@@ -29,6 +31,7 @@ SAMPLE_JSON_LIST_2 = json.loads("[211, 222]")
 SAMPLE_JSON_LIST_3 = json.loads("[311, 322, 333]")
 
 SAMPLE_XIBO_PAGE_LENGTH = 3
+SAMPLE_PAGE_CONCURRENCY = 2
 REAL_XIBO_PAGE_LENGTH = 50
 
 
@@ -47,20 +50,20 @@ def save_response(response, path):
 def test_bad_status(xibo_session, xibo_api_url_builder):
     """Test raising a Xibo API error for a bad HTTP response status."""
     bad_about_url = xibo_api_url_builder.about_url() + "x"
-    xibo_api = XiboApi(xibo_session, xibo_api_url_builder, SAMPLE_XIBO_PAGE_LENGTH)
+    xibo_api = XiboApi(xibo_session, xibo_api_url_builder, SAMPLE_XIBO_PAGE_LENGTH, 1, SerialExecutor())
     with pytest.raises(XiboApiError, match=r'.*HTTP status is \d+, not ok.*'):
         xibo_api.get_response(bad_about_url)
 
 @pytest.mark.skip(reason="Not authorized to use this API service")
 def test_about_response(module_file_path, xibo_session, xibo_api_url_builder):
     """Save response from an "about" request to Xibo."""
-    xibo_api = XiboApi(xibo_session, xibo_api_url_builder, SAMPLE_XIBO_PAGE_LENGTH)
+    xibo_api = XiboApi(xibo_session, xibo_api_url_builder, SAMPLE_XIBO_PAGE_LENGTH, 1, SerialExecutor())
     xibo_json = xibo_api.get_about()
     save_json(xibo_json, module_file_path)
 
 def test_get_xibo_api_version(mocker):
     """Testing getting the Xibo API version number."""
-    xibo_api = XiboApi(None, None, SAMPLE_XIBO_PAGE_LENGTH)
+    xibo_api = XiboApi(None, None, SAMPLE_XIBO_PAGE_LENGTH, 1, SerialExecutor())
     xibo_api.get_about = mocker.Mock(return_value = SAMPLE_ABOUT_JSON)
     assert xibo_api.get_xibo_api_version() == "1.8.12"
 
@@ -69,7 +72,7 @@ def test_get_datasets_by_code_response(module_file_path, xibo_session, xibo_api_
     dataset_code = os.getenv("EVENT_DATASET_CODE")
     if not dataset_code:
         pytest.skip("Define environment variable EVENT_DATASET_CODE")
-    xibo_api = XiboApi(xibo_session, xibo_api_url_builder, SAMPLE_XIBO_PAGE_LENGTH)
+    xibo_api = XiboApi(xibo_session, xibo_api_url_builder, SAMPLE_XIBO_PAGE_LENGTH, 1, SerialExecutor())
     xibo_json = xibo_api.get_datasets_by_code(dataset_code)
     save_json(xibo_json, module_file_path)
 
@@ -78,7 +81,7 @@ def test_get_dataset_column_response(module_file_path, xibo_session, xibo_api_ur
     dataset_id = os.getenv("EVENT_DATASET_ID")
     if not dataset_id:
         pytest.skip("Define environment variable EVENT_DATASET_ID")
-    xibo_api = XiboApi(xibo_session, xibo_api_url_builder, REAL_XIBO_PAGE_LENGTH)
+    xibo_api = XiboApi(xibo_session, xibo_api_url_builder, REAL_XIBO_PAGE_LENGTH, 1, SerialExecutor())
     xibo_json = xibo_api.get_dataset_column_by_id(dataset_id)
     save_json(list(xibo_json), module_file_path)
 
@@ -87,7 +90,7 @@ def test_get_response(module_file_path, xibo_session, xibo_api_url_builder):
     dataset_id = os.getenv("EVENT_DATASET_ID")
     if not dataset_id:
         pytest.skip("Define environment variable EVENT_DATASET_ID")
-    xibo_api = XiboApi(xibo_session, xibo_api_url_builder, SAMPLE_XIBO_PAGE_LENGTH)
+    xibo_api = XiboApi(xibo_session, xibo_api_url_builder, SAMPLE_XIBO_PAGE_LENGTH, 1, SerialExecutor())
     url = xibo_api_url_builder.dataset_data_url(dataset_id)
     response = xibo_api.get_response(url, start = 100, length = 7)
     save_response(response, module_file_path)
@@ -97,7 +100,7 @@ def test_get_dataset_data(module_file_path, xibo_session, xibo_api_url_builder):
     dataset_id = os.getenv("EVENT_DATASET_ID")
     if not dataset_id:
         pytest.skip("Define environment variable EVENT_DATASET_ID")
-    xibo_api = XiboApi(xibo_session, xibo_api_url_builder, REAL_XIBO_PAGE_LENGTH)
+    xibo_api = XiboApi(xibo_session, xibo_api_url_builder, REAL_XIBO_PAGE_LENGTH, 1, SerialExecutor())
     xibo_json = xibo_api.get_dataset_data_by_id(dataset_id)
     save_json(list(xibo_json), module_file_path)
 
@@ -109,7 +112,7 @@ def test_delete_row_response(module_file_path, xibo_session, xibo_api_url_builde
     dataset_id = os.getenv("EVENT_DATASET_ID")
     if not dataset_id:
         pytest.skip("Define environment variable EVENT_DATASET_ID")
-    xibo_api = XiboApi(xibo_session, xibo_api_url_builder, SAMPLE_XIBO_PAGE_LENGTH)
+    xibo_api = XiboApi(xibo_session, xibo_api_url_builder, SAMPLE_XIBO_PAGE_LENGTH, 1, SerialExecutor())
     response = xibo_api.delete_dataset_data_by_id(dataset_id, row_id)
     save_response(response, module_file_path)
 
@@ -118,7 +121,7 @@ def test_insert_dataset_data_response(module_file_path, xibo_session, xibo_api_u
     dataset_id = os.getenv("EVENT_DATASET_ID")
     if not dataset_id:
         pytest.skip("Define environment variable EVENT_DATASET_ID")
-    xibo_api = XiboApi(xibo_session, xibo_api_url_builder, SAMPLE_XIBO_PAGE_LENGTH)
+    xibo_api = XiboApi(xibo_session, xibo_api_url_builder, SAMPLE_XIBO_PAGE_LENGTH, 1, SerialExecutor())
     response = xibo_api.insert_dataset_data(dataset_id, SAMPLE_XIBO_EVENT_COLUMNS)
     save_response(response, module_file_path)
 
@@ -130,13 +133,13 @@ def test_update_dataset_data_response(module_file_path, xibo_session, xibo_api_u
     dataset_id = os.getenv("EVENT_DATASET_ID")
     if not dataset_id:
         pytest.skip("Define environment variable EVENT_DATASET_ID")
-    xibo_api = XiboApi(xibo_session, xibo_api_url_builder, SAMPLE_XIBO_PAGE_LENGTH)
+    xibo_api = XiboApi(xibo_session, xibo_api_url_builder, SAMPLE_XIBO_PAGE_LENGTH, 1, SerialExecutor())
     response = xibo_api.update_dataset_data(dataset_id, row_id, SAMPLE_XIBO_EVENT_COLUMNS)
     save_response(response, module_file_path)
 
 def test_get_paged_json_0(mocker):
     """Test getting 0 paged JSON results."""
-    xibo_api = XiboApi(None, None, SAMPLE_XIBO_PAGE_LENGTH)
+    xibo_api = XiboApi(None, None, SAMPLE_XIBO_PAGE_LENGTH, 1, SerialExecutor())
     xibo_api.get_json = mocker.Mock(return_value = SAMPLE_JSON_LIST_0)
     results = xibo_api.get_paged_json(SAMPLE_URL)
     assert list(results) == SAMPLE_JSON_LIST_0
@@ -144,7 +147,7 @@ def test_get_paged_json_0(mocker):
 
 def test_get_paged_json_1(mocker):
     """Test getting 1 paged JSON result."""
-    xibo_api = XiboApi(None, None, SAMPLE_XIBO_PAGE_LENGTH)
+    xibo_api = XiboApi(None, None, SAMPLE_XIBO_PAGE_LENGTH, 1, SerialExecutor())
     xibo_api.get_json = mocker.Mock(return_value = SAMPLE_JSON_LIST_1)
     results = xibo_api.get_paged_json(SAMPLE_URL)
     assert list(results) == SAMPLE_JSON_LIST_1
@@ -152,7 +155,7 @@ def test_get_paged_json_1(mocker):
 
 def test_get_paged_json_2(mocker):
     """Test getting 2 paged JSON results."""
-    xibo_api = XiboApi(None, None, SAMPLE_XIBO_PAGE_LENGTH)
+    xibo_api = XiboApi(None, None, SAMPLE_XIBO_PAGE_LENGTH, 1, SerialExecutor())
     xibo_api.get_json = mocker.Mock(return_value = SAMPLE_JSON_LIST_2)
     results = xibo_api.get_paged_json(SAMPLE_URL)
     assert list(results) == SAMPLE_JSON_LIST_2
@@ -165,7 +168,7 @@ def test_get_paged_json_3(mocker):
         mocker.call(SAMPLE_URL, start = 0, length = SAMPLE_XIBO_PAGE_LENGTH),
         mocker.call(SAMPLE_URL, start = SAMPLE_XIBO_PAGE_LENGTH, length = SAMPLE_XIBO_PAGE_LENGTH),
         ]
-    xibo_api = XiboApi(None, None, SAMPLE_XIBO_PAGE_LENGTH)
+    xibo_api = XiboApi(None, None, SAMPLE_XIBO_PAGE_LENGTH, 1, SerialExecutor())
     xibo_api.get_json = mocker.Mock(side_effect = return_values)
     results = xibo_api.get_paged_json(SAMPLE_URL)
     assert list(results) == SAMPLE_JSON_LIST_3
@@ -178,13 +181,89 @@ def test_get_paged_json_4(mocker):
         mocker.call(SAMPLE_URL, start = 0, length = SAMPLE_XIBO_PAGE_LENGTH),
         mocker.call(SAMPLE_URL, start = SAMPLE_XIBO_PAGE_LENGTH, length = SAMPLE_XIBO_PAGE_LENGTH),
         ]
-    xibo_api = XiboApi(None, None, SAMPLE_XIBO_PAGE_LENGTH)
+    xibo_api = XiboApi(None, None, SAMPLE_XIBO_PAGE_LENGTH, 1, SerialExecutor())
     xibo_api.get_json = mocker.Mock(side_effect = return_values)
     results = xibo_api.get_paged_json(SAMPLE_URL)
     assert list(results) == SAMPLE_JSON_LIST_3 + SAMPLE_JSON_LIST_1
     assert xibo_api.get_json.call_args_list == expected_calls
 
-    
+def fake_page_response(mocker, page_json, headers = {}):
+    """Return a fake HTTP response with a JSON page and headers."""
+    response = mocker.Mock()
+    response.json = mocker.Mock(return_value = page_json)
+    response.headers = headers
+    return response
+
+def fake_get_response(mocker, pages, headers = {}):
+    """Return a fake get_response method serving successive pages of a list
+    of pages by start record."""
+    def get_response(url, start, length):
+        index = start // length
+        page = pages[index] if index < len(pages) else []
+        return fake_page_response(mocker, page, headers)
+    return mocker.Mock(side_effect = get_response)
+
+def concurrent_xibo_api():
+    """Return a Xibo API that requests pages concurrently."""
+    return XiboApi(None, None, SAMPLE_XIBO_PAGE_LENGTH,
+        SAMPLE_PAGE_CONCURRENCY, ThreadPoolExecutor(SAMPLE_PAGE_CONCURRENCY))
+
+def test_concurrent_paged_json_one_page(mocker):
+    """Test getting one partial page concurrently."""
+    xibo_api = concurrent_xibo_api()
+    xibo_api.get_response = fake_get_response(mocker, [SAMPLE_JSON_LIST_2])
+    results = xibo_api.get_paged_json(SAMPLE_URL)
+    assert list(results) == SAMPLE_JSON_LIST_2
+    xibo_api.get_response.assert_called_once_with(SAMPLE_URL, start = 0, length = SAMPLE_XIBO_PAGE_LENGTH)
+
+def test_concurrent_paged_json_probed(mocker):
+    """Test probing for pages concurrently when the total is unknown."""
+    pages = [[1, 2, 3], [4, 5, 6], [7, 8, 9], [10, 11, 12], [13]]
+    xibo_api = concurrent_xibo_api()
+    xibo_api.get_response = fake_get_response(mocker, pages)
+    results = xibo_api.get_paged_json(SAMPLE_URL)
+    assert list(results) == list(range(1, 14))
+    starts = sorted(call[1]["start"] for call in xibo_api.get_response.call_args_list)
+    assert starts == [0, 3, 6, 9, 12]
+
+def test_concurrent_paged_json_header_total(mocker):
+    """Test prefetching pages concurrently with a total count header."""
+    pages = [[1, 2, 3], [4, 5, 6], [7, 8, 9], [10]]
+    xibo_api = concurrent_xibo_api()
+    xibo_api.get_response = fake_get_response(mocker, pages, {"X-Total-Count": "10"})
+    results = xibo_api.get_paged_json(SAMPLE_URL)
+    assert list(results) == list(range(1, 11))
+    assert xibo_api.get_response.call_count == 4
+
+def test_concurrent_paged_json_records_total(mocker):
+    """Test prefetching pages concurrently with a records total field."""
+    pages = [
+        {"recordsTotal": 7, "data": [1, 2, 3]},
+        {"recordsTotal": 7, "data": [4, 5, 6]},
+        {"recordsTotal": 7, "data": [7]},
+        ]
+    xibo_api = concurrent_xibo_api()
+    xibo_api.get_response = fake_get_response(mocker, pages)
+    results = xibo_api.get_paged_json(SAMPLE_URL)
+    assert list(results) == list(range(1, 8))
+    assert xibo_api.get_response.call_count == 3
+
+def test_count_dataset_data(mocker):
+    """Test counting dataset rows with a one row request."""
+    xibo_api = XiboApi(None, mocker.Mock(), SAMPLE_XIBO_PAGE_LENGTH, 1, SerialExecutor())
+    xibo_api.get_response = mocker.Mock(
+        return_value = fake_page_response(mocker, [1], {"X-Total-Count": "42"}))
+    assert xibo_api.count_dataset_data_by_id(7) == 42
+    xibo_api.get_response.assert_called_once_with(
+        xibo_api.xibo_api_url_builder.dataset_data_url.return_value,
+        start = 0, length = 1)
+
+def test_count_dataset_data_unknown(mocker):
+    """Test counting dataset rows when Xibo reports no total."""
+    xibo_api = XiboApi(None, mocker.Mock(), SAMPLE_XIBO_PAGE_LENGTH, 1, SerialExecutor())
+    xibo_api.get_response = mocker.Mock(
+        return_value = fake_page_response(mocker, [1]))
+    assert xibo_api.count_dataset_data_by_id(7) is None
 
 
 # vim: tabstop=8 expandtab shiftwidth=4 softtabstop=4 autoindent
@@ -3,7 +3,10 @@
 from meetup2xibo.updater.event_converter import Event
 from meetup2xibo.updater.xibo_event import XiboEvent, XiboEventColumnNameManager, XiboEventColumnIdManager
 from meetup2xibo.updater.xibo_event_crud import XiboEventCrud
+from meetup2xibo.updater.serial_executor import SerialExecutor
+from concurrent.futures import ThreadPoolExecutor
 import logging
+import threading
 import pytest
 
 
@@ -84,7 +87,14 @@ def crud(mock_xibo_api):
     """Return a XiboEventCrud with a mock Xibo API."""
     column_name_manager = XiboEventColumnNameManager(COLUMN_NAMES)
     column_id_manager = XiboEventColumnIdManager(COLUMN_IDS)
-    return XiboEventCrud(mock_xibo_api, SAMPLE_DATASET_ID, column_name_manager, column_id_manager)
+    return XiboEventCrud(mock_xibo_api, SAMPLE_DATASET_ID, column_name_manager, column_id_manager, SerialExecutor())
+
+@pytest.fixture()
+def concurrent_crud(mock_xibo_api):
+    """Return a XiboEventCrud with a mock Xibo API and a thread pool."""
+    column_name_manager = XiboEventColumnNameManager(COLUMN_NAMES)
+    column_id_manager = XiboEventColumnIdManager(COLUMN_IDS)
+    return XiboEventCrud(mock_xibo_api, SAMPLE_DATASET_ID, column_name_manager, column_id_manager, ThreadPoolExecutor(max_workers=4))
 
 def test_get_xibo_events_1(mocker, mock_xibo_api, crud):
     """Test getting one event from Xibo."""
@@ -106,6 +116,20 @@ def test_insert_meetup_event(mocker, mock_xibo_api, crud):
     mock_xibo_api.insert_dataset_data.assert_called_once_with(
         SAMPLE_DATASET_ID, SAMPLE_XIBO_EVENT_1_COLUMNS)
 
+def test_row_count_change(mocker, mock_xibo_api, crud):
+    """Test tallying the change in Xibo rows from inserts and deletes."""
+    crud.insert_meetup_event(SAMPLE_XIBO_EVENT_1)
+    crud.insert_meetup_event(SAMPLE_XIBO_EVENT_1)
+    crud.delete_xibo_event(SAMPLE_XIBO_EVENT_1)
+    crud.update_xibo_event(SAMPLE_XIBO_EVENT_1, SAMPLE_XIBO_EVENT_1)
+    assert crud.row_count_change == 1
+
+def test_changes_requested(mocker, mock_xibo_api, crud):
+    """Test noting when a change was first requested."""
+    assert not crud.changes_requested
+    crud.update_xibo_event(SAMPLE_XIBO_EVENT_1, SAMPLE_MEETUP_EVENT_1)
+    assert crud.changes_requested
+
 def test_update_xibo_event(mocker, caplog, mock_xibo_api, crud):
     """Test updating an event from Xibo."""
     caplog.set_level(logging.INFO)
@@ -114,4 +138,87 @@ def test_update_xibo_event(mocker, caplog, mock_xibo_api, crud):
     mock_xibo_api.update_dataset_data.assert_called_once_with(SAMPLE_DATASET_ID,
         SAMPLE_XIBO_EVENT_2.xibo_id, SAMPLE_XIBO_EVENT_1_COLUMNS)
 
+def test_update_xibo_event_logs(mocker, caplog, mock_xibo_api, crud):
+    """Test logging an update as soon as it completes."""
+    caplog.set_level(logging.INFO)
+    crud.update_xibo_event(SAMPLE_XIBO_EVENT_2, SAMPLE_MEETUP_EVENT_1)
+    assert caplog.messages == [
+        "Updated from {}".format(SAMPLE_XIBO_EVENT_2),
+        "Updated to {}".format(SAMPLE_MEETUP_EVENT_1)]
+
+def test_serial_error_raises_immediately(mocker, caplog, mock_xibo_api, crud):
+    """Test raising a Xibo API error from a serial executor without
+    logging."""
+    caplog.set_level(logging.INFO)
+    mock_xibo_api.insert_dataset_data = mocker.Mock(side_effect=ValueError("oops"))
+    with pytest.raises(ValueError, match="oops"):
+        crud.insert_meetup_event(SAMPLE_MEETUP_EVENT_1)
+    assert caplog.messages == []
+
+def test_concurrent_logs_in_request_order(mocker, caplog, mock_xibo_api, concurrent_crud):
+    """Test logging concurrent requests in the order they were made, even
+    when they complete out of order."""
+    caplog.set_level(logging.INFO)
+    first_may_finish = threading.Event()
+    def slow_delete(dataset_id, row_id):
+        first_may_finish.wait(5)
+    mock_xibo_api.delete_dataset_data_by_id = mocker.Mock(side_effect=slow_delete)
+    concurrent_crud.delete_xibo_event(SAMPLE_XIBO_EVENT_1)
+    concurrent_crud.insert_meetup_event(SAMPLE_MEETUP_EVENT_1)
+    concurrent_crud.update_xibo_event(SAMPLE_XIBO_EVENT_2, SAMPLE_MEETUP_EVENT_1)
+    assert caplog.messages == []
+    first_may_finish.set()
+    concurrent_crud.finish()
+    assert caplog.messages == [
+        "Deleted {}".format(SAMPLE_XIBO_EVENT_1),
+        "Inserted {}".format(SAMPLE_MEETUP_EVENT_1),
+        "Updated from {}".format(SAMPLE_XIBO_EVENT_2),
+        "Updated to {}".format(SAMPLE_MEETUP_EVENT_1)]
+
+def test_concurrent_error_raises_on_finish(mocker, caplog, mock_xibo_api, concurrent_crud):
+    """Test raising a concurrent request's error after logging earlier
+    requests."""
+    caplog.set_level(logging.INFO)
+    mock_xibo_api.insert_dataset_data = mocker.Mock(side_effect=ValueError("oops"))
+    concurrent_crud.delete_xibo_event(SAMPLE_XIBO_EVENT_1)
+    concurrent_crud.insert_meetup_event(SAMPLE_MEETUP_EVENT_1)
+    with pytest.raises(ValueError, match="oops"):
+        concurrent_crud.finish()
+    assert caplog.messages == ["Deleted {}".format(SAMPLE_XIBO_EVENT_1)]
+
+def test_concurrent_error_waits_for_later_requests(mocker, caplog, mock_xibo_api, concurrent_crud):
+    """Test that finish waits for and logs requests made after a failed
+    request, and shuts down the executor, before raising the error."""
+    caplog.set_level(logging.INFO)
+    insert_may_fail = threading.Event()
+    delete_may_finish = threading.Event()
+    def failing_insert(dataset_id, columns):
+        insert_may_fail.wait(5)
+        raise ValueError("oops")
+    def slow_delete(dataset_id, row_id):
+        delete_may_finish.wait(5)
+    mock_xibo_api.insert_dataset_data = mocker.Mock(side_effect=failing_insert)
+    mock_xibo_api.delete_dataset_data_by_id = mocker.Mock(side_effect=slow_delete)
+    shutdown = mocker.spy(concurrent_crud.executor, "shutdown")
+    concurrent_crud.insert_meetup_event(SAMPLE_MEETUP_EVENT_1)
+    concurrent_crud.delete_xibo_event(SAMPLE_XIBO_EVENT_1)
+    insert_may_fail.set()
+    threading.Timer(0.1, delete_may_finish.set).start()
+    with pytest.raises(ValueError, match="oops"):
+        concurrent_crud.finish()
+    assert caplog.messages == ["Deleted {}".format(SAMPLE_XIBO_EVENT_1)]
+    shutdown.assert_called_once_with()
+
+def test_serial_error_raises_again_on_finish(mocker, caplog, mock_xibo_api, crud):
+    """Test that finish raises the error of a failed serial request after
+    logging the requests that succeeded."""
+    caplog.set_level(logging.INFO)
+    mock_xibo_api.insert_dataset_data = mocker.Mock(side_effect=ValueError("oops"))
+    crud.delete_xibo_event(SAMPLE_XIBO_EVENT_1)
+    with pytest.raises(ValueError, match="oops"):
+        crud.insert_meetup_event(SAMPLE_MEETUP_EVENT_1)
+    with pytest.raises(ValueError, match="oops"):
+        crud.finish()
+    assert caplog.messages == ["Deleted {}".format(SAMPLE_XIBO_EVENT_1)]
+
 # vim: tabstop=8 expandtab shiftwidth=4 softtabstop=4 autoindent
@@ -0,0 +1,68 @@
+"""Test processing Xibo event CRUD requests and skipping unchanged events."""
+
+from meetup2xibo.updater.meetup2xibo import XiboEventCrudProcessor
+from meetup2xibo.updater.xibo_sync_state_cache import XiboSyncState
+import logging
+import pytest
+
+
+@pytest.fixture
+def processor(mocker):
+    """Return a Xibo event CRUD processor with mock collaborators."""
+    xibo_event_crud = mocker.Mock(row_count_change = 2)
+    xibo_event_crud.get_xibo_events.return_value = iter(["a", "b", "c"])
+    xibo_event_crud.count_xibo_events.return_value = 5
+    return XiboEventCrudProcessor(
+        xibo_event_crud, mocker.Mock(), mocker.Mock(), "abc")
+
+def test_run_without_state(processor):
+    """Test updating and saving the state when none is cached."""
+    processor.sync_state_cache.load_state.return_value = None
+    processor.run()
+    processor.xibo_event_crud.count_xibo_events.assert_not_called()
+    processor.provide_event_updater.return_value.update_xibo.assert_called_once_with()
+    processor.xibo_event_crud.finish.assert_called_once_with()
+    processor.sync_state_cache.save_state.assert_called_once_with("abc", 5)
+
+def test_run_in_sync(processor, caplog):
+    """Test skipping the update when the events and row count match."""
+    caplog.set_level(logging.INFO)
+    processor.sync_state_cache.load_state.return_value = \
+        XiboSyncState("abc", 5)
+    processor.run()
+    processor.xibo_event_crud.get_xibo_events.assert_not_called()
+    processor.sync_state_cache.save_state.assert_not_called()
+    assert caplog.messages == ["No changes: Xibo events match Meetup events"]
+
+def test_run_changed_events(processor):
+    """Test updating when the Meetup events changed."""
+    processor.sync_state_cache.load_state.return_value = \
+        XiboSyncState("def", 5)
+    processor.run()
+    processor.provide_event_updater.return_value.update_xibo.assert_called_once_with()
+
+def test_run_changed_row_count(processor):
+    """Test updating when someone else changed the Xibo row count."""
+    processor.sync_state_cache.load_state.return_value = \
+        XiboSyncState("abc", 4)
+    processor.run()
+    processor.provide_event_updater.return_value.update_xibo.assert_called_once_with()
+
+def test_run_failed_update(processor):
+    """Test saving no state when the update fails."""
+    processor.sync_state_cache.load_state.return_value = None
+    processor.xibo_event_crud.finish.side_effect = RuntimeError("Oops")
+    with pytest.raises(RuntimeError):
+        processor.run()
+    processor.sync_state_cache.save_state.assert_not_called()
+
+def test_changes_requested(processor):
+    """Test reporting whether the Xibo event CRUD manager requested
+    changes."""
+    processor.xibo_event_crud.changes_requested = False
+    assert not processor.changes_requested()
+    processor.xibo_event_crud.changes_requested = True
+    assert processor.changes_requested()
+
+
+# vim: tabstop=8 expandtab shiftwidth=4 softtabstop=4 autoindent
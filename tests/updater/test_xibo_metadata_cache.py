@@ -0,0 +1,60 @@
+"""Test caching Xibo dataset metadata."""
+
+from meetup2xibo.updater.xibo_metadata_cache import XiboMetadataCache, \
+    XiboDatasetMetadata
+from meetup2xibo.updater.xibo_event import XiboEvent
+from meetup2xibo.updater.json_file_store import JsonFileStore
+import pytest
+
+
+SAMPLE_COLUMN_IDS = XiboEvent(
+    xibo_id = None,
+    meetup_id = 'dataSetColumnId_3',
+    name = 'dataSetColumnId_1',
+    location = 'dataSetColumnId_2',
+    start_time = 'dataSetColumnId_4',
+    end_time = 'dataSetColumnId_5'
+)
+
+@pytest.fixture
+def json_file_store(tmpdir):
+    """Return a JSON file store in a temporary directory."""
+    return JsonFileStore(str(tmpdir.join("metadata.json")))
+
+def test_load_empty(json_file_store):
+    """Test loading no metadata from an empty cache."""
+    cache = XiboMetadataCache(json_file_store, "https://a", "events", 3600)
+    assert cache.load_metadata() is None
+
+def test_save_and_load(json_file_store):
+    """Test reloading saved metadata."""
+    cache = XiboMetadataCache(json_file_store, "https://a", "events", 3600)
+    cache.save_metadata(123, SAMPLE_COLUMN_IDS)
+    assert cache.load_metadata() == XiboDatasetMetadata(123, SAMPLE_COLUMN_IDS)
+
+def test_load_expired(json_file_store):
+    """Test ignoring metadata older than the time to live."""
+    cache = XiboMetadataCache(json_file_store, "https://a", "events", -1)
+    cache.save_metadata(123, SAMPLE_COLUMN_IDS)
+    assert cache.load_metadata() is None
+
+def test_keyed_by_host_and_code(json_file_store):
+    """Test keeping metadata separate for different hosts and codes."""
+    cache1 = XiboMetadataCache(json_file_store, "https://a", "events", 3600)
+    cache2 = XiboMetadataCache(json_file_store, "https://b", "events", 3600)
+    cache3 = XiboMetadataCache(json_file_store, "https://a", "other", 3600)
+    cache1.save_metadata(123, SAMPLE_COLUMN_IDS)
+    assert cache2.load_metadata() is None
+    assert cache3.load_metadata() is None
+
+def test_forget(json_file_store):
+    """Test forgetting cached metadata."""
+    cache1 = XiboMetadataCache(json_file_store, "https://a", "events", 3600)
+    cache2 = XiboMetadataCache(json_file_store, "https://a", "other", 3600)
+    cache1.save_metadata(123, SAMPLE_COLUMN_IDS)
+    cache2.save_metadata(456, SAMPLE_COLUMN_IDS)
+    cache1.forget_metadata()
+    assert cache1.load_metadata() is None
+    assert cache2.load_metadata() == XiboDatasetMetadata(456, SAMPLE_COLUMN_IDS)
+
+# vim: tabstop=8 expandtab shiftwidth=4 softtabstop=4 autoindent
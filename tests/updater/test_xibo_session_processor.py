@@ -0,0 +1,70 @@
+"""Test processing a Xibo session with cached dataset metadata."""
+
+from meetup2xibo.updater.meetup2xibo import XiboSessionProcessor, \
+    XiboEventCrudScope
+from meetup2xibo.updater.xibo_metadata_cache import XiboDatasetMetadata
+from meetup2xibo.updater.http_response_error import XiboApiError
+import pytest
+
+
+@pytest.fixture
+def processor(mocker):
+    """Return a Xibo session processor with mock collaborators."""
+    dataset_id_finder = mocker.Mock()
+    dataset_id_finder.find_dataset_id = mocker.Mock(return_value=22)
+    column_name_manager = mocker.Mock()
+    column_name_manager.json_to_column_ids = mocker.Mock(return_value="fresh")
+    return XiboSessionProcessor(
+        "events", dataset_id_finder, column_name_manager, mocker.Mock(),
+        mocker.Mock(), mocker.Mock())
+
+def test_run_fresh_metadata(processor):
+    """Test looking up and caching metadata when none is cached."""
+    processor.metadata_cache.load_metadata.return_value = None
+    processor.run()
+    processor.dataset_id_finder.find_dataset_id.assert_called_once_with("events")
+    processor.metadata_cache.save_metadata.assert_called_once_with(22, "fresh")
+    processor.enter_xibo_event_crud_scope.assert_called_once_with(
+        XiboEventCrudScope(22, "fresh"))
+
+def test_run_cached_metadata(processor):
+    """Test skipping metadata lookups when metadata is cached."""
+    processor.metadata_cache.load_metadata.return_value = \
+        XiboDatasetMetadata(11, "cached")
+    processor.run()
+    processor.dataset_id_finder.find_dataset_id.assert_not_called()
+    processor.xibo_api.get_dataset_column_by_id.assert_not_called()
+    processor.enter_xibo_event_crud_scope.assert_called_once_with(
+        XiboEventCrudScope(11, "cached"))
+
+def test_run_stale_metadata(mocker, processor):
+    """Test refreshing cached metadata after a Xibo API error."""
+    processor.metadata_cache.load_metadata.return_value = \
+        XiboDatasetMetadata(11, "cached")
+    crud_processor = mocker.Mock()
+    crud_processor.run = mocker.Mock(side_effect=[XiboApiError("stale"), None])
+    crud_processor.changes_requested.return_value = False
+    processor.enter_xibo_event_crud_scope.return_value = crud_processor
+    processor.run()
+    processor.metadata_cache.forget_metadata.assert_called_once_with()
+    processor.metadata_cache.save_metadata.assert_called_once_with(22, "fresh")
+    processor.enter_xibo_event_crud_scope.assert_called_with(
+        XiboEventCrudScope(22, "fresh"))
+
+def test_run_failed_change_not_retried(mocker, processor):
+    """Test raising a Xibo API error after event changes were requested with
+    cached metadata, forgetting the metadata without retrying."""
+    processor.metadata_cache.load_metadata.return_value = \
+        XiboDatasetMetadata(11, "cached")
+    crud_processor = mocker.Mock()
+    crud_processor.run = mocker.Mock(side_effect=XiboApiError("write"))
+    crud_processor.changes_requested.return_value = True
+    processor.enter_xibo_event_crud_scope.return_value = crud_processor
+    with pytest.raises(XiboApiError, match="write"):
+        processor.run()
+    processor.metadata_cache.forget_metadata.assert_called_once_with()
+    processor.dataset_id_finder.find_dataset_id.assert_not_called()
+    processor.enter_xibo_event_crud_scope.assert_called_once_with(
+        XiboEventCrudScope(11, "cached"))
+
+# vim: tabstop=8 expandtab shiftwidth=4 softtabstop=4 autoindent
@@ -0,0 +1,56 @@
+"""Test caching the state of the last Xibo event synchronization."""
+
+from meetup2xibo.updater.xibo_sync_state_cache import XiboSyncStateCache, \
+    XiboSyncState, hash_events
+from meetup2xibo.updater.event_converter import Event
+from meetup2xibo.updater.json_file_store import JsonFileStore
+import pytest
+
+
+EVENT_1 = Event("1", "Open House", "Lobby", "2020-01-01 10:00:00",
+        "2020-01-01 12:00:00", ["Lobby"])
+EVENT_2 = Event("2", "Woodshop Class", "Woodshop", "2020-01-02 10:00:00",
+        "2020-01-02 12:00:00", ["Woodshop"])
+
+
+@pytest.fixture()
+def store(tmpdir):
+    """Return a JSON file store in a temporary directory."""
+    return JsonFileStore(str(tmpdir.join("sync.json")))
+
+def make_cache(store, ttl_seconds = 3600):
+    """Return a Xibo sync state cache."""
+    return XiboSyncStateCache(store, "https://xibo.example.com", "events",
+            ttl_seconds)
+
+def test_load_missing(store):
+    """Test loading no state from an empty cache."""
+    assert make_cache(store).load_state() is None
+
+def test_save_and_load(store):
+    """Test saving and reloading a state."""
+    make_cache(store).save_state("abc", 12)
+    assert make_cache(store).load_state() == XiboSyncState("abc", 12)
+
+def test_load_expired(store):
+    """Test ignoring a state older than the time to live."""
+    make_cache(store, -1).save_state("abc", 12)
+    assert make_cache(store, -1).load_state() is None
+
+def test_hash_events_ignores_order():
+    """Test hashing events regardless of their order."""
+    assert hash_events([EVENT_1, EVENT_2], []) \
+            == hash_events([EVENT_2, EVENT_1], [])
+
+def test_hash_events_distinguishes_lists():
+    """Test distinguishing events from cancelled events."""
+    assert hash_events([EVENT_1], [EVENT_2]) \
+            != hash_events([EVENT_1, EVENT_2], [])
+
+def test_hash_events_detects_changes():
+    """Test detecting a changed event."""
+    changed_event = EVENT_1._replace(location="Classroom A")
+    assert hash_events([EVENT_1], []) != hash_events([changed_event], [])
+
+
+# vim: tabstop=8 expandtab shiftwidth=4 softtabstop=4 autoindent